@@ -1,8 +1,52 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
-# Install Claude using the official installer.
-curl -fsSL https://claude.ai/install.sh | bash
+artifacts_dir="${AICAGE_ARTIFACTS_DIR:-}"
+
+# Prints the platform's checksum from the release manifest, e.g. {"platforms":{"linux-x64":{"checksum":"..."}}}.
+manifest_checksum() {
+  local manifest="$1" platform="$2"
+  tr -d ' \t\r\n' <"${manifest}" \
+    | grep -oE "\"${platform}\":\\{[^}]*\\}" \
+    | grep -oE '"checksum":"[a-f0-9]{64}"' \
+    | cut -d '"' -f 4
+}
+
+# Prints the release version from the manifest, e.g. {"version":"2.0.76",...}.
+manifest_version() {
+  tr -d ' \t\r\n' <"$1" | grep -oE '"version":"[^"]+"' | head -n 1 | cut -d '"' -f 4
+}
+
+# Does what the official installer does with the release binary cached on the host (see agent.yaml): verifies
+# it against the manifest and lets it install itself, which sets up the native install Claude expects.
+install_cached() {
+  local binary="${artifacts_dir}/claude" manifest="${artifacts_dir}/manifest.json" platform expected version
+  local download_dir status=0
+  [[ -n "${artifacts_dir}" && -f "${binary}" && -f "${manifest}" ]] || return 1
+  case "$(uname -m)" in
+    x86_64 | amd64) platform="linux-x64" ;;
+    aarch64 | arm64) platform="linux-arm64" ;;
+    *) return 1 ;;
+  esac
+  expected="$(manifest_checksum "${manifest}" "${platform}")"
+  version="$(manifest_version "${manifest}")"
+  if [[ -z "${expected}" || -z "${version}" ]] || ! echo "${expected}  ${binary}" | sha256sum -c --status -; then
+    echo "[install_claude] Cached binary does not match the release manifest; using the installer." >&2
+    return 1
+  fi
+  # The artifacts are mounted read-only; the binary runs its installer from a writable copy.
+  download_dir="$(mktemp -d)"
+  install -m 0755 "${binary}" "${download_dir}/claude"
+  # The release binary is built for glibc; on musl bases it does not run and the installer picks the musl build.
+  "${download_dir}/claude" install "${version}" || status=$?
+  rm -rf "${download_dir}"
+  return "${status}"
+}
+
+if ! install_cached; then
+  # Install Claude using the official installer.
+  curl -fsSL https://claude.ai/install.sh | bash
+fi
 
 # Ensure the binary is on the global PATH for the runtime user.
 if [[ -x "/root/.local/bin/claude" ]]; then
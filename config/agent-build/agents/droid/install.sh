@@ -4,6 +4,32 @@ set -euo pipefail
 # Install Factory.ai Droid CLI using the official installer.
 export HOME=/root
 
+artifacts_dir="${AICAGE_ARTIFACTS_DIR:-}"
+
+# Succeeds when the cached file (see agent.yaml) exists and matches its published checksum.
+verified() {
+  local file="${artifacts_dir}/$1" expected
+  [[ -n "${artifacts_dir}" && -f "${file}" && -f "${file}.sha256" ]] || return 1
+  expected="$(grep -oE '[a-f0-9]{64}' "${file}.sha256" | head -n 1)"
+  [[ -n "${expected}" ]] && echo "${expected}  ${file}" | sha256sum -c --status -
+}
+
+# Installs the binaries cached on the host where the installer would put them, if they run here.
+install_cached() {
+  verified droid && verified rg || return 1
+  install -m 0755 "${artifacts_dir}/droid" /usr/local/bin/droid
+  if ! /usr/local/bin/droid --version >/dev/null 2>&1; then
+    # e.g. CPUs without AVX2, which the installer serves a baseline build.
+    rm -f /usr/local/bin/droid
+    return 1
+  fi
+  install -D -m 0755 "${artifacts_dir}/rg" "${HOME}/.factory/bin/rg"
+}
+
+if install_cached; then
+  exit 0
+fi
+
 curl -fsSL https://app.factory.ai/cli | sh
 
 # Ensure the binary is on the global PATH for the runtime user.
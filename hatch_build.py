@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+
+class CompileImagesMetadataHook(BuildHookInterface):
+    """
+    Validates config/images-metadata.yaml and ships the pre-validated JSON artifact in the wheel.
+    """
+
+    PLUGIN_NAME = "custom"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        if self.target_name != "wheel":
+            return
+        root = Path(self.root)
+        sys.path.insert(0, str(root / "src"))
+        try:
+            from aicage.registry.images_metadata._compiled import (  # noqa: PLC0415
+                COMPILED_FILENAME,
+                compile_images_metadata,
+            )
+        finally:
+            sys.path.pop(0)
+
+        output_path = compile_images_metadata(
+            root / "config" / "images-metadata.yaml",
+            root / "config" / COMPILED_FILENAME,
+        )
+        build_data["shared_data"][str(output_path)] = f"config/{COMPILED_FILENAME}"
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Compare loading images metadata from YAML against the compiled JSON artifact.
+
+Usage: PYTHONPATH=src python scripts/benchmark/images-metadata-load.py [iterations]
+"""
+
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from aicage.registry.images_metadata._compiled import compile_images_metadata, load_compiled_images_metadata
+from aicage.registry.images_metadata.models import ImagesMetadata
+
+
+def main() -> int:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repo_root = Path(__file__).resolve().parents[2]
+    source_path = repo_root / "config" / "images-metadata.yaml"
+    source = source_path.read_bytes()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        compiled_path = compile_images_metadata(source_path, Path(tmp_dir) / "images-metadata.json")
+        yaml_seconds = timeit.timeit(lambda: ImagesMetadata.from_yaml(source.decode("utf-8")), number=iterations)
+        compiled_seconds = timeit.timeit(
+            lambda: load_compiled_images_metadata(compiled_path, source),
+            number=iterations,
+        )
+
+    yaml_ms = yaml_seconds / iterations * 1000
+    compiled_ms = compiled_seconds / iterations * 1000
+    print(f"iterations:     {iterations}")
+    print(f"yaml + validate: {yaml_ms:8.3f} ms/load")
+    print(f"compiled json:   {compiled_ms:8.3f} ms/load")
+    print(f"speedup:         {yaml_ms / compiled_ms:8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Compare time-to-first-byte of a container launched via the docker CLI and via the Engine API.
+
+Both paths start a TTY container that prints a prompt-like line; the time until the first byte of
+output arrives is measured. Requires a running Docker daemon and the image available locally.
+
+Usage: PYTHONPATH=src python scripts/benchmark/launch-ttfb.py [image] [iterations]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+from aicage.cli._engine_run import start_container
+from aicage.docker_client import get_docker_client
+from aicage.runtime.run_args import EngineRunSpec
+
+_COMMAND = ["echo", "ready>"]
+
+
+def _cli_ttfb(image: str) -> float:
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        ["docker", "run", "--rm", "-t", image, *_COMMAND],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert process.stdout is not None
+    process.stdout.read(1)
+    elapsed = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return elapsed
+
+
+def _engine_ttfb(image: str) -> float:
+    api = get_docker_client().api
+    spec = EngineRunSpec(image_ref=image, command=list(_COMMAND), env=[], binds=[])
+    start = time.perf_counter()
+    container_id, attach_socket = start_container(api, spec)
+    try:
+        attach_socket.recv(1)
+        elapsed = time.perf_counter() - start
+        api.wait(container_id)
+    finally:
+        attach_socket.close()
+        api.remove_container(container_id, force=True)
+    return elapsed
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    image = args[0] if args else "alpine:latest"
+    iterations = int(args[1]) if args[1:] else 10
+    # Warm up the docker client connection and the image layer cache for both paths.
+    _engine_ttfb(image)
+    _cli_ttfb(image)
+
+    cli = [_cli_ttfb(image) * 1000 for _ in range(iterations)]
+    engine = [_engine_ttfb(image) * 1000 for _ in range(iterations)]
+    print(f"image:       {image}")
+    print(f"iterations:  {iterations}")
+    print(f"docker cli:  {statistics.median(cli):8.1f} ms median TTFB")
+    print(f"engine api:  {statistics.median(engine):8.1f} ms median TTFB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Count registry connections (TLS handshakes against a real registry) per launch.
+
+Starts a local HTTP/1.1 registry stand-in and replays the registry traffic of a launch that needs remote
+data: one token request plus manifest HEADs for the agent image and the base image. The one-connection-
+per-request baseline (urllib) is compared with the pooled registry client. Token and digest caches are
+reset before every launch so each one talks to the registry.
+
+Usage: PYTHONPATH=src python scripts/benchmark/registry-connections.py [launches]
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from aicage.config.global_config import GlobalConfig
+from aicage.registry._http import registry_client
+from aicage.registry._remote_query import get_remote_repo_digest_for_repo
+
+_REPOSITORIES = ("aicage/aicage", "aicage/aicage-image-base")
+
+
+class _RegistryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; avoid Nagle/delayed-ACK stalls on kept-alive sockets.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = b'{"token": "stand-in", "expires_in": 300}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self.send_response(200)
+        self.send_header("Docker-Content-Digest", "sha256:" + "0" * 64)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    accepted = 0
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        self.accepted += 1
+        return super().get_request()
+
+
+def _urllib_launch(base_url: str) -> None:
+    scopes = "&".join(f"scope=repository:{repository}:pull" for repository in _REPOSITORIES)
+    with urllib.request.urlopen(f"{base_url}/token?{scopes}") as response:
+        response.read()
+    for repository in _REPOSITORIES:
+        request = urllib.request.Request(f"{base_url}/v2/{repository}/manifests/latest", method="HEAD")
+        with urllib.request.urlopen(request) as response:
+            response.read()
+
+
+def _pooled_launch(global_cfg: GlobalConfig) -> None:
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        for repository in _REPOSITORIES:
+            get_remote_repo_digest_for_repo(f"ghcr.io/{repository}:latest", repository, global_cfg)
+
+
+def _measure(server: _CountingServer, launches: int, launch: Callable[[], None]) -> tuple[float, float]:
+    server.accepted = 0
+    start = time.perf_counter()
+    for _ in range(launches):
+        launch()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return server.accepted / launches, elapsed_ms / launches
+
+
+def main() -> int:
+    launches = int(sys.argv[1]) if sys.argv[1:] else 20
+    server = _CountingServer(("127.0.0.1", 0), _RegistryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    global_cfg = GlobalConfig(
+        image_registry="ghcr.io",
+        image_registry_api_url=f"{base_url}/v2",
+        image_registry_api_token_url=f"{base_url}/token?service=stand-in&scope=repository",
+        image_repository=_REPOSITORIES[0],
+        image_base_repository=_REPOSITORIES[1],
+        default_image_base="ubuntu",
+        version_check_image="unused",
+        local_image_repository="aicage",
+        digest_cache_ttl_seconds=0,
+    )
+    original_home = os.environ.get("HOME", "")
+    try:
+        urllib_conns, urllib_ms = _measure(server, launches, lambda: _urllib_launch(base_url))
+        first_conns, _ = _measure(server, 1, lambda: _pooled_launch(global_cfg))
+        warm_conns, pooled_ms = _measure(server, launches, lambda: _pooled_launch(global_cfg))
+    finally:
+        os.environ["HOME"] = original_home
+        registry_client().close()
+        server.shutdown()
+
+    print(f"launches:                     {launches}")
+    print(f"urllib connections/launch:    {urllib_conns:5.2f}  ({urllib_ms:6.2f} ms/launch)")
+    print(f"pooled connections, 1st:      {first_conns:5.2f}")
+    print(f"pooled connections/launch:    {warm_conns:5.2f}  ({pooled_ms:6.2f} ms/launch, warm pool as in the daemon)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,11 @@
 # supress missing import _version as that file is autogenerated by `hatch build --hooks-only`
 # pyright: reportMissingImports=false
-from importlib import metadata
-
 try:
     from ._version import __version__
 except ImportError:
+    # importlib.metadata pulls in the email package; only pay for it without a generated _version.py.
+    from importlib import metadata
+
     try:
         __version__ = metadata.version("aicage")
     except metadata.PackageNotFoundError:
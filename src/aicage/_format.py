@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+_SIZE_UNITS: tuple[str, ...] = ("B", "KiB", "MiB", "GiB", "TiB")
+_SIZE_STEP = 1024
+
+
+def format_size(size_bytes: float) -> str:
+    value = float(size_bytes)
+    for unit in _SIZE_UNITS[:-1]:
+        if value < _SIZE_STEP:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= _SIZE_STEP
+    return f"{value:.1f} {_SIZE_UNITS[-1]}"
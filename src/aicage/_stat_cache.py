@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+class StatCache(Generic[_T]):
+    """
+    Memoizes a value derived from a file until the file's mtime or size changes.
+    One-shot CLI runs load each file once anyway; the daemon reuses values across launches.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Path, tuple[tuple[int, int], _T]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, load: Callable[[Path], _T]) -> _T:
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        value = load(path)
+        with self._lock:
+            self._entries[path] = (key, value)
+        return value
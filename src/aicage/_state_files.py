@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import portalocker
+
+from aicage._logging import get_logger
+
+_LOCK_TIMEOUT_SECONDS = 10
+# Writers hold the lock for a few milliseconds; portalocker polls every 0.25s by default.
+_LOCK_CHECK_INTERVAL_SECONDS = 0.01
+
+
+def read_json(path: Path) -> Any | None:
+    """
+    Returns the parsed JSON document at `path`, or None when it is missing or unreadable.
+    """
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_text_atomic(path: Path, text: str, mode: int = 0o644) -> None:
+    """
+    Replaces `path` with `text` so that readers see either the old or the new content, never a partial file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def locked(path: Path, timeout: float = _LOCK_TIMEOUT_SECONDS) -> Iterator[None]:
+    """
+    Holds an exclusive lock on `<path>.lock` shared by all aicage processes and threads of the user.
+    Raises `portalocker.exceptions.LockException` when the lock is not acquired within `timeout`.
+    """
+    lock_path = path.with_name(f"{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with portalocker.Lock(str(lock_path), mode="a+", timeout=timeout, check_interval=_LOCK_CHECK_INTERVAL_SECONDS):
+        yield
+
+
+def update_json(path: Path, update: Callable[[Any | None], Any], mode: int = 0o644) -> None:
+    """
+    Read-modify-writes the JSON document at `path` under its lock, so concurrent launches, prefetch workers and
+    build jobs do not drop each other's entries. State files are caches: failures are logged and ignored.
+    """
+    try:
+        with locked(path):
+            write_text_atomic(path, json.dumps(update(read_json(path)), sort_keys=True), mode)
+    except (OSError, portalocker.exceptions.LockException) as exc:
+        get_logger().debug("Failed to update state file %s: %s", path, exc)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+_TRACE_ENV = "AICAGE_TRACE"
+_PROFILE_ENV = "AICAGE_PROFILE"
+TRACING_ENV_VARS: tuple[str, ...] = (_TRACE_ENV, _PROFILE_ENV)
+
+PHASE: str = "phase"
+SUBPROCESS: str = "subprocess"
+HTTP: str = "http"
+DOCKER_API: str = "docker-api"
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+class _TraceRecorder:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._origin_ns = time.perf_counter_ns()
+        self._events: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, category: str, start_ns: int, end_ns: int, attrs: dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {key: _json_value(value) for key, value in attrs.items()},
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def write(self) -> None:
+        with self._lock:
+            events = list(self._events)
+        payload = {"traceEvents": events, "displayTimeUnit": "ms"}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+class _TracingState:
+    def __init__(self) -> None:
+        self.recorder: _TraceRecorder | None = None
+        self.profiler: Any = None
+        self.profile_path: Path | None = None
+        self.session_start_ns = 0
+
+
+_STATE = _TracingState()
+
+
+def tracing_enabled() -> bool:
+    return _STATE.recorder is not None
+
+
+@contextmanager
+def span(name: str, category: str = PHASE, **attrs: Any) -> Iterator[dict[str, Any]]:
+    """
+    Records a Chrome trace span when `AICAGE_TRACE` is set; a no-op otherwise.
+    The yielded dict can be used to add attributes known only after the work is done.
+    """
+    recorder = _STATE.recorder
+    if recorder is None:
+        yield attrs
+        return
+    start_ns = time.perf_counter_ns()
+    try:
+        yield attrs
+    except BaseException as exc:
+        attrs["error"] = type(exc).__name__
+        raise
+    finally:
+        recorder.add_span(name, category, start_ns, time.perf_counter_ns(), attrs)
+
+
+def traced(name: str) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    """
+    Records each call of the decorated function as a launch phase span.
+    """
+
+    def _decorator(func: Callable[_P, _R]) -> Callable[_P, _R]:
+        @wraps(func)
+        def _wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            if _STATE.recorder is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return _wrapper
+
+    return _decorator
+
+
+@contextmanager
+def trace_session() -> Iterator[None]:
+    """
+    Enables tracing (`AICAGE_TRACE=path`) and profiling (`AICAGE_PROFILE=path`) for the enclosed block.
+    """
+    _start()
+    try:
+        yield
+    finally:
+        finish_tracing()
+
+
+def finish_tracing() -> None:
+    """
+    Writes the trace and profile files and stops recording. Safe to call more than once.
+    Called directly before exec-ing docker, since the session never ends in this process then.
+    """
+    recorder, profiler, profile_path = _STATE.recorder, _STATE.profiler, _STATE.profile_path
+    _STATE.recorder, _STATE.profiler, _STATE.profile_path = None, None, None
+    if profiler is not None and profile_path is not None:
+        profiler.disable()
+        profile_path.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_path))
+    if recorder is not None:
+        recorder.add_span("aicage", PHASE, _STATE.session_start_ns, time.perf_counter_ns(), {})
+        recorder.write()
+
+
+def _start() -> None:
+    _STATE.session_start_ns = time.perf_counter_ns()
+    trace_path = os.getenv(_TRACE_ENV)
+    if trace_path:
+        _STATE.recorder = _TraceRecorder(Path(os.path.expanduser(trace_path)))
+    profile_path = os.getenv(_PROFILE_ENV)
+    if profile_path:
+        import cProfile  # noqa: PLC0415
+
+        profiler = cProfile.Profile()
+        _STATE.profile_path = Path(os.path.expanduser(profile_path))
+        _STATE.profiler = profiler
+        profiler.enable()
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return str(value)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+
+from aicage._logging import get_logger
+from aicage.config.config_store import SettingsStore
+from aicage.errors import CliError
+from aicage.registry.images_metadata.loader import load_images_metadata
+from aicage.registry.local_build.build_matrix import (
+    BUILD_FAILED,
+    default_build_jobs,
+    format_results,
+    matrix_run_configs,
+    plan_builds,
+    run_builds,
+)
+
+
+def run_command(argv: Sequence[str]) -> int:
+    """
+    Runs `aicage build`: builds the local images of locally built agents for several bases in parallel.
+    """
+    parser = argparse.ArgumentParser(prog="aicage build", description="Build local agent images.")
+    parser.add_argument("--agent", action="append", default=[], help="Only build this agent (repeatable).")
+    parser.add_argument("--base", action="append", default=[], help="Only build this base (repeatable).")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=default_build_jobs(),
+        help="Maximum concurrent builds (default: half the CPUs).",
+    )
+    parser.add_argument("--refresh", action="store_true", help="Re-check remote base image digests.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the images that would be built.")
+    opts = parser.parse_args(list(argv))
+    if opts.jobs < 1:
+        raise CliError("--jobs must be at least 1.")
+
+    global_cfg = SettingsStore().load_global()
+    if global_cfg.offline:
+        raise CliError("aicage build needs network access; it is disabled while offline is set.")
+    images_metadata = load_images_metadata(global_cfg.local_image_repository)
+    unknown_agents = sorted(set(opts.agent) - set(images_metadata.agents))
+    if unknown_agents:
+        raise CliError(f"Unknown agent(s): {', '.join(unknown_agents)}.")
+    prebuilt = sorted(agent for agent in opts.agent if images_metadata.agents[agent].local_definition_dir is None)
+    if prebuilt:
+        raise CliError(f"Agent(s) not built locally: {', '.join(prebuilt)}. Use 'aicage pull' instead.")
+
+    run_configs = matrix_run_configs(images_metadata, global_cfg, opts.agent, opts.base, opts.refresh)
+    if not run_configs:
+        print("[aicage] Nothing to build.")
+        return 0
+
+    get_logger().info("Planning %d local builds with %d jobs.", len(run_configs), opts.jobs)
+    # A dry run only compares base image digests; pulling outdated bases is left to the real build.
+    targets = plan_builds(run_configs, opts.jobs, pull_bases=not opts.dry_run)
+    if opts.dry_run:
+        for target in targets:
+            if target.error:
+                print(f"[aicage] {target.run_config.image_ref}: {target.error}", file=sys.stderr)
+            elif target.needs_build:
+                print(target.run_config.image_ref)
+        return 1 if any(target.error for target in targets) else 0
+
+    results = run_builds(targets, opts.jobs)
+    print(format_results(results))
+    return 1 if any(result.status == BUILD_FAILED for result in results) else 0
@@ -0,0 +1,59 @@
+import os
+import shlex
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from aicage._logging import get_logger
+from aicage._tracing import SUBPROCESS, finish_tracing, span
+from aicage.config.global_config import LAUNCH_MODE_ENGINE, LAUNCH_MODE_EXEC
+from aicage.errors import CliError
+from aicage.runtime.run_args import EngineRunSpec
+
+
+@dataclass(frozen=True)
+class LaunchPlan:
+    command: list[str]
+    launch_mode: str
+    engine_spec: EngineRunSpec | None = None
+
+
+def run_docker(plan: LaunchPlan, dry_run: bool) -> int:
+    logger = get_logger()
+    if dry_run:
+        print(shlex.join(plan.command))
+        logger.info("Dry-run docker command printed.")
+        return 0
+
+    if plan.launch_mode == LAUNCH_MODE_EXEC:
+        _exec_docker(plan.command)
+    if plan.launch_mode == LAUNCH_MODE_ENGINE:
+        if plan.engine_spec is not None and sys.stdin.isatty() and sys.stdout.isatty():
+            # The Engine API backend pulls in the docker SDK and termios; load it only when used.
+            from aicage.cli._engine_run import run_engine
+
+            return run_engine(plan.engine_spec)
+        logger.info("Engine launch needs a terminal and no extra docker args; using the docker CLI.")
+
+    with span("docker run", SUBPROCESS, argv=plan.command) as attrs:
+        result = subprocess.run(plan.command, check=False)
+        attrs["returncode"] = result.returncode
+    return result.returncode
+
+
+def _exec_docker(run_cmd: list[str]) -> None:
+    """
+    Replaces the aicage process with `docker run`, so no Python interpreter stays resident for the session.
+    Only returns by raising when the exec itself fails.
+    """
+    logger = get_logger()
+    logger.info("Handing over to docker run via exec.")
+    for handler in logger.handlers:
+        handler.flush()
+    finish_tracing()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execvp(run_cmd[0], run_cmd)
+    except OSError as exc:
+        raise CliError(f"Failed to exec {run_cmd[0]}: {exc}") from exc
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import selectors
+import signal
+import sys
+import termios
+import tty
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from docker.errors import DockerException
+
+from aicage._logging import get_logger
+from aicage._tracing import DOCKER_API, span
+from aicage.docker_client import get_docker_client
+from aicage.errors import CliError
+from aicage.runtime.run_args import EngineRunSpec
+
+_READ_SIZE = 65536
+_ATTACH_PARAMS = {"stdin": 1, "stdout": 1, "stderr": 1, "stream": 1}
+
+
+def run_engine(spec: EngineRunSpec) -> int:
+    """
+    Runs the agent container through the Engine API: create, attach with a TTY, wait and remove.
+    Mirrors `docker run --rm -it` without spawning the docker CLI.
+    """
+    logger = get_logger()
+    api = get_docker_client().api
+    try:
+        container_id, attach_socket = start_container(api, spec)
+    except DockerException as exc:
+        raise CliError(f"Failed to start container for {spec.image_ref}: {exc}") from exc
+
+    logger.info("Started container %s via the Engine API.", container_id)
+    try:
+        with _raw_terminal(), _forward_resize(api, container_id):
+            _pump(attach_socket)
+        with span("wait", DOCKER_API):
+            result = api.wait(container_id)
+        return int(result.get("StatusCode", 1))
+    finally:
+        attach_socket.close()
+        _remove_container(api, container_id)
+
+
+def start_container(api: Any, spec: EngineRunSpec) -> tuple[str, Any]:
+    """
+    Creates and starts the container, returning its id and the raw attach socket.
+    The socket is attached before start so no early output is lost.
+    """
+    with span("create_container", DOCKER_API, image=spec.image_ref):
+        container = api.create_container(
+            image=spec.image_ref,
+            command=spec.command or None,
+            environment=spec.env,
+            tty=True,
+            stdin_open=True,
+            host_config=api.create_host_config(binds=spec.binds),
+        )
+    container_id = container["Id"]
+    try:
+        with span("attach_socket", DOCKER_API):
+            attach_socket = _raw_socket(api.attach_socket(container_id, params=_ATTACH_PARAMS))
+        with span("start", DOCKER_API):
+            api.start(container_id)
+    except BaseException:
+        _remove_container(api, container_id)
+        raise
+    return container_id, attach_socket
+
+
+def _raw_socket(attached: Any) -> Any:
+    # docker-py returns a SocketIO wrapper for unix sockets; select and shutdown need the socket itself.
+    return getattr(attached, "_sock", attached)
+
+
+def _pump(attach_socket: Any) -> None:
+    stdin_fd = sys.stdin.fileno()
+    stdout_fd = sys.stdout.fileno()
+    sys.stdout.flush()
+    with selectors.DefaultSelector() as selector:
+        selector.register(attach_socket, selectors.EVENT_READ)
+        selector.register(stdin_fd, selectors.EVENT_READ)
+        while True:
+            for key, _ in selector.select():
+                if key.fileobj is attach_socket:
+                    data = attach_socket.recv(_READ_SIZE)
+                    if not data:
+                        return
+                    os.write(stdout_fd, data)
+                    continue
+                data = os.read(stdin_fd, _READ_SIZE)
+                if not data:
+                    selector.unregister(stdin_fd)
+                    continue
+                attach_socket.sendall(data)
+
+
+@contextmanager
+def _raw_terminal() -> Iterator[None]:
+    stdin_fd = sys.stdin.fileno()
+    previous = termios.tcgetattr(stdin_fd)
+    tty.setraw(stdin_fd)
+    try:
+        yield
+    finally:
+        termios.tcsetattr(stdin_fd, termios.TCSADRAIN, previous)
+
+
+@contextmanager
+def _forward_resize(api: Any, container_id: str) -> Iterator[None]:
+    def _resize(*_args: object) -> None:
+        try:
+            size = os.get_terminal_size(sys.stdout.fileno())
+            api.resize(container_id, height=size.lines, width=size.columns)
+        except (OSError, DockerException):
+            return
+
+    _resize()
+    previous = signal.signal(signal.SIGWINCH, _resize)
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
+
+
+def _remove_container(api: Any, container_id: str) -> None:
+    try:
+        with span("remove_container", DOCKER_API):
+            api.remove_container(container_id, force=True)
+    except DockerException as exc:
+        get_logger().warning("Failed to remove container %s: %s", container_id, exc)
@@ -0,0 +1,89 @@
+from aicage._logging import get_logger
+from aicage.cli._docker_run import LaunchPlan, run_docker
+from aicage.cli_types import ParsedArgs
+from aicage.config import RunConfig, load_run_config
+from aicage.config.global_config import IMAGE_REFRESH_BACKGROUND, LAUNCH_MODE_ENGINE
+from aicage.config.runtime_config import with_agent_version
+from aicage.errors import CliError
+from aicage.registry._http import registry_client
+from aicage.registry._remote_query import discard_prefetched_digests
+from aicage.registry.background_refresh import (
+    local_image_available,
+    mark_refreshed,
+    report_background_refresh,
+    start_background_refresh,
+)
+from aicage.registry.image_pull import pull_image
+from aicage.registry.local_build.ensure_local_image import ensure_local_image
+from aicage.runtime.run_args import DockerRunArgs, assemble_docker_run, build_engine_spec
+from aicage.runtime.run_plan import build_run_args
+
+
+def launch_agent(parsed: ParsedArgs) -> int:
+    return run_docker(prepare_launch(parsed), parsed.dry_run)
+
+
+def prepare_launch(parsed: ParsedArgs) -> LaunchPlan:
+    """
+    Resolves config, makes the image available locally and returns the `docker run` command to launch.
+    """
+    logger = get_logger()
+    registry_client().reset_request_counts()
+    try:
+        run_config: RunConfig = load_run_config(parsed.agent, parsed)
+        logger.info("Resolved run config for agent %s", run_config.agent)
+        run_config = _ensure_image(run_config)
+    finally:
+        discard_prefetched_digests()
+    _log_registry_requests(run_config.image_ref)
+    run_args: DockerRunArgs = build_run_args(config=run_config, parsed=parsed)
+    launch_mode = run_config.global_cfg.launch_mode
+    return LaunchPlan(
+        command=assemble_docker_run(run_args),
+        launch_mode=launch_mode,
+        engine_spec=build_engine_spec(run_args) if launch_mode == LAUNCH_MODE_ENGINE else None,
+    )
+
+
+def _ensure_image(run_config: RunConfig) -> RunConfig:
+    if run_config.global_cfg.offline:
+        _require_local_image(run_config)
+        return run_config
+    if run_config.global_cfg.image_refresh != IMAGE_REFRESH_BACKGROUND:
+        _pull_or_build(run_config)
+        return run_config
+
+    report_background_refresh(run_config.image_ref)
+    if run_config.refresh_deferred and local_image_available(run_config.image_ref):
+        start_background_refresh(run_config)
+        return run_config
+    if run_config.refresh_deferred:
+        run_config = with_agent_version(run_config)
+    _pull_or_build(run_config)
+    mark_refreshed(run_config.image_ref)
+    return run_config
+
+
+def _log_registry_requests(image_ref: str) -> None:
+    counts = registry_client().request_counts()
+    detail = ", ".join(f"{method} {count}" for method, count in sorted(counts.items()))
+    get_logger().info(
+        "Launch of %s made %d registry requests%s", image_ref, sum(counts.values()), f" ({detail})" if detail else ""
+    )
+
+
+def _require_local_image(run_config: RunConfig) -> None:
+    if not local_image_available(run_config.image_ref):
+        raise CliError(
+            f"Offline mode: image {run_config.image_ref} is not available locally. "
+            "Launch once with network access to pull or build it."
+        )
+    get_logger().info("Offline mode: launching %s without checking for updates.", run_config.image_ref)
+
+
+def _pull_or_build(run_config: RunConfig) -> None:
+    agent_metadata = run_config.images_metadata.agents[run_config.agent]
+    if agent_metadata.local_definition_dir is None:
+        pull_image(run_config)
+    else:
+        ensure_local_image(run_config)
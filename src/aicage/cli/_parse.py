@@ -19,6 +19,8 @@ def parse_cli(argv: Sequence[str]) -> ParsedArgs:
     parser.add_argument("--entrypoint", help="Override the container entrypoint with a host path.")
     parser.add_argument("--docker", action="store_true", help="Mount the host Docker socket into the container.")
     parser.add_argument("--config", help="Perform config actions such as 'print'.")
+    parser.add_argument("--refresh", action="store_true", help="Re-check remote image digests now.")
+    parser.add_argument("--offline", action="store_true", help="Use local images without any network access.")
     parser.add_argument("-h", "--help", action="store_true", help="Show help message and exit.")
     pre_argv, post_argv = _split_argv(argv)
 
@@ -30,9 +32,14 @@ def parse_cli(argv: Sequence[str]) -> ParsedArgs:
         usage: str = (
             "Usage:\n"
             "  aicage <agent>\n"
-            "  aicage [--dry-run] [--docker] [--entrypoint PATH] -- <agent> [<agent-args>]\n"
-            "  aicage [--dry-run] [--docker] [--entrypoint PATH] <docker-args> -- <agent> [<agent-args>]\n"
-            "  aicage --config print\n\n"
+            "  aicage [--dry-run] [--docker] [--refresh | --offline] [--entrypoint PATH] -- <agent> [<agent-args>]\n"
+            "  aicage [--dry-run] [--docker] [--refresh | --offline] [--entrypoint PATH] <docker-args> -- <agent>"
+            " [<agent-args>]\n"
+            "  aicage --config print\n"
+            "  aicage build [--agent NAME] [--base NAME] [--jobs N] [--refresh] [--dry-run]\n"
+            "  aicage daemon\n"
+            "  aicage prefetch [--agent NAME] [--base NAME] [--projects] [--jobs N] [--dry-run]\n"
+            "  aicage pull [--base NAME] [--plan] [--jobs N] <agent>\n\n"
             "Any arguments between aicage and the agent require a '--' separator before the agent.\n"
             "<docker-args> are any arguments not recognized by aicage.\n"
             "These arguments are forwarded verbatim to docker run.\n"
@@ -54,6 +61,9 @@ def parse_cli(argv: Sequence[str]) -> ParsedArgs:
             opts.config,
         )
 
+    if opts.refresh and opts.offline:
+        raise CliError("--refresh and --offline cannot be combined.")
+
     docker_args, agent, agent_args = _parse_agent_section(remaining, post_argv)
 
     if not agent:
@@ -67,6 +77,8 @@ def parse_cli(argv: Sequence[str]) -> ParsedArgs:
         opts.entrypoint,
         opts.docker,
         None,
+        opts.refresh,
+        opts.offline,
     )
 
 
@@ -86,7 +98,7 @@ def _validate_config_action(
 ) -> None:
     if opts.config != "print":
         raise CliError(f"Unknown config action: {opts.config}")
-    if remaining or post_argv or opts.entrypoint or opts.docker or opts.dry_run:
+    if remaining or post_argv or opts.entrypoint or opts.docker or opts.dry_run or opts.refresh or opts.offline:
         raise CliError("No additional arguments are allowed with --config.")
 
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+
+from aicage._logging import get_logger
+from aicage.config.config_store import SettingsStore
+from aicage.errors import CliError
+from aicage.registry.images_metadata.loader import load_images_metadata
+from aicage.registry.prefetch import (
+    PREFETCH_FAILED,
+    format_summary,
+    matrix_targets,
+    prefetch_images,
+    project_targets,
+    schedule_waves,
+)
+
+_DEFAULT_JOBS = 4
+
+
+def run_command(argv: Sequence[str]) -> int:
+    """
+    Runs `aicage prefetch`: pulls the images of the agent x base matrix (or of stored projects) in parallel.
+    """
+    parser = argparse.ArgumentParser(prog="aicage prefetch", description="Pull agent images ahead of time.")
+    parser.add_argument("--agent", action="append", default=[], help="Only prefetch this agent (repeatable).")
+    parser.add_argument("--base", action="append", default=[], help="Only prefetch this base (repeatable).")
+    parser.add_argument(
+        "--projects",
+        action="store_true",
+        help="Prefetch the agent/base combinations stored in project configs instead of the full matrix.",
+    )
+    parser.add_argument("--jobs", type=int, default=_DEFAULT_JOBS, help="Maximum concurrent pulls.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the images that would be pulled.")
+    opts = parser.parse_args(list(argv))
+    if opts.jobs < 1:
+        raise CliError("--jobs must be at least 1.")
+
+    store = SettingsStore()
+    global_cfg = store.load_global()
+    if global_cfg.offline:
+        raise CliError("aicage prefetch needs network access; it is disabled while offline is set.")
+    images_metadata = load_images_metadata(global_cfg.local_image_repository)
+    unknown_agents = sorted(set(opts.agent) - set(images_metadata.agents))
+    if unknown_agents:
+        raise CliError(f"Unknown agent(s): {', '.join(unknown_agents)}.")
+    if opts.projects:
+        targets = project_targets(store, images_metadata, global_cfg, opts.agent, opts.base)
+    else:
+        targets = matrix_targets(images_metadata, global_cfg, opts.agent, opts.base)
+    if not targets:
+        print("[aicage] Nothing to prefetch.")
+        return 0
+
+    waves = schedule_waves(targets, global_cfg)
+    if opts.dry_run:
+        for wave in waves:
+            for target in wave:
+                print(target.image_ref)
+        return 0
+
+    get_logger().info("Prefetching %d images with %d jobs.", len(targets), opts.jobs)
+    summary = prefetch_images(waves, opts.jobs, global_cfg)
+    for result in summary.results:
+        if result.status == PREFETCH_FAILED:
+            print(f"[aicage] Failed to pull {result.image_ref}: {result.message}")
+    print(f"[aicage] {format_summary(summary)}")
+    return 1 if summary.count(PREFETCH_FAILED) else 0
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from pathlib import Path
+
+from aicage._format import format_size
+from aicage.config.config_store import SettingsStore
+from aicage.config.global_config import GlobalConfig
+from aicage.config.project_config import AGENT_BASE_KEY
+from aicage.errors import CliError
+from aicage.registry.images_metadata.loader import load_images_metadata
+from aicage.registry.prefetch import (
+    PREFETCH_FAILED,
+    PrefetchTarget,
+    format_summary,
+    matrix_targets,
+    prefetch_images,
+    schedule_waves,
+)
+from aicage.registry.pull_plan import PullEstimate, estimate_pulls
+
+_DEFAULT_JOBS = 2
+
+
+def run_command(argv: Sequence[str]) -> int:
+    """
+    Runs `aicage pull`: pulls an agent's images, or with `--plan` shows what a pull would download.
+    """
+    parser = argparse.ArgumentParser(prog="aicage pull", description="Pull the images of an agent.")
+    parser.add_argument("agent", help="Agent whose images to pull.")
+    parser.add_argument(
+        "--base",
+        action="append",
+        default=[],
+        help="Base to pull (repeatable). Defaults to the configured base, or all valid bases.",
+    )
+    parser.add_argument("--plan", action="store_true", help="Show download sizes without pulling.")
+    parser.add_argument("--jobs", type=int, default=_DEFAULT_JOBS, help="Maximum concurrent pulls.")
+    opts = parser.parse_args(list(argv))
+    if opts.jobs < 1:
+        raise CliError("--jobs must be at least 1.")
+
+    store = SettingsStore()
+    global_cfg = store.load_global()
+    if global_cfg.offline:
+        raise CliError("aicage pull needs network access; it is disabled while offline is set.")
+    images_metadata = load_images_metadata(global_cfg.local_image_repository, opts.agent)
+    agent_metadata = images_metadata.agents.get(opts.agent)
+    if agent_metadata is None:
+        raise CliError(f"Unknown agent '{opts.agent}'.")
+    bases = opts.base or _configured_bases(store, global_cfg, opts.agent)
+    invalid = sorted(set(bases) - set(agent_metadata.valid_bases))
+    if invalid:
+        raise CliError(f"Invalid base(s) for '{opts.agent}': {', '.join(invalid)}.")
+
+    targets = matrix_targets(images_metadata, global_cfg, [opts.agent], bases)
+    if opts.plan:
+        estimates = estimate_pulls([target.image_ref for target in targets], global_cfg)
+        print(_format_plan(targets, estimates))
+        return 0
+
+    summary = prefetch_images(schedule_waves(targets, global_cfg), opts.jobs, global_cfg)
+    for result in summary.results:
+        if result.status == PREFETCH_FAILED:
+            print(f"[aicage] Failed to pull {result.image_ref}: {result.message}")
+    print(f"[aicage] {format_summary(summary)}")
+    return 1 if summary.count(PREFETCH_FAILED) else 0
+
+
+def _configured_bases(store: SettingsStore, global_cfg: GlobalConfig, agent: str) -> list[str]:
+    project_cfg = store.load_project(Path.cwd().resolve())
+    agent_cfg = project_cfg.agents.get(agent)
+    base = (agent_cfg.base if agent_cfg else None) or global_cfg.agents.get(agent, {}).get(AGENT_BASE_KEY)
+    return [base] if base else []
+
+
+def _format_plan(targets: Sequence[PrefetchTarget], estimates: dict[str, PullEstimate]) -> str:
+    rows = [("BASE", "IMAGE", "DOWNLOAD", "TOTAL", "LAYERS")]
+    download_total = 0
+    for target in targets:
+        estimate = estimates.get(target.image_ref)
+        if estimate is None:
+            rows.append((target.base, target.image_ref, "unknown", "unknown", "-"))
+            continue
+        download_total += estimate.download_bytes
+        rows.append(
+            (
+                target.base,
+                target.image_ref,
+                format_size(estimate.download_bytes),
+                format_size(estimate.total_bytes),
+                f"{estimate.missing_layers}/{estimate.layers}",
+            )
+        )
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)).rstrip() for row in rows]
+    lines.append(f"Total download: {format_size(download_total)}")
+    return "\n".join(lines)
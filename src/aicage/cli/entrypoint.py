@@ -1,46 +1,54 @@
-import shlex
-import subprocess
 import sys
 from collections.abc import Sequence
+from importlib import import_module
+from pathlib import Path
 
 from aicage._logging import get_logger
+from aicage._tracing import trace_session
 from aicage.cli._parse import parse_cli
-from aicage.cli._print_config import print_project_config
 from aicage.cli_types import ParsedArgs
-from aicage.config import ConfigError, RunConfig, load_run_config
+from aicage.config.errors import ConfigError
 from aicage.errors import CliError
-from aicage.registry.image_pull import pull_image
-from aicage.registry.local_build.ensure_local_image import ensure_local_image
-from aicage.runtime.run_args import DockerRunArgs, assemble_docker_run
-from aicage.runtime.run_plan import build_run_args
+
+# Subcommands live in their own modules and expose `run_command(argv) -> int`.
+# Their names are listed in `COMMAND_NAMES`, which custom agents may not use.
+_COMMAND_MODULES: dict[str, str] = {
+    "build": "aicage.cli._build",
+    "daemon": "aicage.daemon.server",
+    "prefetch": "aicage.cli._prefetch",
+    "pull": "aicage.cli._pull",
+}
 
 
 def main(argv: Sequence[str] | None = None) -> int:
     parsed_argv: Sequence[str] = argv if argv is not None else sys.argv[1:]
+    with trace_session():
+        return _run(parsed_argv)
+
+
+def _run(parsed_argv: Sequence[str]) -> int:
     logger = get_logger()
     try:
+        if parsed_argv and parsed_argv[0] in _COMMAND_MODULES:
+            command_module = import_module(_COMMAND_MODULES[parsed_argv[0]])
+            return command_module.run_command(parsed_argv[1:])
         parsed: ParsedArgs = parse_cli(parsed_argv)
+        # Import the launch pipeline on demand: it pulls in docker, yaml and portalocker,
+        # which `--help` and `--config print` never need.
         if parsed.config_action == "print":
+            from aicage.cli._print_config import print_project_config
+
             print_project_config()
             return 0
-        run_config: RunConfig = load_run_config(parsed.agent, parsed)
-        logger.info("Resolved run config for agent %s", run_config.agent)
-        agent_metadata = run_config.images_metadata.agents[run_config.agent]
-        if agent_metadata.local_definition_dir is None:
-            pull_image(run_config)
-        else:
-            ensure_local_image(run_config)
-        run_args: DockerRunArgs = build_run_args(config=run_config, parsed=parsed)
-
-        run_cmd: list[str] = assemble_docker_run(run_args)
-
-        if parsed.dry_run:
-            print(shlex.join(run_cmd))
-            logger.info("Dry-run docker command printed.")
-            return 0
+        from aicage.cli._docker_run import run_docker
+        from aicage.daemon.client import request_launch
+
+        plan = request_launch(parsed_argv, Path.cwd())
+        if plan is not None:
+            return run_docker(plan, parsed.dry_run)
+        from aicage.cli._launch import launch_agent
 
-        subprocess.run(run_cmd, check=True)
-        return 0
+        return launch_agent(parsed)
     except KeyboardInterrupt:
         print()
         logger.warning("Interrupted by user.")
@@ -1,5 +1,8 @@
 from dataclasses import dataclass
 
+# `aicage <name>` runs these subcommands instead of launching an agent, so agents cannot use the names.
+COMMAND_NAMES: frozenset[str] = frozenset({"build", "daemon", "prefetch", "pull"})
+
 
 @dataclass
 class ParsedArgs:
@@ -10,3 +13,5 @@ class ParsedArgs:
     entrypoint: str | None
     docker_socket: bool
     config_action: str | None
+    refresh: bool = False
+    offline: bool = False
@@ -1,8 +1,36 @@
-from .config_store import SettingsStore as SettingsStore
-from .context import ConfigContext as ConfigContext
-from .context import build_config_context as build_config_context
-from .errors import ConfigError as ConfigError
-from .global_config import GlobalConfig as GlobalConfig
-from .project_config import ProjectConfig as ProjectConfig
-from .runtime_config import RunConfig as RunConfig
-from .runtime_config import load_run_config as load_run_config
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .config_store import SettingsStore as SettingsStore
+    from .context import ConfigContext as ConfigContext
+    from .context import build_config_context as build_config_context
+    from .errors import ConfigError as ConfigError
+    from .global_config import GlobalConfig as GlobalConfig
+    from .project_config import ProjectConfig as ProjectConfig
+    from .runtime_config import RunConfig as RunConfig
+    from .runtime_config import load_run_config as load_run_config
+
+# Re-exports are resolved on first access so that importing a light submodule such as
+# `aicage.config.errors` does not pull in the whole launch pipeline (docker, yaml, portalocker).
+_LAZY_EXPORTS: dict[str, str] = {
+    "SettingsStore": ".config_store",
+    "ConfigContext": ".context",
+    "build_config_context": ".context",
+    "ConfigError": ".errors",
+    "GlobalConfig": ".global_config",
+    "ProjectConfig": ".project_config",
+    "RunConfig": ".runtime_config",
+    "load_run_config": ".runtime_config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import copy
 import hashlib
 import os
 from pathlib import Path
 from typing import Any
 
-import yaml
+from aicage._stat_cache import StatCache
 
 from .errors import ConfigError
 from .global_config import GlobalConfig
-from .project_config import ProjectConfig
+from .project_config import ProjectConfig, stored_project_path
 from .resources import find_packaged_path
 
 _CONFIG_FILENAME = "config.yaml"
 _DEFAULT_BASE_DIR = "~/.aicage"
 _PROJECTS_SUBDIR = "projects"
 
+_GLOBAL_CONFIG_DATA: StatCache[dict[str, Any]] = StatCache()
+_USER_CONFIG_DATA: StatCache[dict[str, Any]] = StatCache()
+
 
 class SettingsStore:
     """
@@ -32,21 +36,33 @@ class SettingsStore:
     def _load_yaml(path: Path) -> dict[str, Any]:
         if not path.exists():
             return {}
+        import yaml
+
         try:
             with path.open("r", encoding="utf-8") as handle:
                 data = yaml.safe_load(handle)
-                return data or {}
         except yaml.YAMLError as exc:
             raise ConfigError(f"Failed to parse YAML config at {path}: {exc}") from exc
+        if data is None:
+            return {}
+        if not isinstance(data, dict):
+            raise ConfigError(f"YAML config at {path} must be a mapping.")
+        return data
 
     @staticmethod
     def _save_yaml(path: Path, data: dict[str, Any]) -> None:
+        import yaml
+
         path.parent.mkdir(parents=True, exist_ok=True)
         with path.open("w", encoding="utf-8") as handle:
             yaml.safe_dump(data, handle, sort_keys=True)
 
     def load_global(self) -> GlobalConfig:
-        data = self._load_yaml(self._global_config())
+        data = copy.deepcopy(_GLOBAL_CONFIG_DATA.get(self._global_config(), self._load_yaml))
+        user_config = self.user_config_path()
+        if user_config.is_file():
+            # Keys in ~/.aicage/config.yaml override the packaged defaults.
+            data.update(copy.deepcopy(_USER_CONFIG_DATA.get(user_config, self._load_yaml)))
         return GlobalConfig.from_mapping(data)
 
     def _project_path(self, project_realpath: Path) -> Path:
@@ -60,6 +76,18 @@ class SettingsStore:
     def save_project(self, project_realpath: Path, config: ProjectConfig) -> None:
         self._save_yaml(self._project_path(project_realpath), config.to_mapping())
 
+    def load_all_projects(self) -> list[ProjectConfig]:
+        """
+        Returns every stored project config, in file name order. Files are named by a hash of the project path,
+        so configs that do not record their project path are skipped.
+        """
+        projects: list[ProjectConfig] = []
+        for path in sorted(self.projects_dir.glob("*.yaml")):
+            data = self._load_yaml(path)
+            project_path = stored_project_path(data)
+            if project_path is not None:
+                projects.append(ProjectConfig.from_mapping(project_path, data))
+        return projects
 
     @staticmethod
     def _global_config() -> Path:
@@ -68,6 +96,12 @@ class SettingsStore:
         """
         return find_packaged_path(_CONFIG_FILENAME)
 
+    def user_config_path(self) -> Path:
+        """
+        Returns the path to the optional user config that overrides packaged global config values.
+        """
+        return self.base_dir / _CONFIG_FILENAME
+
     def project_config_path(self, project_realpath: Path) -> Path:
         """
         Returns the path to a project's config file under the base directory.
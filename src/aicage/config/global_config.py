@@ -12,6 +12,41 @@ _DEFAULT_IMAGE_BASE_KEY: str = "default_image_base"
 _VERSION_CHECK_IMAGE_KEY: str = "version_check_image"
 _LOCAL_IMAGE_REPOSITORY_KEY: str = "local_image_repository"
 _GLOBAL_AGENTS_KEY: str = "agents"
+_LAUNCH_MODE_KEY: str = "launch_mode"
+_DIGEST_CACHE_TTL_SECONDS_KEY: str = "digest_cache_ttl_seconds"
+_IMAGE_REFRESH_KEY: str = "image_refresh"
+_IMAGE_MAX_AGE_SECONDS_KEY: str = "image_max_age_seconds"
+_NETWORK_BUDGET_SECONDS_KEY: str = "network_budget_seconds"
+_NETWORK_REQUEST_TIMEOUT_SECONDS_KEY: str = "network_request_timeout_seconds"
+_OFFLINE_KEY: str = "offline"
+_REGISTRY_MIRRORS_KEY: str = "registry_mirrors"
+_MIRROR_REGISTRY_KEY: str = "registry"
+_MIRROR_API_URL_KEY: str = "api_url"
+_BUILD_CACHE_KEY: str = "build_cache"
+
+DEFAULT_DIGEST_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+DEFAULT_IMAGE_MAX_AGE_SECONDS: int = 7 * 24 * 60 * 60
+DEFAULT_NETWORK_BUDGET_SECONDS: int = 10
+DEFAULT_NETWORK_REQUEST_TIMEOUT_SECONDS: int = 5
+
+LAUNCH_MODE_SUBPROCESS: str = "subprocess"
+LAUNCH_MODE_EXEC: str = "exec"
+LAUNCH_MODE_ENGINE: str = "engine"
+_LAUNCH_MODES: tuple[str, ...] = (LAUNCH_MODE_SUBPROCESS, LAUNCH_MODE_EXEC, LAUNCH_MODE_ENGINE)
+
+IMAGE_REFRESH_BLOCKING: str = "blocking"
+IMAGE_REFRESH_BACKGROUND: str = "background"
+_IMAGE_REFRESH_MODES: tuple[str, ...] = (IMAGE_REFRESH_BLOCKING, IMAGE_REFRESH_BACKGROUND)
+
+BUILD_CACHE_DAEMON: str = "daemon"
+BUILD_CACHE_LOCAL: str = "local"
+_BUILD_CACHE_MODES: tuple[str, ...] = (BUILD_CACHE_DAEMON, BUILD_CACHE_LOCAL)
+
+
+@dataclass(frozen=True)
+class RegistryMirror:
+    registry: str
+    api_url: str
 
 
 @dataclass
@@ -25,6 +60,15 @@ class GlobalConfig:
     version_check_image: str
     local_image_repository: str
     agents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    launch_mode: str = LAUNCH_MODE_SUBPROCESS
+    digest_cache_ttl_seconds: int = DEFAULT_DIGEST_CACHE_TTL_SECONDS
+    image_refresh: str = IMAGE_REFRESH_BLOCKING
+    image_max_age_seconds: int = DEFAULT_IMAGE_MAX_AGE_SECONDS
+    network_budget_seconds: int = DEFAULT_NETWORK_BUDGET_SECONDS
+    network_request_timeout_seconds: int = DEFAULT_NETWORK_REQUEST_TIMEOUT_SECONDS
+    offline: bool = False
+    registry_mirrors: list[RegistryMirror] = field(default_factory=list)
+    build_cache: str = BUILD_CACHE_DAEMON
 
     @classmethod
     def from_mapping(cls, data: dict[str, Any]) -> "GlobalConfig":
@@ -41,6 +85,39 @@ class GlobalConfig:
         missing = [key for key in required if key not in data]
         if missing:
             raise ConfigError(f"Missing required config values: {', '.join(missing)}.")
+        launch_mode = data.get(_LAUNCH_MODE_KEY, LAUNCH_MODE_SUBPROCESS)
+        if launch_mode not in _LAUNCH_MODES:
+            raise ConfigError(
+                f"Invalid launch_mode '{launch_mode}'; expected one of: {', '.join(_LAUNCH_MODES)}."
+            )
+        digest_cache_ttl_seconds = data.get(_DIGEST_CACHE_TTL_SECONDS_KEY, DEFAULT_DIGEST_CACHE_TTL_SECONDS)
+        if not isinstance(digest_cache_ttl_seconds, int) or digest_cache_ttl_seconds < 0:
+            raise ConfigError(f"{_DIGEST_CACHE_TTL_SECONDS_KEY} must be a non-negative integer.")
+        image_refresh = data.get(_IMAGE_REFRESH_KEY, IMAGE_REFRESH_BLOCKING)
+        if image_refresh not in _IMAGE_REFRESH_MODES:
+            raise ConfigError(
+                f"Invalid image_refresh '{image_refresh}'; expected one of: {', '.join(_IMAGE_REFRESH_MODES)}."
+            )
+        image_max_age_seconds = data.get(_IMAGE_MAX_AGE_SECONDS_KEY, DEFAULT_IMAGE_MAX_AGE_SECONDS)
+        if not isinstance(image_max_age_seconds, int) or image_max_age_seconds < 0:
+            raise ConfigError(f"{_IMAGE_MAX_AGE_SECONDS_KEY} must be a non-negative integer.")
+        network_budget_seconds = data.get(_NETWORK_BUDGET_SECONDS_KEY, DEFAULT_NETWORK_BUDGET_SECONDS)
+        if not isinstance(network_budget_seconds, int) or network_budget_seconds < 1:
+            raise ConfigError(f"{_NETWORK_BUDGET_SECONDS_KEY} must be a positive integer.")
+        network_request_timeout_seconds = data.get(
+            _NETWORK_REQUEST_TIMEOUT_SECONDS_KEY, DEFAULT_NETWORK_REQUEST_TIMEOUT_SECONDS
+        )
+        if not isinstance(network_request_timeout_seconds, int) or network_request_timeout_seconds < 1:
+            raise ConfigError(f"{_NETWORK_REQUEST_TIMEOUT_SECONDS_KEY} must be a positive integer.")
+        offline = data.get(_OFFLINE_KEY, False)
+        if not isinstance(offline, bool):
+            raise ConfigError(f"{_OFFLINE_KEY} must be a boolean.")
+        registry_mirrors = _parse_registry_mirrors(data.get(_REGISTRY_MIRRORS_KEY, []))
+        build_cache = data.get(_BUILD_CACHE_KEY, BUILD_CACHE_DAEMON)
+        if build_cache not in _BUILD_CACHE_MODES:
+            raise ConfigError(
+                f"Invalid build_cache '{build_cache}'; expected one of: {', '.join(_BUILD_CACHE_MODES)}."
+            )
         return cls(
             image_registry=data[_IMAGE_REGISTRY_KEY],
             image_registry_api_url=data[_IMAGE_REGISTRY_API_URL_KEY],
@@ -51,6 +128,15 @@ class GlobalConfig:
             version_check_image=data[_VERSION_CHECK_IMAGE_KEY],
             local_image_repository=data[_LOCAL_IMAGE_REPOSITORY_KEY],
             agents=data.get(_GLOBAL_AGENTS_KEY, {}) or {},
+            launch_mode=launch_mode,
+            digest_cache_ttl_seconds=digest_cache_ttl_seconds,
+            image_refresh=image_refresh,
+            image_max_age_seconds=image_max_age_seconds,
+            network_budget_seconds=network_budget_seconds,
+            network_request_timeout_seconds=network_request_timeout_seconds,
+            offline=offline,
+            registry_mirrors=registry_mirrors,
+            build_cache=build_cache,
         )
 
     def to_mapping(self) -> dict[str, Any]:
@@ -64,4 +150,32 @@ class GlobalConfig:
             _VERSION_CHECK_IMAGE_KEY: self.version_check_image,
             _LOCAL_IMAGE_REPOSITORY_KEY: self.local_image_repository,
             _GLOBAL_AGENTS_KEY: self.agents,
+            _LAUNCH_MODE_KEY: self.launch_mode,
+            _DIGEST_CACHE_TTL_SECONDS_KEY: self.digest_cache_ttl_seconds,
+            _IMAGE_REFRESH_KEY: self.image_refresh,
+            _IMAGE_MAX_AGE_SECONDS_KEY: self.image_max_age_seconds,
+            _NETWORK_BUDGET_SECONDS_KEY: self.network_budget_seconds,
+            _NETWORK_REQUEST_TIMEOUT_SECONDS_KEY: self.network_request_timeout_seconds,
+            _OFFLINE_KEY: self.offline,
+            _REGISTRY_MIRRORS_KEY: [
+                {_MIRROR_REGISTRY_KEY: mirror.registry, _MIRROR_API_URL_KEY: mirror.api_url}
+                for mirror in self.registry_mirrors
+            ],
+            _BUILD_CACHE_KEY: self.build_cache,
         }
+
+
+def _parse_registry_mirrors(value: Any) -> list[RegistryMirror]:
+    if not isinstance(value, list):
+        raise ConfigError(f"{_REGISTRY_MIRRORS_KEY} must be a list.")
+    mirrors: list[RegistryMirror] = []
+    for entry in value:
+        registry = entry.get(_MIRROR_REGISTRY_KEY) if isinstance(entry, dict) else None
+        api_url = entry.get(_MIRROR_API_URL_KEY) if isinstance(entry, dict) else None
+        if not isinstance(registry, str) or not isinstance(api_url, str):
+            raise ConfigError(
+                f"Each {_REGISTRY_MIRRORS_KEY} entry needs string '{_MIRROR_REGISTRY_KEY}' and "
+                f"'{_MIRROR_API_URL_KEY}' values."
+            )
+        mirrors.append(RegistryMirror(registry=registry, api_url=api_url.rstrip("/")))
+    return mirrors
@@ -76,6 +76,14 @@ class AgentConfig:
         return payload
 
 
+def stored_project_path(data: dict[str, Any]) -> Path | None:
+    """
+    Returns the project path a stored project config was saved for, when it records one.
+    """
+    path = data.get(_PROJECT_PATH_KEY)
+    return Path(path) if isinstance(path, str) and path else None
+
+
 @dataclass
 class ProjectConfig:
     path: str
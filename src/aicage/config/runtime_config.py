@@ -1,23 +1,32 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 
+from aicage._tracing import traced
 from aicage.cli_types import ParsedArgs
 from aicage.config._file_locking import lock_project_config
 from aicage.config.config_store import SettingsStore
 from aicage.config.context import ConfigContext
-from aicage.config.global_config import GlobalConfig
+from aicage.config.global_config import IMAGE_REFRESH_BACKGROUND, GlobalConfig
 from aicage.config.project_config import AGENT_BASE_KEY, AgentConfig
 from aicage.errors import CliError
-from aicage.registry.agent_version import AgentVersionChecker
+from aicage.registry._network_budget import start_network_budget
+from aicage.registry._refresh_store import RefreshStore
+from aicage.registry._remote_query import discard_prefetched_digests, prefetch_remote_digest
+from aicage.registry.agent_version import AgentVersionChecker, VersionCheckStore
 from aicage.registry.image_selection import select_agent_image
 from aicage.registry.images_metadata.loader import load_images_metadata
-from aicage.registry.images_metadata.models import ImagesMetadata
+from aicage.registry.images_metadata.models import AgentMetadata, ImagesMetadata
+from aicage.registry.local_build._store import BuildStore
 from aicage.runtime.mounts import resolve_mounts
 from aicage.runtime.prompts import prompt_yes_no
 from aicage.runtime.run_args import MountSpec
 
+# Version check and remote digest lookup; prompting steps stay on the calling thread.
+_PREFLIGHT_WORKERS = 2
+
 
 @dataclass(frozen=True)
 class RunConfig:
@@ -30,16 +39,22 @@ class RunConfig:
     images_metadata: ImagesMetadata
     project_docker_args: str
     mounts: list[MountSpec]
+    refresh: bool = False
+    refresh_deferred: bool = False
 
 
+@traced("load_run_config")
 def load_run_config(agent: str, parsed: ParsedArgs | None = None) -> RunConfig:
+    discard_prefetched_digests()
     store = SettingsStore()
     project_path = Path.cwd().resolve()
     project_config_path = store.project_config_path(project_path)
 
     with lock_project_config(project_config_path):
         global_cfg = store.load_global()
-        images_metadata = load_images_metadata(global_cfg.local_image_repository)
+        if parsed is not None and parsed.offline:
+            global_cfg = replace(global_cfg, offline=True)
+        images_metadata = load_images_metadata(global_cfg.local_image_repository, agent)
         project_cfg = store.load_project(project_path)
         context = ConfigContext(
             store=store,
@@ -48,17 +63,44 @@ def load_run_config(agent: str, parsed: ParsedArgs | None = None) -> RunConfig:
             images_metadata=images_metadata,
         )
         image_ref = select_agent_image(agent, context)
-        agent_version = _check_agent_version(agent, global_cfg, images_metadata)
         agent_cfg = project_cfg.agents.setdefault(agent, AgentConfig())
+        base = agent_cfg.base or global_cfg.agents.get(agent, {}).get(AGENT_BASE_KEY)
+        refresh = parsed.refresh if parsed else False
+
+        # In background refresh mode a recently checked image is launched as is; version and digest checks
+        # move to the background worker.
+        refresh_deferred = (
+            not global_cfg.offline
+            and global_cfg.image_refresh == IMAGE_REFRESH_BACKGROUND
+            and not refresh
+            and RefreshStore().is_fresh(image_ref, global_cfg.image_max_age_seconds)
+        )
 
         existing_project_docker_args: str = agent_cfg.docker_args
 
-        mounts = resolve_mounts(context, agent, parsed)
+        # Registry lookups from here to the launch share one deadline; prompts above do not count against it.
+        if not global_cfg.offline:
+            start_network_budget(global_cfg.network_budget_seconds, global_cfg.network_request_timeout_seconds)
+
+        # Overlap the version check and the registry lookup with mount probing; the launch waits for the slowest.
+        executor = ThreadPoolExecutor(max_workers=_PREFLIGHT_WORKERS, thread_name_prefix="aicage-preflight")
+        try:
+            version_future: Future[str | None] | None = None
+            if not refresh_deferred and not global_cfg.offline:
+                version_future = executor.submit(_check_agent_version, agent, global_cfg, images_metadata)
+                target = _digest_prefetch_target(images_metadata.agents[agent], image_ref, base, global_cfg)
+                if target is not None:
+                    prefetch_remote_digest(executor, *target, global_cfg, refresh)
+            mounts = resolve_mounts(context, agent, parsed)
+            agent_version = version_future.result() if version_future is not None else None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if global_cfg.offline:
+            agent_version = _last_known_agent_version(agent, base, images_metadata)
 
         _persist_docker_args(agent_cfg, parsed)
         store.save_project(project_path, project_cfg)
 
-        base = agent_cfg.base or global_cfg.agents.get(agent, {}).get(AGENT_BASE_KEY)
         if base is None:
             raise CliError(f"Base selection is missing for agent '{agent}'.")
 
@@ -72,9 +114,19 @@ def load_run_config(agent: str, parsed: ParsedArgs | None = None) -> RunConfig:
             images_metadata=images_metadata,
             project_docker_args=existing_project_docker_args,
             mounts=mounts,
+            refresh=refresh,
+            refresh_deferred=refresh_deferred,
         )
 
 
+def with_agent_version(run_config: RunConfig) -> RunConfig:
+    """
+    Returns `run_config` with the agent version resolved, for launches whose checks were deferred.
+    """
+    agent_version = _check_agent_version(run_config.agent, run_config.global_cfg, run_config.images_metadata)
+    return replace(run_config, agent_version=agent_version, refresh_deferred=False)
+
+
 def _persist_docker_args(agent_cfg: AgentConfig, parsed: ParsedArgs | None) -> None:
     if parsed is None or not parsed.docker_args:
         return
@@ -105,3 +157,29 @@ def _check_agent_version(
         return None
     checker = AgentVersionChecker(global_cfg)
     return checker.get_version(agent, agent_metadata, definition_dir)
+
+
+def _last_known_agent_version(agent: str, base: str | None, images_metadata: ImagesMetadata) -> str | None:
+    # Offline launches take the version the local image was built with, else the last successful check.
+    if images_metadata.agents[agent].local_definition_dir is None:
+        return None
+    record = BuildStore().load(agent, base) if base is not None else None
+    if record is not None and record.agent_version:
+        return record.agent_version
+    return VersionCheckStore().load(agent)
+
+
+def _digest_prefetch_target(
+    agent_metadata: AgentMetadata,
+    image_ref: str,
+    base: str | None,
+    global_cfg: GlobalConfig,
+) -> tuple[str, str] | None:
+    if agent_metadata.local_definition_dir is None:
+        return image_ref, global_cfg.image_repository
+    if base is None:
+        return None
+    return (
+        f"{global_cfg.image_registry}/{global_cfg.image_base_repository}:{base}",
+        global_cfg.image_base_repository,
+    )
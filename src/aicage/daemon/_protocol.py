@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, BinaryIO
+
+_DEFAULT_SOCKET_PATH = "~/.aicage/run/daemon.sock"
+_MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+
+ARGV_KEY: str = "argv"
+CWD_KEY: str = "cwd"
+ENV_KEY: str = "env"
+VERSION_KEY: str = "version"
+STATUS_KEY: str = "status"
+COMMAND_KEY: str = "command"
+LAUNCH_MODE_KEY: str = "launch_mode"
+ENGINE_SPEC_KEY: str = "engine_spec"
+STDOUT_KEY: str = "stdout"
+STDERR_KEY: str = "stderr"
+MESSAGE_KEY: str = "message"
+
+STATUS_OK: str = "ok"
+STATUS_ERROR: str = "error"
+STATUS_FALLBACK: str = "fallback"
+
+
+def socket_path() -> Path:
+    return Path(os.path.expanduser(_DEFAULT_SOCKET_PATH))
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def encode_message(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload).encode("utf-8") + b"\n"
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any] | None:
+    line = stream.readline(_MAX_MESSAGE_BYTES)
+    if not line:
+        return None
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
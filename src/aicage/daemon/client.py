@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import socket
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, TypeGuard
+
+from aicage import __version__
+from aicage._logging import get_logger
+from aicage.cli._docker_run import LaunchPlan
+from aicage.config.global_config import LAUNCH_MODE_SUBPROCESS
+from aicage.errors import CliError
+from aicage.runtime.run_args import EngineRunSpec
+
+from ._protocol import (
+    ARGV_KEY,
+    COMMAND_KEY,
+    CWD_KEY,
+    ENGINE_SPEC_KEY,
+    ENV_KEY,
+    LAUNCH_MODE_KEY,
+    MESSAGE_KEY,
+    STATUS_ERROR,
+    STATUS_KEY,
+    STATUS_OK,
+    STDERR_KEY,
+    STDOUT_KEY,
+    VERSION_KEY,
+    daemon_supported,
+    encode_message,
+    read_message,
+    socket_path,
+)
+
+_CONNECT_TIMEOUT_SECONDS = 0.5
+
+
+def request_launch(argv: Sequence[str], cwd: Path) -> LaunchPlan | None:
+    """
+    Asks a running `aicage daemon` to prepare the launch.
+    Returns None when no daemon answers or it cannot handle the request; the CLI then launches in-process.
+    """
+    path = socket_path()
+    if not daemon_supported() or not path.exists():
+        return None
+
+    logger = get_logger()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT_SECONDS)
+            sock.connect(str(path))
+            # Preparing a launch may pull or build an image, so wait for as long as that takes.
+            sock.settimeout(None)
+            request = {ARGV_KEY: list(argv), CWD_KEY: str(cwd), ENV_KEY: dict(os.environ), VERSION_KEY: __version__}
+            sock.sendall(encode_message(request))
+            with sock.makefile("rb") as stream:
+                reply = _read_reply(stream)
+    except OSError as exc:
+        logger.info("aicage daemon at %s is not available: %s", path, exc)
+        return None
+
+    if reply is None:
+        return None
+    status = reply.get(STATUS_KEY)
+    if status == STATUS_ERROR:
+        raise CliError(str(reply.get(MESSAGE_KEY) or "aicage daemon failed to prepare the launch."))
+    command = reply.get(COMMAND_KEY)
+    if status != STATUS_OK or not _is_command(command):
+        logger.info("aicage daemon deferred launch to the CLI.")
+        return None
+    logger.info("Launch prepared by aicage daemon.")
+    launch_mode = reply.get(LAUNCH_MODE_KEY)
+    return LaunchPlan(
+        command=list(command),
+        launch_mode=launch_mode if isinstance(launch_mode, str) else LAUNCH_MODE_SUBPROCESS,
+        engine_spec=_engine_spec(reply.get(ENGINE_SPEC_KEY)),
+    )
+
+
+def _read_reply(stream: BinaryIO) -> dict[str, Any] | None:
+    # The daemon streams prepare-time output (pull progress, build notices) before the final status message.
+    while True:
+        message = read_message(stream)
+        if message is None:
+            return None
+        _print_output(message)
+        if STATUS_KEY in message:
+            return message
+
+
+def _print_output(message: dict[str, Any]) -> None:
+    for key, target in ((STDOUT_KEY, sys.stdout), (STDERR_KEY, sys.stderr)):
+        text = message.get(key)
+        if isinstance(text, str) and text:
+            target.write(text)
+            target.flush()
+
+
+def _engine_spec(value: object) -> EngineRunSpec | None:
+    if not isinstance(value, dict):
+        return None
+    image_ref = value.get("image_ref")
+    command = value.get("command")
+    env = value.get("env")
+    binds = value.get("binds")
+    if not isinstance(image_ref, str) or not all(_is_str_list(item) for item in (command, env, binds)):
+        return None
+    return EngineRunSpec(image_ref=image_ref, command=list(command), env=list(env), binds=list(binds))
+
+
+def _is_str_list(value: object) -> TypeGuard[list[str]]:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_command(value: object) -> TypeGuard[list[str]]:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, str) for item in value)
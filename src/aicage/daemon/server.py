@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import dataclasses
+import io
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, BinaryIO, TypeGuard
+
+from aicage import __version__
+from aicage._logging import get_logger
+from aicage.cli._launch import prepare_launch
+from aicage.cli._parse import parse_cli
+from aicage.config.errors import ConfigError
+from aicage.errors import CliError
+from aicage.runtime.prompts import PromptUnavailableError, prompts_disabled
+
+from ._protocol import (
+    ARGV_KEY,
+    COMMAND_KEY,
+    CWD_KEY,
+    ENGINE_SPEC_KEY,
+    ENV_KEY,
+    LAUNCH_MODE_KEY,
+    MESSAGE_KEY,
+    STATUS_ERROR,
+    STATUS_FALLBACK,
+    STATUS_KEY,
+    STATUS_OK,
+    STDERR_KEY,
+    STDOUT_KEY,
+    VERSION_KEY,
+    daemon_supported,
+    encode_message,
+    read_message,
+    socket_path,
+)
+
+_PEERCRED_FORMAT = "3i"
+
+
+def run_command(argv: Sequence[str]) -> int:
+    """
+    Runs `aicage daemon` in the foreground until interrupted.
+    """
+    if argv:
+        raise CliError("Usage: aicage daemon")
+    if not daemon_supported():
+        raise CliError("aicage daemon requires Unix domain sockets.")
+    serve(socket_path())
+    return 0
+
+
+def serve(path: Path) -> None:
+    logger = get_logger()
+    _prepare_socket_path(path)
+    server = socketserver.UnixStreamServer(str(path), _LaunchRequestHandler)
+    os.chmod(path, 0o600)
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    print(f"[aicage] Daemon listening on {path}")
+    logger.info("aicage daemon listening on %s", path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+        logger.info("aicage daemon stopped.")
+
+
+def handle_launch_request(
+    request: dict[str, Any],
+    stdout: io.TextIOBase,
+    stderr: io.TextIOBase,
+) -> dict[str, Any]:
+    """
+    Prepares a launch exactly like the CLI would, without prompting, in the client's cwd and environment.
+    Output is written to `stdout`/`stderr` as it happens. Requests that need a prompt, or come from a different
+    aicage version, are handed back to the CLI.
+    """
+    logger = get_logger()
+    argv = request.get(ARGV_KEY)
+    cwd = request.get(CWD_KEY)
+    env = request.get(ENV_KEY)
+    valid = _is_str_list(argv) and isinstance(cwd, str) and _is_str_mapping(env)
+    if request.get(VERSION_KEY) != __version__ or not valid:
+        return {STATUS_KEY: STATUS_FALLBACK}
+
+    try:
+        # Requests are served one at a time, so switching the process cwd and environment is safe.
+        os.chdir(cwd)
+        with _client_environment(env), redirect_stdout(stdout), redirect_stderr(stderr), prompts_disabled():
+            parsed = parse_cli(argv)
+            if parsed.config_action:
+                return {STATUS_KEY: STATUS_FALLBACK}
+            plan = prepare_launch(parsed)
+    except PromptUnavailableError:
+        logger.info("Daemon launch for %s needs a prompt; deferring to the CLI.", cwd)
+        return {STATUS_KEY: STATUS_FALLBACK}
+    except (CliError, ConfigError) as exc:
+        return {STATUS_KEY: STATUS_ERROR, MESSAGE_KEY: str(exc)}
+    except (Exception, SystemExit):  # pylint: disable=broad-except
+        logger.exception("Daemon failed to prepare launch in %s", cwd)
+        return {STATUS_KEY: STATUS_FALLBACK}
+
+    return {
+        STATUS_KEY: STATUS_OK,
+        COMMAND_KEY: plan.command,
+        LAUNCH_MODE_KEY: plan.launch_mode,
+        ENGINE_SPEC_KEY: dataclasses.asdict(plan.engine_spec) if plan.engine_spec else None,
+    }
+
+
+class _StreamedOutput(io.TextIOBase):
+    """
+    Forwards each write to the client as its own message, so pull progress shows up while it happens.
+    """
+
+    def __init__(self, connection: BinaryIO, key: str, lock: threading.Lock) -> None:
+        self._connection = connection
+        self._key = key
+        self._lock = lock
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            with self._lock:
+                try:
+                    self._connection.write(encode_message({self._key: text}))
+                    self._connection.flush()
+                except OSError:
+                    # The client went away; the launch is prepared anyway and the next one reuses the work.
+                    pass
+        return len(text)
+
+
+class _LaunchRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        if not _peer_is_current_user(self.request):
+            get_logger().warning("Rejected daemon connection from another user.")
+            return
+        request = read_message(self.rfile)
+        if request is None:
+            return
+        lock = threading.Lock()
+        reply = handle_launch_request(
+            request,
+            stdout=_StreamedOutput(self.wfile, STDOUT_KEY, lock),
+            stderr=_StreamedOutput(self.wfile, STDERR_KEY, lock),
+        )
+        with lock:
+            self.wfile.write(encode_message(reply))
+
+
+def _is_str_list(value: object) -> TypeGuard[list[str]]:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _is_str_mapping(value: object) -> TypeGuard[dict[str, str]]:
+    return isinstance(value, dict) and all(
+        isinstance(key, str) and isinstance(item, str) for key, item in value.items()
+    )
+
+
+@contextmanager
+def _client_environment(env: Mapping[str, str]) -> Iterator[None]:
+    # USER, HOME, GNUPGHOME, SSH_AUTH_SOCK, git's env and the like must come from the client, not the daemon.
+    saved = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def _prepare_socket_path(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.chmod(path.parent, 0o700)
+    if not path.exists():
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+            return
+    raise CliError(f"An aicage daemon is already listening on {path}.")
+
+
+def _peer_is_current_user(connection: socket.socket) -> bool:
+    peercred = getattr(socket, "SO_PEERCRED", None)
+    if peercred is None:
+        # Without peer credentials, rely on the 0700 socket directory.
+        return True
+    raw = connection.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize(_PEERCRED_FORMAT))
+    _, uid, _ = struct.unpack(_PEERCRED_FORMAT, raw)
+    return uid == os.getuid()
+
+
+def _exit_on_signal(_signum: int, _frame: object) -> None:
+    sys.exit(0)
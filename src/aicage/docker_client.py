@@ -5,7 +5,10 @@ from functools import lru_cache
 import docker
 from docker.client import DockerClient
 
+from aicage._tracing import DOCKER_API, span
+
 
 @lru_cache(maxsize=1)
 def get_docker_client() -> DockerClient:
-    return docker.from_env()
+    with span("docker.from_env", DOCKER_API):
+        return docker.from_env()
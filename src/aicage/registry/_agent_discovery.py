@@ -7,8 +7,12 @@ from aicage.registry.images_metadata.models import ImagesMetadata
 def discover_agents(
     images_metadata: ImagesMetadata,
     local_image_repository: str,
+    agent: str | None = None,
 ) -> ImagesMetadata:
-    custom_agents = load_custom_agents(images_metadata, local_image_repository)
+    """
+    Merges custom agents into the release metadata; with `agent`, only that custom agent is resolved.
+    """
+    custom_agents = load_custom_agents(images_metadata, local_image_repository, agent)
     if not custom_agents:
         return images_metadata
 
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aicage._state_files import read_json, update_json
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/remote-digests"
+_DIGESTS_FILENAME = "digests.json"
+_DIGEST_KEY: str = "digest"
+_ETAG_KEY: str = "etag"
+_CHECKED_AT_KEY: str = "checked_at"
+_CONFIG_DIGEST_KEY: str = "config_digest"
+
+
+@dataclass(frozen=True)
+class CachedDigest:
+    digest: str
+    etag: str | None
+    checked_at: float
+    config_digest: str | None = None
+
+
+class DigestCache:
+    """
+    Persists remote manifest digests by manifest URL, with the ETag and time of the last registry check.
+    `config_digest` is the config digest of the manifest for the local platform, when it was resolved.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def load(self, manifest_url: str) -> CachedDigest | None:
+        entry = self._entries().get(manifest_url)
+        if not isinstance(entry, dict):
+            return None
+        digest = entry.get(_DIGEST_KEY)
+        etag = entry.get(_ETAG_KEY)
+        checked_at = entry.get(_CHECKED_AT_KEY)
+        config_digest = entry.get(_CONFIG_DIGEST_KEY)
+        if not isinstance(digest, str) or not isinstance(checked_at, (int, float)):
+            return None
+        return CachedDigest(
+            digest=digest,
+            etag=etag if isinstance(etag, str) else None,
+            checked_at=checked_at,
+            config_digest=config_digest if isinstance(config_digest, str) else None,
+        )
+
+    def save(self, manifest_url: str, cached: CachedDigest) -> None:
+        entry = {
+            _DIGEST_KEY: cached.digest,
+            _ETAG_KEY: cached.etag,
+            _CHECKED_AT_KEY: cached.checked_at,
+            _CONFIG_DIGEST_KEY: cached.config_digest,
+        }
+        update_json(self._path(), lambda payload: {**_as_entries(payload), manifest_url: entry})
+
+    def _entries(self) -> dict[str, Any]:
+        return _as_entries(read_json(self._path()))
+
+    def _path(self) -> Path:
+        return self._base_dir / _DIGESTS_FILENAME
+
+
+def _as_entries(payload: Any) -> dict[str, Any]:
+    return payload if isinstance(payload, dict) else {}
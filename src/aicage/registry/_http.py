@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import http.client
+import shutil
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Mapping
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import BinaryIO
+from urllib.parse import urljoin, urlsplit
+
+from aicage.registry._network_budget import request_timeout
+from aicage.registry._rate_limit import RateLimitStore, RegistryRateLimited
+
+_MAX_IDLE_PER_HOST = 4
+_TIMEOUT_SECONDS = 30
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+_HostKey = tuple[str, str, int]
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+class RegistryHttpClient:
+    """
+    Keeps idle keep-alive connections per registry host so token and manifest requests reuse TCP/TLS sessions.
+    Requests on one connection are sequential; at most `max_idle_per_host` idle connections are kept per host.
+    Requests count against the launch's network budget unless `budgeted` is False.
+    """
+
+    def __init__(
+        self,
+        max_idle_per_host: int = _MAX_IDLE_PER_HOST,
+        timeout: float = _TIMEOUT_SECONDS,
+        budgeted: bool = True,
+    ) -> None:
+        self._max_idle_per_host = max_idle_per_host
+        self._timeout = timeout
+        self._budgeted = budgeted
+        self._idle: dict[_HostKey, deque[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._connections_opened = 0
+        self._requests_sent: Counter[str] = Counter()
+
+    @property
+    def connections_opened(self) -> int:
+        return self._connections_opened
+
+    def request_counts(self) -> dict[str, int]:
+        """
+        Returns the requests sent since the last reset by method, counting each redirect hop.
+        """
+        with self._lock:
+            return dict(self._requests_sent)
+
+    def reset_request_counts(self) -> None:
+        with self._lock:
+            self._requests_sent.clear()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Mapping[str, str] | None = None,
+        sink: BinaryIO | None = None,
+    ) -> HttpResponse:
+        """
+        Sends the request, following redirects. With `sink`, a 200 body is streamed into it instead of being
+        returned, so large downloads are never held in memory.
+        """
+        request_headers = dict(headers or {})
+        for _ in range(_MAX_REDIRECTS):
+            response = self._request_once(method, url, request_headers, sink)
+            location = response.headers.get("Location") or response.headers.get("location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                return response
+            target = urljoin(url, location)
+            if urlsplit(target).netloc != urlsplit(url).netloc:
+                # Registries redirect blob and manifest requests to storage hosts that must not see the token.
+                request_headers.pop("Authorization", None)
+            url = target
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for pool in pools:
+            for connection in pool:
+                connection.close()
+
+    def _request_once(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        sink: BinaryIO | None,
+    ) -> HttpResponse:
+        parts = urlsplit(url)
+        key = _host_key(parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        # Raises NetworkBudgetExhausted (a TimeoutError) once the launch's network budget is spent.
+        timeout = request_timeout(self._timeout) if self._budgeted else self._timeout
+        connection, reused = self._checkout(key, timeout)
+        with self._lock:
+            self._requests_sent[method] += 1
+        try:
+            connection.request(method, path, headers=headers)
+            response = connection.getresponse()
+        except (ConnectionError, http.client.RemoteDisconnected, http.client.BadStatusLine):
+            connection.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; retry once on a fresh one.
+            connection, _ = self._open(key, timeout)
+            try:
+                connection.request(method, path, headers=headers)
+                response = connection.getresponse()
+            except BaseException:
+                connection.close()
+                raise
+        except BaseException:
+            connection.close()
+            raise
+
+        try:
+            if sink is not None and response.status == HTTPStatus.OK:
+                shutil.copyfileobj(response, sink)
+                body = b""
+            else:
+                body = response.read()
+        except BaseException:
+            connection.close()
+            raise
+        result = HttpResponse(status=response.status, headers=dict(response.getheaders()), body=body)
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(key, connection)
+        return result
+
+    def _checkout(self, key: _HostKey, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            pool = self._idle.get(key)
+            connection = pool.pop() if pool else None
+        if connection is None:
+            return self._open(key, timeout)
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+        return connection, True
+
+    def _open(self, key: _HostKey, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self._connections_opened += 1
+        return connection_class(host, port, timeout=timeout), False
+
+    def _checkin(self, key: _HostKey, connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            pool = self._idle.setdefault(key, deque())
+            if len(pool) < self._max_idle_per_host:
+                pool.append(connection)
+                return
+        connection.close()
+
+
+def _host_key(scheme: str, host: str, port: int | None) -> _HostKey:
+    if port is None:
+        port = 443 if scheme == "https" else 80
+    return scheme, host, port
+
+
+_CLIENT = RegistryHttpClient()
+
+
+def registry_request(
+    method: str,
+    url: str,
+    headers: Mapping[str, str] | None = None,
+    sink: BinaryIO | None = None,
+) -> HttpResponse:
+    """
+    Sends a request through the shared pooled registry client, unless the host is in a rate-limit backoff.
+    Rate-limit responses start or extend the shared backoff. `sink` receives a streamed 200 body.
+    """
+    host = urlsplit(url).netloc
+    store = RateLimitStore()
+    blocked_until = store.blocked_until(host)
+    if blocked_until is not None:
+        raise RegistryRateLimited(f"Registry {host} is rate limited for another {blocked_until - time.time():.0f}s.")
+    response = _CLIENT.request(method, url, headers, sink)
+    store.observe(host, response.status, response.headers)
+    return response
+
+
+def registry_rate_limited(url: str) -> bool:
+    return RateLimitStore().blocked_until(urlsplit(url).netloc) is not None
+
+
+def registry_client() -> RegistryHttpClient:
+    return _CLIENT
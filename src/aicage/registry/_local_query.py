@@ -1,20 +1,36 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 from docker.errors import DockerException, ImageNotFound
 
-from aicage.config.runtime_config import RunConfig
+from aicage._tracing import DOCKER_API, span
+from aicage.config.global_config import GlobalConfig
 from aicage.docker_client import get_docker_client
 
 
-def get_local_repo_digest(run_config: RunConfig) -> str | None:
-    repository = f"{run_config.global_cfg.image_registry}/{run_config.global_cfg.image_repository}"
-    return get_local_repo_digest_for_repo(run_config.image_ref, repository)
+def get_local_repo_digest(image_ref: str, global_cfg: GlobalConfig) -> str | None:
+    repository = f"{global_cfg.image_registry}/{global_cfg.image_repository}"
+    return get_local_repo_digest_for_repo(
+        image_ref,
+        repository,
+        mirror_registries=[mirror.registry for mirror in global_cfg.registry_mirrors],
+    )
 
 
-def get_local_repo_digest_for_repo(image_ref: str, repository: str) -> str | None:
+def get_local_repo_digest_for_repo(
+    image_ref: str,
+    repository: str,
+    mirror_registries: Sequence[str] = (),
+) -> str | None:
+    """
+    Returns the digest `image_ref` was pulled with from `repository`. Images pulled through a mirror only carry
+    the mirror's repo digest, which is accepted too since pull-through mirrors serve the upstream manifests.
+    """
     try:
         client = get_docker_client()
-        image = client.images.get(image_ref)
+        with span("images.get", DOCKER_API, image=image_ref):
+            image = client.images.get(image_ref)
     except (ImageNotFound, DockerException):
         return None
 
@@ -22,11 +38,58 @@ def get_local_repo_digest_for_repo(image_ref: str, repository: str) -> str | Non
     if not isinstance(repo_digests, list):
         return None
 
+    _, _, path = repository.partition("/")
+    accepted = {repository, *(f"{registry}/{path}" for registry in mirror_registries)}
     for entry in repo_digests:
         if not isinstance(entry, str):
             continue
         repo, sep, digest = entry.partition("@")
-        if sep and repo == repository and digest:
+        if sep and repo in accepted and digest:
             return digest
 
     return None
+
+
+def get_local_image_labels(image_ref: str) -> dict[str, str] | None:
+    """
+    Returns the image's labels (empty when it has none), or None when the image does not exist locally.
+    """
+    try:
+        client = get_docker_client()
+        with span("images.get", DOCKER_API, image=image_ref):
+            image = client.images.get(image_ref)
+    except (ImageNotFound, DockerException):
+        return None
+    config = image.attrs.get("Config")
+    labels = config.get("Labels") if isinstance(config, dict) else None
+    return dict(labels) if isinstance(labels, dict) else {}
+
+
+def get_local_image_id(image_ref: str) -> str | None:
+    try:
+        client = get_docker_client()
+        with span("images.get", DOCKER_API, image=image_ref):
+            image = client.images.get(image_ref)
+    except (ImageNotFound, DockerException):
+        return None
+    image_id = image.attrs.get("Id")
+    return image_id if isinstance(image_id, str) else None
+
+
+def get_local_layer_ids() -> set[str]:
+    """
+    Returns the uncompressed layer digests (diff ids) of all local images.
+    """
+    try:
+        client = get_docker_client()
+        with span("images.list", DOCKER_API):
+            images = client.images.list()
+    except (DockerException, OSError):
+        return set()
+    layer_ids: set[str] = set()
+    for image in images:
+        root_fs = image.attrs.get("RootFS")
+        layers = root_fs.get("Layers") if isinstance(root_fs, dict) else None
+        if isinstance(layers, list):
+            layer_ids.update(layer for layer in layers if isinstance(layer, str))
+    return layer_ids
@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 _DEFAULT_LOG_DIR = "~/.aicage/logs/pull"
+_DEFAULT_REFRESH_LOG_DIR = "~/.aicage/logs/refresh"
 
 
 def pull_log_path(image_ref: str) -> Path:
@@ -12,6 +13,11 @@ def pull_log_path(image_ref: str) -> Path:
     return log_dir / f"{_sanitize(image_ref)}-{_timestamp()}.log"
 
 
+def refresh_log_path(image_ref: str) -> Path:
+    log_dir = Path(os.path.expanduser(_DEFAULT_REFRESH_LOG_DIR))
+    return log_dir / f"{_sanitize(image_ref)}-{_timestamp()}.log"
+
+
 def _sanitize(value: str) -> str:
     return value.replace("/", "_").replace(":", "_")
 
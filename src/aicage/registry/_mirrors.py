@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import http.client
+import os
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aicage._logging import get_logger
+from aicage._state_files import read_json, update_json
+from aicage._tracing import HTTP, span
+from aicage.registry._http import registry_request
+from aicage.registry._network_budget import NetworkBudgetExhausted
+from aicage.registry._rate_limit import RegistryRateLimited
+
+if TYPE_CHECKING:
+    from aicage.config.global_config import GlobalConfig, RegistryMirror
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/registry-mirrors"
+_STATE_FILENAME = "health.json"
+_HEALTHY_KEY: str = "healthy"
+_LATENCY_KEY: str = "latency_seconds"
+_CHECKED_AT_KEY: str = "checked_at"
+
+_PROBE_INTERVAL_SECONDS = 10 * 60
+# `/v2/` answers 401 on registries that require a token; the endpoint is still up.
+_HEALTHY_STATUSES = frozenset({HTTPStatus.OK, HTTPStatus.UNAUTHORIZED})
+
+
+@dataclass(frozen=True)
+class MirrorHealth:
+    healthy: bool
+    latency_seconds: float
+    checked_at: float
+
+
+class MirrorHealthStore:
+    """
+    Persists the last probe of each mirror (reachability and `/v2/` round-trip time) by API URL.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def load(self, api_url: str) -> MirrorHealth | None:
+        entry = self._entries().get(api_url)
+        if not isinstance(entry, dict):
+            return None
+        healthy = entry.get(_HEALTHY_KEY)
+        latency = entry.get(_LATENCY_KEY)
+        checked_at = entry.get(_CHECKED_AT_KEY)
+        if not isinstance(healthy, bool) or not isinstance(latency, (int, float)):
+            return None
+        if not isinstance(checked_at, (int, float)):
+            return None
+        return MirrorHealth(healthy=healthy, latency_seconds=float(latency), checked_at=float(checked_at))
+
+    def save(self, api_url: str, health: MirrorHealth) -> None:
+        entry = {
+            _HEALTHY_KEY: health.healthy,
+            _LATENCY_KEY: health.latency_seconds,
+            _CHECKED_AT_KEY: health.checked_at,
+        }
+        update_json(self._path(), lambda payload: {**_as_entries(payload), api_url: entry})
+
+    def _entries(self) -> dict[str, Any]:
+        return _as_entries(read_json(self._path()))
+
+    def _path(self) -> Path:
+        return self._base_dir / _STATE_FILENAME
+
+
+def _as_entries(payload: Any) -> dict[str, Any]:
+    return payload if isinstance(payload, dict) else {}
+
+
+def ranked_mirrors(global_cfg: GlobalConfig) -> list[RegistryMirror]:
+    """
+    Returns the healthy configured mirrors, fastest first. Mirrors are re-probed when their last measurement
+    is older than the probe interval, so at most one probe per mirror runs every few minutes.
+    """
+    if not global_cfg.registry_mirrors:
+        return []
+    store = MirrorHealthStore()
+    ranked: list[tuple[float, int, RegistryMirror]] = []
+    for index, mirror in enumerate(global_cfg.registry_mirrors):
+        health = store.load(mirror.api_url)
+        if health is None or time.time() - health.checked_at >= _PROBE_INTERVAL_SECONDS:
+            probed = probe_mirror(mirror)
+            if probed is not None:
+                store.save(mirror.api_url, probed)
+                health = probed
+        if health is not None and health.healthy:
+            # Config order breaks ties between mirrors with the same latency.
+            ranked.append((health.latency_seconds, index, mirror))
+    return [mirror for _, _, mirror in sorted(ranked, key=lambda item: item[:2])]
+
+
+def probe_mirror(mirror: RegistryMirror) -> MirrorHealth | None:
+    """
+    Measures the mirror's `/v2/` endpoint. Returns None when the probe never reached the mirror because the
+    network budget ran out or the host is rate limited; that says nothing about the mirror's health.
+    """
+    url = f"{mirror.api_url}/"
+    start = time.perf_counter()
+    try:
+        with span("GET", HTTP, url=url) as attrs:
+            response = registry_request("GET", url)
+            attrs["status"] = response.status
+        healthy = response.status in _HEALTHY_STATUSES
+    except (NetworkBudgetExhausted, RegistryRateLimited) as exc:
+        get_logger().info("Registry mirror %s not probed: %s", mirror.registry, exc)
+        return None
+    except (OSError, http.client.HTTPException) as exc:
+        get_logger().warning("Registry mirror %s is unreachable: %s", mirror.registry, exc)
+        healthy = False
+    return MirrorHealth(healthy=healthy, latency_seconds=time.perf_counter() - start, checked_at=time.time())
+
+
+def mirror_image_refs(
+    image_ref: str,
+    digest: str | None,
+    global_cfg: GlobalConfig,
+    mirrors: Sequence[RegistryMirror] | None = None,
+) -> list[str]:
+    """
+    Returns `image_ref`'s repository at `digest` on each ranked mirror (or on `mirrors`, when already ranked),
+    for images hosted on the upstream registry. Mirrors can serve stale tags, so they are only asked for the
+    digest resolved upstream; without one there is nothing to ask them for.
+    """
+    registry, sep, path = image_ref.partition("/")
+    if digest is None or not sep or registry != global_cfg.image_registry:
+        return []
+    repository = path.split("@", 1)[0]
+    last_colon = repository.rfind(":")
+    if last_colon > repository.rfind("/"):
+        repository = repository[:last_colon]
+    if mirrors is None:
+        mirrors = ranked_mirrors(global_cfg)
+    return [f"{mirror.registry}/{repository}@{digest}" for mirror in mirrors]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from aicage._logging import get_logger
+
+
+class NetworkBudgetExhausted(TimeoutError):
+    """Raised when a registry request would start after the launch's network time budget ran out."""
+
+
+@dataclass(frozen=True)
+class _Budget:
+    seconds: float
+    request_timeout: float
+    deadline: float
+
+
+class _BudgetState:
+    def __init__(self) -> None:
+        # One budget per launch, shared by the preflight threads; launches in the daemon replace it.
+        self.budget: _Budget | None = None
+
+
+_STATE = _BudgetState()
+
+
+def start_network_budget(seconds: float, request_timeout: float) -> None:
+    """
+    Starts the launch's network time budget: registry requests from now on share a deadline `seconds` away.
+    """
+    _STATE.budget = _Budget(seconds=seconds, request_timeout=request_timeout, deadline=time.monotonic() + seconds)
+
+
+def clear_network_budget() -> None:
+    _STATE.budget = None
+
+
+def network_budget_exhausted() -> bool:
+    budget = _STATE.budget
+    return budget is not None and time.monotonic() >= budget.deadline
+
+
+def request_timeout(default: float) -> float:
+    """
+    Returns the socket timeout for the next registry request: the per-request timeout capped by the time left
+    in the budget, or `default` when no budget is running.
+    """
+    budget = _STATE.budget
+    if budget is None:
+        return default
+    remaining = budget.deadline - time.monotonic()
+    if remaining <= 0:
+        raise NetworkBudgetExhausted(f"Network time budget of {budget.seconds:g}s exhausted.")
+    return min(budget.request_timeout, remaining)
+
+
+def log_skipped_freshness_check(image_ref: str) -> None:
+    """
+    Logs that `image_ref` is used without a freshness check when the budget is why the remote lookup failed.
+    """
+    budget = _STATE.budget
+    if budget is None or not network_budget_exhausted():
+        return
+    get_logger().warning(
+        "Freshness check for %s skipped: network time budget of %gs exhausted; using the local image.",
+        image_ref,
+        budget.seconds,
+    )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import platform as _host
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from docker.errors import DockerException
+
+from aicage._tracing import DOCKER_API, span
+from aicage.docker_client import get_docker_client
+
+_MACHINE_ARCHITECTURES: dict[str, str] = {
+    "x86_64": "amd64",
+    "amd64": "amd64",
+    "aarch64": "arm64",
+    "arm64": "arm64",
+}
+
+
+@dataclass(frozen=True)
+class Platform:
+    os: str
+    architecture: str
+
+
+def get_local_platform() -> Platform | None:
+    """
+    Returns the OS/architecture of the local Docker daemon, or None when the daemon cannot be reached.
+    """
+    try:
+        return _daemon_platform()
+    except (DockerException, OSError):
+        return None
+
+
+def host_platform() -> Platform:
+    """
+    Returns the daemon platform, falling back to this machine's architecture when no daemon is reachable.
+    """
+    local = get_local_platform()
+    if local is not None:
+        return local
+    machine = _host.machine().lower()
+    return Platform(os="linux", architecture=_MACHINE_ARCHITECTURES.get(machine, machine))
+
+
+def select_platform_manifest(entries: Sequence[Any], platform: Platform) -> str | None:
+    """
+    Returns the digest of the index entry built for `platform`, skipping attestation entries.
+    """
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        entry_platform = entry.get("platform")
+        digest = entry.get("digest")
+        if not isinstance(entry_platform, dict) or not isinstance(digest, str):
+            continue
+        if entry_platform.get("os") == platform.os and entry_platform.get("architecture") == platform.architecture:
+            return digest
+    return None
+
+
+@lru_cache(maxsize=1)
+def _daemon_platform() -> Platform:
+    with span("version", DOCKER_API):
+        version = get_docker_client().version()
+    return Platform(os=str(version.get("Os", "linux")), architecture=str(version.get("Arch", "")))
@@ -2,26 +2,51 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from aicage._tracing import traced
 from aicage.config.runtime_config import RunConfig
 from aicage.registry import _local_query, _remote_query
+from aicage.registry._network_budget import log_skipped_freshness_check
+from aicage.registry._remote_query import RemoteDigest
 
 
 @dataclass(frozen=True)
 class PullDecision:
     should_pull: bool
+    remote_digest: str | None = None
 
 
+@traced("decide_pull")
 def decide_pull(run_config: RunConfig) -> PullDecision:
-    local_digest = _local_query.get_local_repo_digest(run_config)
-    if local_digest is None:
+    local_digest = _local_query.get_local_repo_digest(run_config.image_ref, run_config.global_cfg)
+    if local_digest is None and not run_config.global_cfg.registry_mirrors:
         return PullDecision(should_pull=True)
 
-    remote_digest = _remote_query.get_remote_repo_digest_for_repo(
+    # Mirrors are only pulled from by the digest resolved upstream, so a first pull resolves it too.
+    remote = _remote_query.get_remote_digest(
         run_config.image_ref,
         run_config.global_cfg.image_repository,
         run_config.global_cfg,
+        refresh=run_config.refresh,
     )
-    if remote_digest is None:
+    if local_digest is None:
+        return PullDecision(should_pull=True, remote_digest=remote.digest if remote is not None else None)
+    if remote is None:
+        log_skipped_freshness_check(run_config.image_ref)
         return PullDecision(should_pull=False)
 
-    return PullDecision(should_pull=local_digest != remote_digest)
+    return PullDecision(
+        should_pull=not is_local_image_current(run_config.image_ref, local_digest, remote),
+        remote_digest=remote.digest,
+    )
+
+
+def is_local_image_current(image_ref: str, local_digest: str | None, remote: RemoteDigest) -> bool:
+    """
+    Compares by index digest first; a changed multi-arch index still counts as current when this platform's
+    manifest kept the local image's config (image id), so rebuilds for other architectures are not pulled.
+    """
+    if local_digest == remote.digest:
+        return True
+    if remote.config_digest is None:
+        return False
+    return _local_query.get_local_image_id(image_ref) == remote.config_digest
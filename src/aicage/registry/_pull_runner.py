@@ -1,54 +1,223 @@
 from __future__ import annotations
 
-import subprocess
 import sys
+import time
+from collections.abc import Iterable, Mapping, Sequence
 from pathlib import Path
+from typing import Any, TextIO
+
+from docker.errors import APIError, DockerException, ImageNotFound
+from docker.utils import parse_repository_tag
 
 from aicage._logging import get_logger
+from aicage._tracing import DOCKER_API, span
+from aicage.docker_client import get_docker_client
 from aicage.errors import CliError
+from aicage.registry._pull_stats import PullStats, PullStatsStore
+
+_PROGRESS_INTERVAL_SECONDS = 0.2
+_MIB = 1024 * 1024
+_DOWNLOADING = "Downloading"
+_DOWNLOAD_COMPLETE = "Download complete"
+_ALREADY_EXISTS = "Already exists"
+_FINISHED_STATUSES = frozenset({"Pull complete", _ALREADY_EXISTS})
+
+
+class _PullProgress:
+    """
+    Aggregates the per-layer events of a streaming pull into image-level totals.
+    """
+
+    def __init__(self, image_ref: str) -> None:
+        self.image_ref = image_ref
+        self.start = time.perf_counter()
+        self._downloads: dict[str, tuple[int, int]] = {}
+        self._layers: set[str] = set()
+        self._finished: set[str] = set()
+        self._cached: set[str] = set()
+        self.error: str | None = None
+
+    def update(self, event: Mapping[str, Any]) -> None:
+        error = event.get("error")
+        if isinstance(error, str):
+            self.error = error
+            return
+        status = event.get("status")
+        if not isinstance(status, str):
+            return
+        layer = event.get("id")
+        if not isinstance(layer, str) or status.startswith("Pulling from"):
+            return
+        self._layers.add(layer)
+        detail = event.get("progressDetail")
+        if status == _DOWNLOADING and isinstance(detail, dict):
+            current, total = detail.get("current"), detail.get("total")
+            if isinstance(current, int) and isinstance(total, int):
+                self._downloads[layer] = (current, total)
+        elif status == _DOWNLOAD_COMPLETE and layer in self._downloads:
+            total = self._downloads[layer][1]
+            self._downloads[layer] = (total, total)
+        if status in _FINISHED_STATUSES:
+            self._finished.add(layer)
+        if status == _ALREADY_EXISTS:
+            self._cached.add(layer)
+
+    @property
+    def downloaded_bytes(self) -> int:
+        return sum(current for current, _ in self._downloads.values())
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(total for _, total in self._downloads.values())
 
+    @property
+    def layers(self) -> int:
+        return len(self._layers)
 
-def run_pull(image_ref: str, log_path: Path) -> None:
+    @property
+    def cached_layers(self) -> int:
+        return len(self._cached)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.start
+
+    def render(self) -> str:
+        rate = self.downloaded_bytes / _MIB / max(self.elapsed_seconds, 1e-9)
+        return (
+            f"[aicage] Pulling {self.image_ref}: {self.downloaded_bytes / _MIB:.1f}/{self.total_bytes / _MIB:.1f} MiB, "
+            f"{rate:.1f} MiB/s, layers {len(self._finished)}/{self.layers}"
+        )
+
+
+def run_pull(image_ref: str, log_path: Path, progress: bool = True, mirror_refs: Sequence[str] = ()) -> int:
+    """
+    Pulls `image_ref` through the Engine API's streaming progress, logging every event to `log_path`, and
+    returns the bytes downloaded by all attempts. With `progress`, a single aggregated progress line is kept up
+    to date on a terminal. `mirror_refs` are tried first; an image pulled from a mirror is tagged as
+    `image_ref`, and the upstream pull runs only when no mirror delivers it.
+    """
     logger = get_logger()
     log_path.parent.mkdir(parents=True, exist_ok=True)
     print(f"[aicage] Pulling image {image_ref} (logs: {log_path})...")
     logger.info("Pulling image %s (logs: %s)", image_ref, log_path)
 
-    last_nonempty_line = ""
-    pull_process = subprocess.Popen(
-        ["docker", "pull", image_ref],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-    )
-    with log_path.open("w", encoding="utf-8") as log_handle:
-        if pull_process.stdout is not None:
-            for line in pull_process.stdout:
-                log_handle.write(line)
-                log_handle.flush()
-                stripped = line.strip()
-                if stripped:
-                    last_nonempty_line = stripped
-
-    pull_process.wait()
-
-    if pull_process.returncode == 0:
-        logger.info("Image pull succeeded for %s", image_ref)
-        return
-
-    inspect = subprocess.run(
-        ["docker", "image", "inspect", image_ref],
-        check=False,
-        capture_output=True,
-        text=True,
-    )
-    if inspect.returncode == 0:
-        msg = last_nonempty_line or f"docker pull failed for {image_ref}"
-        print(f"[aicage] Warning: {msg}. Using local image.", file=sys.stderr)
-        logger.warning("Pull failed for %s, using local image: %s", image_ref, msg)
-        return
+    live = progress and sys.stdout.isatty()
+    downloaded_bytes = 0
+    with log_path.open("w", encoding="utf-8") as log:
+        for mirror_ref in mirror_refs:
+            state = _pull(mirror_ref, log, live)
+            downloaded_bytes += state.downloaded_bytes
+            if state.error is None and _tag(mirror_ref, image_ref):
+                break
+            logger.info(
+                "Pull from mirror %s failed (%s); trying the next source.", mirror_ref, state.error or "tag failed"
+            )
+        else:
+            state = _pull(image_ref, log, live)
+            downloaded_bytes += state.downloaded_bytes
+
+    if state.error is None:
+        duration = state.elapsed_seconds
+        logger.info(
+            "Image pull succeeded for %s: %d bytes in %.1fs, %d/%d layers cached",
+            state.image_ref,
+            state.downloaded_bytes,
+            duration,
+            state.cached_layers,
+            state.layers,
+        )
+        if progress:
+            print(f"[aicage] {_summary(state, duration)}")
+        return downloaded_bytes
 
-    detail = last_nonempty_line or f"docker pull failed for {image_ref}"
+    detail = state.error
+    if _local_image_exists(image_ref):
+        print(f"[aicage] Warning: {detail}. Using local image.", file=sys.stderr)
+        logger.warning("Pull failed for %s, using local image: %s", image_ref, detail)
+        return downloaded_bytes
     logger.error("Pull failed for %s: %s", image_ref, detail)
     raise CliError(detail)
+
+
+def _pull(image_ref: str, log: TextIO, live: bool) -> _PullProgress:
+    state = _PullProgress(image_ref)
+    started_at = time.time()
+    with span("images.pull", DOCKER_API, image=image_ref) as attrs:
+        try:
+            events = get_docker_client().api.pull(image_ref, stream=True, decode=True)
+            _consume(events, state, log, live)
+        except APIError as exc:
+            state.error = str(exc.explanation or exc)
+        except DockerException as exc:
+            state.error = str(exc)
+        if state.error is not None:
+            log.write(f"{state.error}\n")
+        attrs["bytes"] = state.downloaded_bytes
+    if live:
+        print()
+    PullStatsStore().record(
+        PullStats(
+            image_ref=image_ref,
+            started_at=started_at,
+            duration_seconds=state.elapsed_seconds,
+            downloaded_bytes=state.downloaded_bytes,
+            layers=state.layers,
+            cached_layers=state.cached_layers,
+            succeeded=state.error is None,
+        )
+    )
+    return state
+
+
+def _tag(source_ref: str, image_ref: str) -> bool:
+    repository, tag = parse_repository_tag(image_ref)
+    try:
+        with span("images.tag", DOCKER_API, image=image_ref):
+            return bool(get_docker_client().api.tag(source_ref, repository, tag))
+    except DockerException as exc:
+        get_logger().warning("Failed to tag %s as %s: %s", source_ref, image_ref, exc)
+        return False
+
+
+def _consume(events: Iterable[Mapping[str, Any]], state: _PullProgress, log: TextIO, live: bool) -> None:
+    last_render = 0.0
+    for event in events:
+        state.update(event)
+        log.write(_log_line(event))
+        if state.error is not None:
+            return
+        now = time.perf_counter()
+        if live and now - last_render >= _PROGRESS_INTERVAL_SECONDS:
+            last_render = now
+            sys.stdout.write(f"\r{state.render()}\033[K")
+            sys.stdout.flush()
+    if live:
+        sys.stdout.write(f"\r{state.render()}\033[K")
+
+
+def _log_line(event: Mapping[str, Any]) -> str:
+    parts = [
+        f"{event['id']}:" if isinstance(event.get("id"), str) else "",
+        str(event.get("status") or event.get("error") or ""),
+        str(event.get("progress") or ""),
+    ]
+    return " ".join(part for part in parts if part) + "\n"
+
+
+def _summary(state: _PullProgress, duration: float) -> str:
+    downloaded = state.downloaded_bytes / _MIB
+    return (
+        f"Pulled {state.image_ref}: {downloaded:.1f} MiB in {duration:.1f}s "
+        f"({downloaded / max(duration, 1e-9):.1f} MiB/s), "
+        f"{state.layers - state.cached_layers}/{state.layers} layers downloaded."
+    )
+
+
+def _local_image_exists(image_ref: str) -> bool:
+    try:
+        with span("images.get", DOCKER_API, image=image_ref):
+            get_docker_client().images.get(image_ref)
+    except (ImageNotFound, DockerException):
+        return False
+    return True
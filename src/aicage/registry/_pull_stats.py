@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/pull-stats"
+_STATS_FILENAME = "pulls.jsonl"
+
+
+@dataclass(frozen=True)
+class PullStats:
+    image_ref: str
+    started_at: float
+    duration_seconds: float
+    downloaded_bytes: int
+    layers: int
+    cached_layers: int
+    succeeded: bool
+
+
+class PullStatsStore:
+    """
+    Appends one JSON line per image pull (bytes downloaded, duration, layer counts) for later analysis.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def record(self, stats: PullStats) -> None:
+        line = json.dumps(asdict(stats), sort_keys=True) + "\n"
+        try:
+            self._base_dir.mkdir(parents=True, exist_ok=True)
+            with self._path().open("a", encoding="utf-8") as handle:
+                handle.write(line)
+        except OSError:
+            return
+
+    def load(self) -> list[PullStats]:
+        try:
+            lines = self._path().read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return []
+        names = {field.name for field in fields(PullStats)}
+        stats: list[PullStats] = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and names <= entry.keys():
+                stats.append(PullStats(**{name: entry[name] for name in names}))
+        return stats
+
+    def _path(self) -> Path:
+        return self._base_dir / _STATS_FILENAME
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+
+from aicage._logging import get_logger
+from aicage._state_files import read_json, update_json
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/registry-rate-limit"
+_STATE_FILENAME = "hosts.json"
+_UNTIL_KEY: str = "until"
+_REASON_KEY: str = "reason"
+
+_DEFAULT_BACKOFF_SECONDS = 60
+_MAX_BACKOFF_SECONDS = 60 * 60
+
+
+class RegistryRateLimited(OSError):
+    """Raised instead of sending a registry request while the host's rate-limit backoff is active."""
+
+
+class RateLimitStore:
+    """
+    Persists per registry host until when requests are held back after a 429 or an exhausted rate limit.
+    The state is shared by every aicage process of the user, so concurrent launches back off together.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def blocked_until(self, host: str) -> float | None:
+        entry = self._entries().get(host)
+        if not isinstance(entry, dict):
+            return None
+        until = entry.get(_UNTIL_KEY)
+        if not isinstance(until, (int, float)) or until <= time.time():
+            return None
+        return float(until)
+
+    def observe(self, host: str, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Records a backoff when the response is a 429 or reports no remaining requests.
+        """
+        backoff = _backoff_seconds(status, headers)
+        if backoff is None:
+            return
+        until = time.time() + backoff
+        reason = "HTTP 429" if status == HTTPStatus.TOO_MANY_REQUESTS else "rate limit exhausted"
+        get_logger().warning(
+            "Registry %s is rate limiting (%s); using cached digests for the next %ds.", host, reason, backoff
+        )
+        entry = {_UNTIL_KEY: until, _REASON_KEY: reason}
+        update_json(self._path(), lambda payload: {**_as_entries(payload), host: entry})
+
+    def _entries(self) -> dict[str, Any]:
+        return _as_entries(read_json(self._path()))
+
+    def _path(self) -> Path:
+        return self._base_dir / _STATE_FILENAME
+
+
+def _as_entries(payload: Any) -> dict[str, Any]:
+    return payload if isinstance(payload, dict) else {}
+
+
+def _backoff_seconds(status: int, headers: Mapping[str, str]) -> int | None:
+    lowered = {key.lower(): value for key, value in headers.items()}
+    if status != HTTPStatus.TOO_MANY_REQUESTS and _remaining(lowered) != 0:
+        return None
+    seconds = _retry_after(lowered.get("retry-after")) or _reset_seconds(lowered) or _DEFAULT_BACKOFF_SECONDS
+    return max(1, min(seconds, _MAX_BACKOFF_SECONDS))
+
+
+def _remaining(headers: Mapping[str, str]) -> int | None:
+    # Docker Hub sends `ratelimit-remaining: 76;w=21600`; other registries use the `x-` prefixed form.
+    for name in ("ratelimit-remaining", "x-ratelimit-remaining"):
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(value.split(";", 1)[0].strip())
+            except ValueError:
+                return None
+    return None
+
+
+def _retry_after(value: str | None) -> int | None:
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return int(value.strip())
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0, int(retry_at - time.time()))
+
+
+def _reset_seconds(headers: Mapping[str, str]) -> int | None:
+    value = headers.get("x-ratelimit-reset") or headers.get("ratelimit-reset")
+    if value is None:
+        window = headers.get("ratelimit-remaining", "").partition(";w=")[2]
+        return int(window) if window.isdigit() else None
+    try:
+        reset = int(float(value))
+    except ValueError:
+        return None
+    # Epoch timestamps and delta seconds are both in use.
+    return max(0, int(reset - time.time())) if reset > time.time() / 2 else reset
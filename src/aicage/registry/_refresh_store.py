@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from aicage._state_files import read_json, update_json
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/image-refresh"
+_STATE_FILENAME = "images.json"
+_CHECKED_AT_KEY: str = "checked_at"
+_RESULT_KEY: str = "result"
+_MESSAGE_KEY: str = "message"
+
+RESULT_UPDATED: str = "updated"
+RESULT_CURRENT: str = "current"
+RESULT_FAILED: str = "failed"
+
+
+@dataclass(frozen=True)
+class RefreshState:
+    checked_at: float
+    result: str | None = None
+    message: str = ""
+
+
+class RefreshStore:
+    """
+    Tracks per image when it was last confirmed current (epoch seconds) and the outcome of the last
+    background refresh, which is reported on the next launch.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def load(self, image_ref: str) -> RefreshState | None:
+        entry = self._entries().get(image_ref)
+        if not isinstance(entry, dict):
+            return None
+        checked_at = entry.get(_CHECKED_AT_KEY)
+        if not isinstance(checked_at, (int, float)):
+            return None
+        result = entry.get(_RESULT_KEY)
+        message = entry.get(_MESSAGE_KEY)
+        return RefreshState(
+            checked_at=float(checked_at),
+            result=result if isinstance(result, str) else None,
+            message=message if isinstance(message, str) else "",
+        )
+
+    def is_fresh(self, image_ref: str, max_age_seconds: int) -> bool:
+        state = self.load(image_ref)
+        return state is not None and time.time() - state.checked_at < max_age_seconds
+
+    def save(self, image_ref: str, state: RefreshState) -> None:
+        entry = {
+            _CHECKED_AT_KEY: state.checked_at,
+            _RESULT_KEY: state.result,
+            _MESSAGE_KEY: state.message,
+        }
+        update_json(self._path(), lambda payload: {**_as_entries(payload), image_ref: entry})
+
+    def lock_path(self, image_ref: str) -> Path:
+        return self._base_dir / f"{image_ref.replace('/', '_').replace(':', '_')}.lock"
+
+    def _entries(self) -> dict[str, Any]:
+        return _as_entries(read_json(self._path()))
+
+    def _path(self) -> Path:
+        return self._base_dir / _STATE_FILENAME
+
+
+def _as_entries(payload: Any) -> dict[str, Any]:
+    return payload if isinstance(payload, dict) else {}
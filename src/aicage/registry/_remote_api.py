@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import http.client
 import json
-import urllib.request
+import re
+import time
 from collections.abc import Mapping
+from datetime import datetime
+from http import HTTPStatus
 from typing import TYPE_CHECKING, Any
 
+from aicage._tracing import HTTP, span
+from aicage.registry._http import registry_request
+from aicage.registry._token_cache import TokenCache
+
 if TYPE_CHECKING:
     from aicage.config.global_config import GlobalConfig
 
 
+_DEFAULT_TOKEN_TTL_SECONDS = 60
+_TOKEN_EXPIRY_MARGIN_SECONDS = 5
+_FRACTION_PATTERN = re.compile(r"\.(\d+)")
+
+
 class RegistryDiscoveryError(Exception):
     """Raised when registry discovery fails."""
 
@@ -18,27 +31,84 @@ def fetch_pull_token(global_cfg: GlobalConfig) -> str:
 
 
 def fetch_pull_token_for_repository(global_cfg: GlobalConfig, repository: str) -> str:
-    url = f"{global_cfg.image_registry_api_token_url}:{repository}:pull"
-    data, _ = _fetch_json(url, None)
+    """
+    Returns an anonymous pull token for the repository, reusing a cached token when one is still valid.
+    New tokens are scoped to every repository a launch may query, so one round trip serves the whole launch.
+    """
+    token_url = global_cfg.image_registry_api_token_url
+    cache = TokenCache()
+    cached = cache.load(token_url, repository)
+    if cached is not None:
+        return cached
+
+    repositories = _launch_repositories(global_cfg, repository)
+    try:
+        data = _fetch_token(token_url, repositories)
+    except RegistryDiscoveryError:
+        if repositories == [repository]:
+            raise
+        # Some registries refuse multi-scope requests; fall back to the one scope we need.
+        repositories = [repository]
+        data = _fetch_token(token_url, repositories)
+
     token = data.get("token")
     if not token:
         raise RegistryDiscoveryError(
             f"Missing token while querying registry for {repository}."
         )
+    cache.save(token_url, repositories, token, _token_expires_at(data))
     return token
 
 
+def _launch_repositories(global_cfg: GlobalConfig, repository: str) -> list[str]:
+    return sorted({repository, global_cfg.image_repository, global_cfg.image_base_repository})
+
+
+def _fetch_token(token_url: str, repositories: list[str]) -> dict[str, Any]:
+    # The configured token URL ends with `scope=repository`; further scopes repeat the parameter.
+    scopes = [f":{repositories[0]}:pull"]
+    scopes.extend(f"&scope=repository:{repository}:pull" for repository in repositories[1:])
+    data, _ = _fetch_json(f"{token_url}{''.join(scopes)}", None)
+    return data
+
+
+def _token_expires_at(data: dict[str, Any]) -> float:
+    expires_in = data.get("expires_in")
+    ttl = expires_in if isinstance(expires_in, int) and expires_in > 0 else _DEFAULT_TOKEN_TTL_SECONDS
+    now = time.time()
+    issued_at = _parse_issued_at(data.get("issued_at"))
+    # Never trust an issue time from the future; it would only reflect clock skew.
+    start = min(issued_at, now) if issued_at is not None else now
+    return start + ttl - _TOKEN_EXPIRY_MARGIN_SECONDS
+
+
+def _parse_issued_at(value: object) -> float | None:
+    if not isinstance(value, str):
+        return None
+    # Python 3.10's fromisoformat accepts neither a `Z` suffix nor more than 6 fractional digits, and registries
+    # send both (Docker Hub: `2024-01-15T07:59:00.123456789Z`).
+    normalized = value.strip()
+    if normalized.endswith(("Z", "z")):
+        normalized = f"{normalized[:-1]}+00:00"
+    normalized = _FRACTION_PATTERN.sub(lambda match: f".{match.group(1)[:6]}", normalized, count=1)
+    try:
+        return datetime.fromisoformat(normalized).timestamp()
+    except ValueError:
+        return None
+
+
 def _fetch_json(url: str, headers: dict[str, str] | None) -> tuple[dict[str, Any], Mapping[str, str]]:
-    request = urllib.request.Request(url, headers=headers or {})
     try:
-        with urllib.request.urlopen(request) as response:
-            payload = response.read().decode("utf-8")
-            response_headers = response.headers
-    except Exception as exc:  # pylint: disable=broad-except
+        with span("GET", HTTP, url=url) as attrs:
+            response = registry_request("GET", url, headers)
+            attrs["status"] = response.status
+    except (OSError, http.client.HTTPException) as exc:
         raise RegistryDiscoveryError(f"Failed to query registry endpoint {url}: {exc}") from exc
+    if response.status >= HTTPStatus.BAD_REQUEST:
+        raise RegistryDiscoveryError(f"Failed to query registry endpoint {url}: HTTP {response.status}")
 
     try:
-        data = json.loads(payload)
-    except json.JSONDecodeError as exc:
+        data = json.loads(response.body.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
         raise RegistryDiscoveryError(f"Invalid JSON from registry endpoint {url}: {exc}") from exc
-    return data, response_headers
+    return data, response.headers
@@ -1,48 +1,289 @@
 from __future__ import annotations
 
-import urllib.error
-import urllib.request
+import http.client
+import json
+import threading
+import time
 from collections.abc import Mapping
-from typing import TYPE_CHECKING
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
+from aicage._logging import get_logger
+from aicage._tracing import HTTP, span
+from aicage.registry._digest_cache import CachedDigest, DigestCache
+from aicage.registry._http import registry_rate_limited, registry_request
+from aicage.registry._mirrors import ranked_mirrors
+from aicage.registry._platform import get_local_platform, select_platform_manifest
 from aicage.registry._remote_api import (
     RegistryDiscoveryError,
     fetch_pull_token_for_repository,
 )
 
 if TYPE_CHECKING:
-    from aicage.config.global_config import GlobalConfig
+    from aicage.config.global_config import GlobalConfig, RegistryMirror
+
+
+MANIFEST_ACCEPT: str = ",".join(
+    (
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    )
+)
+
+
+@dataclass(frozen=True)
+class RemoteDigest:
+    digest: str
+    config_digest: str | None = None
 
 
 def get_remote_repo_digest_for_repo(
     image_ref: str,
     repository: str,
     global_cfg: GlobalConfig,
+    refresh: bool = False,
 ) -> str | None:
-    reference = _parse_reference(image_ref)
+    """
+    Returns the remote manifest (or index) digest of `image_ref`; see `get_remote_digest`.
+    """
+    remote = get_remote_digest(image_ref, repository, global_cfg, refresh)
+    return remote.digest if remote is not None else None
+
+
+def get_remote_digest(
+    image_ref: str,
+    repository: str,
+    global_cfg: GlobalConfig,
+    refresh: bool = False,
+) -> RemoteDigest | None:
+    """
+    Returns the remote manifest digest and the config digest of the local platform's manifest, answering from
+    the digest cache while it is fresh. Stale entries are revalidated with a conditional request; `refresh`
+    skips the freshness window. A lookup started by `prefetch_remote_digest` for the same manifest is joined
+    instead of repeated.
+    """
+    url = _manifest_url(image_ref, repository, global_cfg)
+    with _PREFETCH_LOCK:
+        future = _PREFETCHED.pop((url, repository, refresh), None)
+    if future is not None:
+        return future.result()
+    return _query_remote_digest(url, repository, global_cfg, refresh)
+
+
+def prefetch_remote_digest(
+    executor: Executor,
+    image_ref: str,
+    repository: str,
+    global_cfg: GlobalConfig,
+    refresh: bool = False,
+) -> None:
+    """
+    Starts the remote digest lookup on `executor` so token and manifest requests overlap other preflight work.
+    Earlier prefetches that were never consumed are dropped.
+    """
+    url = _manifest_url(image_ref, repository, global_cfg)
+    future = executor.submit(_query_remote_digest, url, repository, global_cfg, refresh)
+    with _PREFETCH_LOCK:
+        _PREFETCHED.clear()
+        _PREFETCHED[(url, repository, refresh)] = future
+
+
+def discard_prefetched_digests() -> None:
+    """
+    Drops prefetched lookups that were not consumed. Called at the start and end of every launch, so the daemon
+    never answers one launch with a stale or failed prefetch started for an earlier one.
+    """
+    with _PREFETCH_LOCK:
+        _PREFETCHED.clear()
+
+
+_PREFETCHED: dict[tuple[str, str, bool], Future[RemoteDigest | None]] = {}
+_PREFETCH_LOCK = threading.Lock()
+
+
+def _manifest_url(image_ref: str, repository: str, global_cfg: GlobalConfig) -> str:
+    reference = parse_reference(image_ref)
+    return f"{global_cfg.image_registry_api_url}/{repository}/manifests/{reference}"
+
+
+def _query_remote_digest(
+    url: str,
+    repository: str,
+    global_cfg: GlobalConfig,
+    refresh: bool,
+) -> RemoteDigest | None:
+    cache = DigestCache()
+    cached = cache.load(url)
+    if (
+        cached is not None
+        and not refresh
+        and time.time() - cached.checked_at < global_cfg.digest_cache_ttl_seconds
+    ):
+        return RemoteDigest(digest=cached.digest, config_digest=cached.config_digest)
+    if cached is not None and registry_rate_limited(url):
+        return _rate_limited_fallback(url, cached)
+
+    remote = _revalidate_remote_digest(url, repository, global_cfg, cache, cached)
+    if remote is None and cached is not None and registry_rate_limited(url):
+        return _rate_limited_fallback(url, cached)
+    return remote
+
+
+def _rate_limited_fallback(url: str, cached: CachedDigest) -> RemoteDigest:
+    # A stale digest beats none: it still tells whether the local image matched the last known remote.
+    get_logger().info("Registry rate limited; using the cached digest for %s.", url)
+    return RemoteDigest(digest=cached.digest, config_digest=cached.config_digest)
+
+
+def _revalidate_remote_digest(
+    url: str,
+    repository: str,
+    global_cfg: GlobalConfig,
+    cache: DigestCache,
+    cached: CachedDigest | None,
+) -> RemoteDigest | None:
     try:
         token = fetch_pull_token_for_repository(global_cfg, repository)
     except RegistryDiscoveryError:
-        return None
-    url = f"{global_cfg.image_registry_api_url}/{repository}/manifests/{reference}"
+        return _mirror_fallback_digest(url, repository, global_cfg, cached)
     headers: dict[str, str] = {
-        "Accept": ",".join(
-            [
-                "application/vnd.oci.image.index.v1+json",
-                "application/vnd.docker.distribution.manifest.list.v2+json",
-                "application/vnd.oci.image.manifest.v1+json",
-                "application/vnd.docker.distribution.manifest.v2+json",
-            ]
-        ),
+        "Accept": MANIFEST_ACCEPT,
         "Authorization": f"Bearer {token}",
     }
-    response_headers = _head_request(url, headers)
-    if response_headers is None:
+    conditional_headers = dict(headers)
+    if cached is not None and cached.etag:
+        conditional_headers["If-None-Match"] = cached.etag
+    response = _head_request(url, conditional_headers)
+    if response is None:
+        return _mirror_fallback_digest(url, repository, global_cfg, cached)
+    status, response_headers = response
+    etag = _header(response_headers, "ETag")
+    if status == HTTPStatus.NOT_MODIFIED and cached is not None:
+        digest: str | None = cached.digest
+        etag = etag or cached.etag
+    else:
+        digest = _header(response_headers, "Docker-Content-Digest")
+    if digest is None:
+        return None
+
+    if cached is not None and cached.digest == digest and cached.config_digest is not None:
+        config_digest: str | None = cached.config_digest
+    else:
+        # Only a changed index costs extra requests: resolve it to this platform's manifest once.
+        config_digest = _resolve_config_digest(url.rsplit("/", 1)[0], repository, digest, headers, global_cfg)
+    cache.save(
+        url,
+        CachedDigest(digest=digest, etag=etag, checked_at=time.time(), config_digest=config_digest),
+    )
+    return RemoteDigest(digest=digest, config_digest=config_digest)
+
+
+def _resolve_config_digest(
+    manifests_url: str,
+    repository: str,
+    digest: str,
+    headers: Mapping[str, str],
+    global_cfg: GlobalConfig,
+) -> str | None:
+    # Manifests addressed by digest are immutable, so any mirror holding them answers as well as upstream.
+    for mirror in ranked_mirrors(global_cfg):
+        mirror_manifests_url = f"{mirror.api_url}/{repository}/manifests"
+        config_digest = _platform_config_digest(mirror_manifests_url, digest, {"Accept": MANIFEST_ACCEPT})
+        if config_digest is not None:
+            return config_digest
+    return _platform_config_digest(manifests_url, digest, headers)
+
+
+def _mirror_fallback_digest(
+    url: str,
+    repository: str,
+    global_cfg: GlobalConfig,
+    cached: CachedDigest | None,
+) -> RemoteDigest | None:
+    # Mirrors may serve stale tags: their answer is used for this launch only, never cached as fresh.
+    reference = url.rsplit("/", 1)[1]
+    for mirror in ranked_mirrors(global_cfg):
+        remote = _mirror_remote_digest(mirror, repository, reference, cached)
+        if remote is not None:
+            get_logger().info("Upstream registry unreachable; resolved %s through mirror %s.", url, mirror.registry)
+            return remote
+    return None
+
+
+def _mirror_remote_digest(
+    mirror: RegistryMirror,
+    repository: str,
+    reference: str,
+    cached: CachedDigest | None,
+) -> RemoteDigest | None:
+    # Pull-through caches serve anonymously; anything but a digest (404, 401, errors) means no answer.
+    manifests_url = f"{mirror.api_url}/{repository}/manifests"
+    headers = {"Accept": MANIFEST_ACCEPT}
+    response = _head_request(f"{manifests_url}/{reference}", headers)
+    if response is None or response[0] != HTTPStatus.OK:
+        return None
+    digest = _header(response[1], "Docker-Content-Digest")
+    if digest is None:
+        return None
+    if cached is not None and cached.digest == digest and cached.config_digest is not None:
+        return RemoteDigest(digest=digest, config_digest=cached.config_digest)
+    return RemoteDigest(digest=digest, config_digest=_platform_config_digest(manifests_url, digest, headers))
+
+
+def _platform_config_digest(manifests_url: str, digest: str, headers: Mapping[str, str]) -> str | None:
+    platform = get_local_platform()
+    if platform is None:
+        return None
+    manifest = get_registry_json(f"{manifests_url}/{digest}", headers)
+    if manifest is None:
+        return None
+    entries = manifest.get("manifests")
+    if isinstance(entries, list):
+        platform_digest = select_platform_manifest(entries, platform)
+        if platform_digest is None:
+            return None
+        manifest = get_registry_json(f"{manifests_url}/{platform_digest}", headers)
+        if manifest is None:
+            return None
+    config = manifest.get("config")
+    if not isinstance(config, dict):
+        return None
+    config_digest = config.get("digest")
+    return config_digest if isinstance(config_digest, str) else None
+
+
+def get_registry_json(url: str, headers: Mapping[str, str]) -> dict[str, Any] | None:
+    """
+    GETs a manifest or config blob and returns its JSON object, or None on any failure.
+    """
+    try:
+        with span("GET", HTTP, url=url) as attrs:
+            response = registry_request("GET", url, headers)
+            attrs["status"] = response.status
+    except (OSError, http.client.HTTPException):
+        return None
+    if response.status != HTTPStatus.OK:
         return None
-    return response_headers.get("Docker-Content-Digest")
+    try:
+        payload = json.loads(response.body)
+    except ValueError:
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
 
 
-def _parse_reference(image_ref: str) -> str:
+def parse_reference(image_ref: str) -> str:
     reference = "latest"
     if "@" in image_ref:
         _, reference = image_ref.split("@", 1)
@@ -53,14 +294,17 @@ def _parse_reference(image_ref: str) -> str:
     return reference or "latest"
 
 
-def _head_request(url: str, headers: Mapping[str, str]) -> dict[str, str] | None:
-    request = urllib.request.Request(url, headers=dict(headers), method="HEAD")
+def _head_request(url: str, headers: Mapping[str, str]) -> tuple[int, dict[str, str]] | None:
+    """
+    Returns the status and headers of a HEAD request, or None when the registry could not answer: connection
+    errors, rate limiting and server errors. Any other status (404 included) is the registry's answer.
+    """
     try:
-        with urllib.request.urlopen(request) as response:
-            return dict(response.headers)
-    except urllib.error.HTTPError as exc:
-        if exc.code in {401, 403}:
-            return dict(exc.headers)
+        with span("HEAD", HTTP, url=url) as attrs:
+            response = registry_request("HEAD", url, headers)
+            attrs["status"] = response.status
+    except (OSError, http.client.HTTPException):
         return None
-    except urllib.error.URLError:
+    if response.status == HTTPStatus.TOO_MANY_REQUESTS or response.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
         return None
+    return response.status, response.headers
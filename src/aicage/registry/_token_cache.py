@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from aicage._state_files import read_json, update_json
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/registry-tokens"
+_TOKENS_FILENAME = "tokens.json"
+_TOKEN_URL_KEY: str = "token_url"
+_REPOSITORIES_KEY: str = "repositories"
+_TOKEN_KEY: str = "token"
+_EXPIRES_AT_KEY: str = "expires_at"
+
+
+class TokenCache:
+    """
+    Persists anonymous registry pull tokens with their expiry (epoch seconds) under ~/.aicage/state.
+    A token is reused for any repository it was scoped to until it expires.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def load(self, token_url: str, repository: str) -> str | None:
+        now = time.time()
+        for entry in self._entries():
+            if (
+                entry.get(_TOKEN_URL_KEY) == token_url
+                and repository in entry.get(_REPOSITORIES_KEY, [])
+                and entry.get(_EXPIRES_AT_KEY, 0) > now
+            ):
+                token = entry.get(_TOKEN_KEY)
+                return token if isinstance(token, str) else None
+        return None
+
+    def save(self, token_url: str, repositories: list[str], token: str, expires_at: float) -> None:
+        new_entry = {
+            _TOKEN_URL_KEY: token_url,
+            _REPOSITORIES_KEY: repositories,
+            _TOKEN_KEY: token,
+            _EXPIRES_AT_KEY: expires_at,
+        }
+
+        def update(payload: Any) -> list[dict[str, Any]]:
+            now = time.time()
+            kept = [
+                entry
+                for entry in _as_entries(payload)
+                if entry.get(_EXPIRES_AT_KEY, 0) > now
+                and not (entry.get(_TOKEN_URL_KEY) == token_url and entry.get(_REPOSITORIES_KEY) == repositories)
+            ]
+            return [*kept, new_entry]
+
+        # Tokens are credentials, even anonymous ones; keep the file private.
+        update_json(self._path(), update, mode=0o600)
+
+    def _entries(self) -> list[dict[str, Any]]:
+        return _as_entries(read_json(self._path()))
+
+    def _path(self) -> Path:
+        return self._base_dir / _TOKENS_FILENAME
+
+
+def _as_entries(payload: Any) -> list[dict[str, Any]]:
+    if not isinstance(payload, list):
+        return []
+    return [entry for entry in payload if isinstance(entry, dict)]
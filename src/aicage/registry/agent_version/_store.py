@@ -6,6 +6,8 @@ from pathlib import Path
 
 import yaml
 
+from aicage._state_files import write_text_atomic
+
 _DEFAULT_STATE_DIR = "~/.aicage/state/version-check"
 _AGENT_KEY: str = "agent"
 _VERSION_KEY: str = "version"
@@ -16,18 +18,32 @@ class VersionCheckStore:
     def __init__(self, base_dir: Path | None = None) -> None:
         self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
 
+    def load(self, agent: str) -> str | None:
+        """
+        Returns the version recorded by the last successful check of `agent`.
+        """
+        path = self._path(agent)
+        if not path.is_file():
+            return None
+        payload = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        if not isinstance(payload, dict):
+            return None
+        version = payload.get(_VERSION_KEY)
+        return str(version) if version is not None else None
+
     def save(self, agent: str, version: str) -> Path:
-        self._base_dir.mkdir(parents=True, exist_ok=True)
-        path = self._base_dir / f"{_sanitize_agent_name(agent)}.yaml"
-        with path.open("w", encoding="utf-8") as handle:
-            payload = {
-                _AGENT_KEY: agent,
-                _VERSION_KEY: version,
-                _CHECKED_AT_KEY: _now_iso(),
-            }
-            yaml.safe_dump(payload, handle, sort_keys=True)
+        path = self._path(agent)
+        payload = {
+            _AGENT_KEY: agent,
+            _VERSION_KEY: version,
+            _CHECKED_AT_KEY: _now_iso(),
+        }
+        write_text_atomic(path, yaml.safe_dump(payload, sort_keys=True))
         return path
 
+    def _path(self, agent: str) -> Path:
+        return self._base_dir / f"{_sanitize_agent_name(agent)}.yaml"
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
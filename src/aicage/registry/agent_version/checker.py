@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from aicage._logging import get_logger
+from aicage._tracing import SUBPROCESS, span, traced
 from aicage.config.global_config import GlobalConfig
 from aicage.errors import CliError
 from aicage.registry.images_metadata.models import AgentMetadata
@@ -18,6 +19,7 @@ class AgentVersionChecker:
         self._global_cfg = global_cfg
         self._store = store or VersionCheckStore()
 
+    @traced("AgentVersionChecker.get_version")
     def get_version(
         self,
         agent_name: str,
@@ -95,7 +97,9 @@ def _run_host(script_path: Path) -> _CommandResult:
 
 
 def _run_command(command: list[str], context: str) -> _CommandResult:
-    process = subprocess.run(command, check=False, capture_output=True, text=True)
+    with span(command[0], SUBPROCESS, argv=command) as attrs:
+        process = subprocess.run(command, check=False, capture_output=True, text=True)
+        attrs["returncode"] = process.returncode
     output = process.stdout.strip() if process.stdout else ""
     if process.returncode == 0 and output:
         return _CommandResult(success=True, output=output, error="")
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import portalocker
+
+from aicage._logging import get_logger
+from aicage._tracing import TRACING_ENV_VARS
+from aicage.config.errors import ConfigError
+from aicage.config.global_config import GlobalConfig
+from aicage.config.runtime_config import RunConfig, with_agent_version
+from aicage.errors import CliError
+from aicage.registry import _local_query
+from aicage.registry._logs import refresh_log_path
+from aicage.registry._refresh_store import (
+    RESULT_CURRENT,
+    RESULT_FAILED,
+    RESULT_UPDATED,
+    RefreshState,
+    RefreshStore,
+)
+from aicage.registry.image_pull import pull_image
+from aicage.registry.images_metadata.loader import load_images_metadata
+from aicage.registry.local_build.ensure_local_image import ensure_local_image
+
+_WORKER_MODULE = "aicage.registry.background_refresh"
+_PROJECT_PATH_KEY: str = "project_path"
+_AGENT_KEY: str = "agent"
+_BASE_KEY: str = "base"
+_IMAGE_REF_KEY: str = "image_ref"
+_GLOBAL_CONFIG_KEY: str = "global_config"
+
+
+def local_image_available(image_ref: str) -> bool:
+    return _local_query.get_local_image_id(image_ref) is not None
+
+
+def start_background_refresh(run_config: RunConfig) -> None:
+    """
+    Spawns a detached worker that checks the image for updates and pulls or rebuilds it for the next launch.
+    """
+    logger = get_logger()
+    payload = {
+        _PROJECT_PATH_KEY: str(run_config.project_path),
+        _AGENT_KEY: run_config.agent,
+        _BASE_KEY: run_config.base,
+        _IMAGE_REF_KEY: run_config.image_ref,
+        _GLOBAL_CONFIG_KEY: run_config.global_cfg.to_mapping(),
+    }
+    log_path = refresh_log_path(run_config.image_ref)
+    # The worker must not overwrite the trace or profile of the launch that spawned it.
+    env = {key: value for key, value in os.environ.items() if key not in TRACING_ENV_VARS}
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with log_path.open("w", encoding="utf-8") as log_handle:
+            process = subprocess.Popen(
+                [sys.executable, "-m", _WORKER_MODULE],
+                stdin=subprocess.PIPE,
+                stdout=log_handle,
+                stderr=subprocess.STDOUT,
+                env=env,
+                start_new_session=True,
+            )
+        if process.stdin is not None:
+            process.stdin.write(json.dumps(payload).encode("utf-8"))
+            process.stdin.close()
+    except OSError as exc:
+        logger.warning("Failed to start background refresh for %s: %s", run_config.image_ref, exc)
+        return
+    logger.info("Started background refresh for %s (logs: %s)", run_config.image_ref, log_path)
+
+
+def mark_refreshed(image_ref: str) -> None:
+    RefreshStore().save(image_ref, RefreshState(checked_at=time.time()))
+
+
+def report_background_refresh(image_ref: str) -> None:
+    """
+    Prints the outcome of the last background refresh of `image_ref` once.
+    """
+    store = RefreshStore()
+    state = store.load(image_ref)
+    if state is None or state.result is None:
+        return
+    if state.result == RESULT_UPDATED:
+        print(f"[aicage] Background refresh updated {image_ref}.")
+    elif state.result == RESULT_FAILED:
+        print(f"[aicage] Warning: background refresh of {image_ref} failed: {state.message}", file=sys.stderr)
+    store.save(image_ref, RefreshState(checked_at=state.checked_at))
+
+
+def refresh_image(payload: dict[str, Any]) -> None:
+    """
+    Runs one background refresh; only one worker per image is active at a time.
+    """
+    image_ref = payload[_IMAGE_REF_KEY]
+    store = RefreshStore()
+    lock_path = store.lock_path(image_ref)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with portalocker.Lock(str(lock_path), mode="a+", timeout=0, fail_when_locked=True):
+            _refresh_locked(store, payload)
+    except portalocker.exceptions.LockException:
+        get_logger().info("Background refresh for %s already running.", image_ref)
+
+
+def _refresh_locked(store: RefreshStore, payload: dict[str, Any]) -> None:
+    image_ref = payload[_IMAGE_REF_KEY]
+    previous = store.load(image_ref)
+    before = _local_query.get_local_image_id(image_ref)
+    try:
+        run_config = with_agent_version(_run_config(payload))
+        agent_metadata = run_config.images_metadata.agents[run_config.agent]
+        if agent_metadata.local_definition_dir is None:
+            pull_image(run_config)
+        else:
+            ensure_local_image(run_config)
+    except (CliError, ConfigError) as exc:
+        get_logger().warning("Background refresh of %s failed: %s", image_ref, exc)
+        checked_at = previous.checked_at if previous is not None else 0.0
+        store.save(image_ref, RefreshState(checked_at=checked_at, result=RESULT_FAILED, message=str(exc)))
+        return
+    result = RESULT_CURRENT if _local_query.get_local_image_id(image_ref) == before else RESULT_UPDATED
+    store.save(image_ref, RefreshState(checked_at=time.time(), result=result))
+
+
+def _run_config(payload: dict[str, Any]) -> RunConfig:
+    global_cfg = GlobalConfig.from_mapping(payload[_GLOBAL_CONFIG_KEY])
+    agent = payload[_AGENT_KEY]
+    return RunConfig(
+        project_path=Path(payload[_PROJECT_PATH_KEY]),
+        agent=agent,
+        base=payload[_BASE_KEY],
+        image_ref=payload[_IMAGE_REF_KEY],
+        agent_version=None,
+        global_cfg=global_cfg,
+        images_metadata=load_images_metadata(global_cfg.local_image_repository, agent),
+        project_docker_args="",
+        mounts=[],
+        refresh=True,
+    )
+
+
+def main() -> int:
+    refresh_image(json.load(sys.stdin))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from aicage._state_files import write_text_atomic
+
+_DEFAULT_STATE_DIR = "~/.aicage/state/custom-agents"
+_FORMAT_KEY: str = "format"
+# Bumped whenever validation adds keys to the mapping, so entries cached by older releases are revalidated.
+_FORMAT_VERSION = 2
+_FINGERPRINT_KEY: str = "fingerprint"
+_MAPPING_KEY: str = "mapping"
+_FINGERPRINT_FILES = ("agent.yml", "agent.yaml", "install.sh", "version.sh")
+
+Fingerprint = list[list[Any]]
+
+
+class CustomAgentCache:
+    """
+    Caches validated custom agent definitions, keyed by mtime/size fingerprints of their files.
+    """
+
+    def __init__(self, base_dir: Path | None = None) -> None:
+        self._base_dir = base_dir or Path(os.path.expanduser(_DEFAULT_STATE_DIR))
+
+    def load(self, agent_name: str, fingerprint: Fingerprint) -> dict[str, Any] | None:
+        path = self._path(agent_name)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get(_FORMAT_KEY) != _FORMAT_VERSION:
+            return None
+        if payload.get(_FINGERPRINT_KEY) != fingerprint:
+            return None
+        mapping = payload.get(_MAPPING_KEY)
+        return mapping if isinstance(mapping, dict) else None
+
+    def save(self, agent_name: str, fingerprint: Fingerprint, mapping: dict[str, Any]) -> None:
+        payload = json.dumps(
+            {_FORMAT_KEY: _FORMAT_VERSION, _FINGERPRINT_KEY: fingerprint, _MAPPING_KEY: mapping}, sort_keys=True
+        )
+        try:
+            write_text_atomic(self._path(agent_name), payload)
+        except OSError:
+            return
+
+    def _path(self, agent_name: str) -> Path:
+        return self._base_dir / f"{agent_name}.json"
+
+
+def agent_fingerprint(agent_dir: Path) -> Fingerprint:
+    """
+    Returns mtime/size entries for the agent directory and the files its definition depends on.
+    """
+    entries: Fingerprint = [_stat_entry(agent_dir, ".")]
+    entries.extend(_stat_entry(agent_dir / name, name) for name in _FINGERPRINT_FILES)
+    return entries
+
+
+def _stat_entry(path: Path, name: str) -> list[Any]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return [name, None, None]
+    return [name, stat.st_mtime_ns, stat.st_size]
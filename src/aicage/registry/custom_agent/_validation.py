@@ -5,6 +5,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from aicage.cli_types import COMMAND_NAMES
 from aicage.config.resources import find_packaged_path
 from aicage.errors import CliError
 from aicage.registry.images_metadata.models import BUILD_LOCAL_KEY
@@ -50,6 +51,14 @@ def ensure_required_files(agent_name: str, agent_dir: Path) -> None:
         raise CliError(f"Custom agent '{agent_name}' is missing {', '.join(missing)}.")
 
 
+def ensure_agent_name(agent_name: str) -> None:
+    if agent_name in COMMAND_NAMES:
+        raise CliError(
+            f"Custom agent '{agent_name}' has the name of the 'aicage {agent_name}' command; rename its directory. "
+            f"Reserved names: {', '.join(sorted(COMMAND_NAMES))}."
+        )
+
+
 @lru_cache(maxsize=1)
 def _load_schema() -> dict[str, Any]:
     path = find_packaged_path(_AGENT_SCHEMA_PATH)
@@ -66,20 +75,38 @@ def _validate_value(value: Any, schema_entry: dict[str, Any], context: str) -> N
         expect_bool(value, context)
         return
     if schema_type == "array":
-        _expect_str_list(value, context, schema_entry)
+        _expect_list(value, context, schema_entry)
+        return
+    if schema_type == "object":
+        _expect_object(value, context, schema_entry)
         return
     raise CliError(f"{context} has unsupported schema type '{schema_type}'.")
 
 
-def _expect_str_list(value: Any, context: str, schema_entry: dict[str, Any]) -> None:
+def _expect_list(value: Any, context: str, schema_entry: dict[str, Any]) -> None:
     if not isinstance(value, list):
         raise CliError(f"{context} must be a list.")
     item_schema = schema_entry.get("items", {})
     item_type = item_schema.get("type")
-    if item_type != "string":
-        raise CliError(f"{context} items must be strings.")
+    if item_type not in ("string", "object"):
+        raise CliError(f"{context} items must be strings or mappings.")
     for item in value:
-        expect_string(item, context)
+        _validate_value(item, item_schema, context)
+
+
+def _expect_object(value: Any, context: str, schema_entry: dict[str, Any]) -> None:
+    if not isinstance(value, dict):
+        raise CliError(f"{context} items must be mappings.")
+    properties = schema_entry.get("properties", {})
+    missing = sorted(set(schema_entry.get("required", [])) - set(value))
+    if missing:
+        raise CliError(f"{context} items are missing required keys: {', '.join(missing)}.")
+    unknown = sorted(set(value) - set(properties))
+    if schema_entry.get("additionalProperties", True) is False and unknown:
+        raise CliError(f"{context} items contain unsupported keys: {', '.join(unknown)}.")
+    for key, item in value.items():
+        if key in properties:
+            _validate_value(item, properties[key], f"{context}.{key}")
 
 
 def expect_string(value: Any, context: str) -> str:
@@ -14,11 +14,15 @@ from aicage.registry.images_metadata.models import (
     AGENT_PATH_KEY,
     BASE_DISTRO_EXCLUDE_KEY,
     BASE_EXCLUDE_KEY,
+    DOWNLOADS_KEY,
+    AgentDownload,
     AgentMetadata,
     ImagesMetadata,
+    parse_downloads,
 )
 
-from ._validation import ensure_required_files, expect_string, maybe_str_list, validate_agent_mapping
+from ._cache import CustomAgentCache, agent_fingerprint
+from ._validation import ensure_agent_name, ensure_required_files, expect_string, maybe_str_list, validate_agent_mapping
 
 DEFAULT_CUSTOM_AGENTS_DIR = "~/.aicage/custom/agents"
 _AGENT_DEFINITION_FILES = ("agent.yml", "agent.yaml")
@@ -27,28 +31,64 @@ _AGENT_DEFINITION_FILES = ("agent.yml", "agent.yaml")
 def load_custom_agents(
     images_metadata: ImagesMetadata,
     local_image_repository: str,
+    agent_name: str | None = None,
 ) -> dict[str, AgentMetadata]:
+    """
+    Loads custom agents; with `agent_name`, only that agent's directory is read.
+    """
     agents_dir = Path(os.path.expanduser(DEFAULT_CUSTOM_AGENTS_DIR))
     if not agents_dir.is_dir():
         return {}
 
+    cache = CustomAgentCache()
     custom_agents: dict[str, AgentMetadata] = {}
-    for entry in sorted(agents_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        agent_name = entry.name
-        agent_path = _find_agent_definition(entry)
-        agent_mapping = _load_yaml(agent_path)
-        ensure_required_files(agent_name, entry)
-        custom_agents[agent_name] = _build_custom_agent(
-            agent_name=agent_name,
-            agent_mapping=agent_mapping,
+    for entry in _agent_dirs(agents_dir, agent_name):
+        ensure_agent_name(entry.name)
+        custom_agents[entry.name] = _build_custom_agent(
+            agent_name=entry.name,
+            normalized_mapping=_load_agent_mapping(entry, cache),
             images_metadata=images_metadata,
             local_image_repository=local_image_repository,
         )
     return custom_agents
 
 
+def definition_downloads(definition_dir: Path) -> list[AgentDownload]:
+    """
+    Returns the downloads declared by a packaged agent definition, validated like a custom agent's. The release
+    images metadata is generated elsewhere, so locally built builtin agents declare them in their agent.yaml.
+    """
+    for filename in _AGENT_DEFINITION_FILES:
+        path = definition_dir / filename
+        if path.is_file():
+            mapping = validate_agent_mapping(_load_yaml(path))
+            return parse_downloads(mapping.get(DOWNLOADS_KEY), DOWNLOADS_KEY)
+    return []
+
+
+def _agent_dirs(agents_dir: Path, agent_name: str | None) -> list[Path]:
+    if agent_name is None:
+        return [entry for entry in sorted(agents_dir.iterdir()) if entry.is_dir()]
+    entry = agents_dir / agent_name
+    if entry.parent != agents_dir or not entry.is_dir():
+        return []
+    return [entry]
+
+
+def _load_agent_mapping(agent_dir: Path, cache: CustomAgentCache) -> dict[str, Any]:
+    fingerprint = agent_fingerprint(agent_dir)
+    cached = cache.load(agent_dir.name, fingerprint)
+    if cached is not None:
+        return cached
+
+    agent_path = _find_agent_definition(agent_dir)
+    agent_mapping = _load_yaml(agent_path)
+    ensure_required_files(agent_dir.name, agent_dir)
+    normalized_mapping = validate_agent_mapping(agent_mapping)
+    cache.save(agent_dir.name, fingerprint, normalized_mapping)
+    return normalized_mapping
+
+
 def _find_agent_definition(agent_dir: Path) -> Path:
     for filename in _AGENT_DEFINITION_FILES:
         candidate = agent_dir / filename
@@ -71,11 +111,10 @@ def _load_yaml(path: Path) -> dict[str, Any]:
 
 def _build_custom_agent(
     agent_name: str,
-    agent_mapping: dict[str, Any],
+    normalized_mapping: dict[str, Any],
     images_metadata: ImagesMetadata,
     local_image_repository: str,
 ) -> AgentMetadata:
-    normalized_mapping = validate_agent_mapping(agent_mapping)
     base_exclude = maybe_str_list(normalized_mapping.get(BASE_EXCLUDE_KEY), BASE_EXCLUDE_KEY)
     base_distro_exclude = maybe_str_list(
         normalized_mapping.get(BASE_DISTRO_EXCLUDE_KEY), BASE_DISTRO_EXCLUDE_KEY
@@ -95,6 +134,7 @@ def _build_custom_agent(
         base_exclude=base_exclude,
         base_distro_exclude=base_distro_exclude,
         local_definition_dir=Path(os.path.expanduser(DEFAULT_CUSTOM_AGENTS_DIR)) / agent_name,
+        downloads=parse_downloads(normalized_mapping.get(DOWNLOADS_KEY), DOWNLOADS_KEY),
     )
 
 
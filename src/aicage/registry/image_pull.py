@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from aicage._logging import get_logger
+from aicage._tracing import traced
 from aicage.config.runtime_config import RunConfig
 from aicage.registry._logs import pull_log_path
+from aicage.registry._mirrors import mirror_image_refs
 from aicage.registry._pull_decision import decide_pull
 from aicage.registry._pull_runner import run_pull
 
 
+@traced("pull_image")
 def pull_image(run_config: RunConfig) -> None:
     logger = get_logger()
     decision = decide_pull(run_config)
@@ -15,4 +18,5 @@ def pull_image(run_config: RunConfig) -> None:
         return
 
     log_path = pull_log_path(run_config.image_ref)
-    run_pull(run_config.image_ref, log_path)
+    mirror_refs = mirror_image_refs(run_config.image_ref, decision.remote_digest, run_config.global_cfg)
+    run_pull(run_config.image_ref, log_path, mirror_refs=mirror_refs)
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
 
 from aicage.config.context import ConfigContext
+from aicage.config.global_config import GlobalConfig
 from aicage.config.project_config import AGENT_BASE_KEY, AgentConfig
 from aicage.errors import CliError
 from aicage.registry.images_metadata.models import AgentMetadata, ImagesMetadata
 from aicage.runtime.prompts import BaseSelectionRequest, prompt_for_base
 
 from ._image_refs import local_image_ref
+from .pull_plan import estimate_pulls
+
+# Size estimates must not hold up the base prompt on a slow or unreachable registry.
+_ESTIMATE_TIMEOUT_SECONDS = 5.0
 
 
 def select_agent_image(agent: str, context: ConfigContext) -> str:
@@ -25,6 +31,9 @@ def select_agent_image(agent: str, context: ConfigContext) -> str:
             agent=agent,
             context=context,
             agent_metadata=agent_metadata,
+            estimate_download_sizes=(
+                None if context.global_cfg.offline else partial(_download_sizes, context.global_cfg, agent_metadata)
+            ),
         )
         base = prompt_for_base(request)
         agent_cfg.base = base
@@ -38,6 +47,21 @@ def select_agent_image(agent: str, context: ConfigContext) -> str:
     return agent_metadata.valid_bases[base]
 
 
+def _download_sizes(global_cfg: GlobalConfig, agent_metadata: AgentMetadata) -> dict[str, int]:
+    pull_refs = {base: _pull_ref(global_cfg, agent_metadata, base) for base in agent_metadata.valid_bases}
+    estimates = estimate_pulls(sorted(set(pull_refs.values())), global_cfg, timeout=_ESTIMATE_TIMEOUT_SECONDS)
+    return {
+        base: estimates[image_ref].download_bytes for base, image_ref in pull_refs.items() if image_ref in estimates
+    }
+
+
+def _pull_ref(global_cfg: GlobalConfig, agent_metadata: AgentMetadata, base: str) -> str:
+    # Locally built agents download their base image; the agent layers are built on this machine.
+    if agent_metadata.local_definition_dir is not None:
+        return f"{global_cfg.image_registry}/{global_cfg.image_base_repository}:{base}"
+    return agent_metadata.valid_bases[base]
+
+
 def _require_agent_metadata(agent: str, images_metadata: ImagesMetadata) -> AgentMetadata:
     agent_metadata = images_metadata.agents.get(agent)
     if not agent_metadata:
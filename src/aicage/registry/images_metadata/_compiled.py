@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from .models import ImagesMetadata
+
+COMPILED_FILENAME = "images-metadata.json"
+# Bumped whenever the compiled layout changes; artifacts in an older layout fall back to the YAML.
+_FORMAT_VERSION = 2
+_FORMAT_KEY = "format"
+_SOURCE_SHA256_KEY = "source_sha256"
+_METADATA_KEY = "metadata"
+
+
+def compile_images_metadata(source_path: Path, output_path: Path) -> Path:
+    """
+    Validates images-metadata.yaml once and writes the pre-validated JSON artifact.
+    """
+    source = source_path.read_bytes()
+    metadata = ImagesMetadata.from_yaml(source.decode("utf-8"))
+    payload: dict[str, Any] = {
+        _FORMAT_KEY: _FORMAT_VERSION,
+        _SOURCE_SHA256_KEY: _sha256(source),
+        _METADATA_KEY: metadata.to_compiled(),
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(payload, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+    return output_path
+
+
+def load_compiled_images_metadata(compiled_path: Path, source: bytes) -> ImagesMetadata | None:
+    """
+    Returns metadata from the compiled artifact, or None when it is missing or stale for `source`.
+    """
+    try:
+        payload = json.loads(compiled_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if payload.get(_FORMAT_KEY) != _FORMAT_VERSION:
+        return None
+    if payload.get(_SOURCE_SHA256_KEY) != _sha256(source):
+        return None
+    return ImagesMetadata.from_compiled(payload[_METADATA_KEY])
+
+
+def _sha256(source: bytes) -> str:
+    return hashlib.sha256(source).hexdigest()
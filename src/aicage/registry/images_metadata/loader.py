@@ -1,17 +1,35 @@
 from __future__ import annotations
 
+from pathlib import Path
+
+from aicage._stat_cache import StatCache
 from aicage.config.resources import find_packaged_path
 from aicage.errors import CliError
 from aicage.registry._agent_discovery import discover_agents
 
+from ._compiled import COMPILED_FILENAME, load_compiled_images_metadata
 from .models import ImagesMetadata
 
+_PACKAGED_METADATA: StatCache[ImagesMetadata] = StatCache()
+
+
+def load_images_metadata(local_image_repository: str, agent: str | None = None) -> ImagesMetadata:
+    metadata = _load_packaged_metadata()
+    return discover_agents(metadata, local_image_repository, agent)
 
-def load_images_metadata(local_image_repository: str) -> ImagesMetadata:
+
+def _load_packaged_metadata() -> ImagesMetadata:
     path = find_packaged_path("images-metadata.yaml")
     try:
-        payload = path.read_text(encoding="utf-8")
+        return _PACKAGED_METADATA.get(path, _read_packaged_metadata)
     except OSError as exc:
         raise CliError(f"Failed to read images metadata from {path}: {exc}") from exc
-    metadata = ImagesMetadata.from_yaml(payload)
-    return discover_agents(metadata, local_image_repository)
+
+
+def _read_packaged_metadata(path: Path) -> ImagesMetadata:
+    source = path.read_bytes()
+    # Packaged builds ship a pre-validated JSON artifact; development checkouts fall back to YAML.
+    compiled = load_compiled_images_metadata(path.with_name(COMPILED_FILENAME), source)
+    if compiled is not None:
+        return compiled
+    return ImagesMetadata.from_yaml(source.decode("utf-8"))
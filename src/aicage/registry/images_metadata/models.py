@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -29,6 +29,10 @@ BUILD_LOCAL_KEY: str = "build_local"
 _VALID_BASES_KEY: str = "valid_bases"
 BASE_EXCLUDE_KEY: str = "base_exclude"
 BASE_DISTRO_EXCLUDE_KEY: str = "base_distro_exclude"
+DOWNLOADS_KEY: str = "downloads"
+_DOWNLOAD_NAME_KEY: str = "name"
+_DOWNLOAD_URL_KEY: str = "url"
+_DOWNLOAD_PLATFORM_KEY: str = "platform"
 
 
 @dataclass(frozen=True)
@@ -45,6 +49,18 @@ class BaseMetadata:
     test_suite: str
 
 
+@dataclass(frozen=True)
+class AgentDownload:
+    """
+    A file cached on the host for local builds: `url` may contain `{version}`, and `platform` (`os/arch`)
+    restricts the download to Docker daemons of that platform.
+    """
+
+    name: str
+    url: str
+    platform: str | None = None
+
+
 @dataclass(frozen=True)
 class AgentMetadata:
     agent_path: str
@@ -54,6 +70,7 @@ class AgentMetadata:
     base_exclude: list[str] | None = None
     base_distro_exclude: list[str] | None = None
     local_definition_dir: Path | None = None
+    downloads: list[AgentDownload] = field(default_factory=list)
 
 
 @dataclass(frozen=True)
@@ -92,6 +109,82 @@ class ImagesMetadata:
             agents=agents,
         )
 
+    @classmethod
+    def from_compiled(cls, data: dict[str, Any]) -> ImagesMetadata:
+        """
+        Rebuilds metadata from a mapping produced by `to_compiled`, skipping validation.
+        """
+        return cls(
+            aicage_image=ImageReleaseInfo(version=data[_AICAGE_IMAGE_KEY][_VERSION_KEY]),
+            aicage_image_base=ImageReleaseInfo(version=data[_AICAGE_IMAGE_BASE_KEY][_VERSION_KEY]),
+            bases={
+                name: BaseMetadata(
+                    root_image=base[_ROOT_IMAGE_KEY],
+                    base_image_distro=base[_BASE_IMAGE_DISTRO_KEY],
+                    base_image_description=base[_BASE_IMAGE_DESCRIPTION_KEY],
+                    os_installer=base[_OS_INSTALLER_KEY],
+                    test_suite=base[_TEST_SUITE_KEY],
+                )
+                for name, base in data[_BASES_KEY].items()
+            },
+            agents={
+                name: AgentMetadata(
+                    agent_path=agent[AGENT_PATH_KEY],
+                    agent_full_name=agent[AGENT_FULL_NAME_KEY],
+                    agent_homepage=agent[AGENT_HOMEPAGE_KEY],
+                    valid_bases=agent[_VALID_BASES_KEY],
+                    base_exclude=agent.get(BASE_EXCLUDE_KEY),
+                    base_distro_exclude=agent.get(BASE_DISTRO_EXCLUDE_KEY),
+                    local_definition_dir=_local_definition_dir(name, agent[BUILD_LOCAL_KEY]),
+                    downloads=[
+                        AgentDownload(
+                            name=download[_DOWNLOAD_NAME_KEY],
+                            url=download[_DOWNLOAD_URL_KEY],
+                            platform=download.get(_DOWNLOAD_PLATFORM_KEY),
+                        )
+                        for download in agent.get(DOWNLOADS_KEY, [])
+                    ],
+                )
+                for name, agent in data[_AGENT_KEY].items()
+            },
+        )
+
+    def to_compiled(self) -> dict[str, Any]:
+        """
+        Returns a JSON-serializable mapping in the images-metadata.yaml layout.
+        """
+        agents: dict[str, Any] = {}
+        for name, agent in self.agents.items():
+            agent_mapping: dict[str, Any] = {
+                AGENT_PATH_KEY: agent.agent_path,
+                AGENT_FULL_NAME_KEY: agent.agent_full_name,
+                AGENT_HOMEPAGE_KEY: agent.agent_homepage,
+                BUILD_LOCAL_KEY: agent.local_definition_dir is not None,
+                _VALID_BASES_KEY: agent.valid_bases,
+            }
+            if agent.base_exclude is not None:
+                agent_mapping[BASE_EXCLUDE_KEY] = agent.base_exclude
+            if agent.base_distro_exclude is not None:
+                agent_mapping[BASE_DISTRO_EXCLUDE_KEY] = agent.base_distro_exclude
+            if agent.downloads:
+                agent_mapping[DOWNLOADS_KEY] = [_download_mapping(download) for download in agent.downloads]
+            agents[name] = agent_mapping
+        return {
+            _AICAGE_IMAGE_KEY: {_VERSION_KEY: self.aicage_image.version},
+            _AICAGE_IMAGE_BASE_KEY: {_VERSION_KEY: self.aicage_image_base.version},
+            _BASES_KEY: {
+                name: {
+                    _ROOT_IMAGE_KEY: base.root_image,
+                    _BASE_IMAGE_DISTRO_KEY: base.base_image_distro,
+                    _BASE_IMAGE_DESCRIPTION_KEY: base.base_image_description,
+                    _OS_INSTALLER_KEY: base.os_installer,
+                    _TEST_SUITE_KEY: base.test_suite,
+                }
+                for name, base in self.bases.items()
+            },
+            _AGENT_KEY: agents,
+        }
+
 
 def _parse_release_info(value: Any, context: str) -> ImageReleaseInfo:
     mapping = _expect_mapping(value, context)
@@ -159,7 +252,7 @@ def _parse_agents(value: Any) -> dict[str, AgentMetadata]:
                 BUILD_LOCAL_KEY,
                 _VALID_BASES_KEY,
             },
-            optional={BASE_EXCLUDE_KEY, BASE_DISTRO_EXCLUDE_KEY},
+            optional={BASE_EXCLUDE_KEY, BASE_DISTRO_EXCLUDE_KEY, DOWNLOADS_KEY},
             context=f"{_AGENT_KEY}.{name}",
         )
         agents[name] = AgentMetadata(
@@ -190,10 +283,53 @@ def _parse_agents(value: Any) -> dict[str, AgentMetadata]:
                 agent_mapping.get(BASE_DISTRO_EXCLUDE_KEY),
                 f"{_AGENT_KEY}.{name}.{BASE_DISTRO_EXCLUDE_KEY}",
             ),
+            downloads=parse_downloads(agent_mapping.get(DOWNLOADS_KEY), f"{_AGENT_KEY}.{name}.{DOWNLOADS_KEY}"),
         )
     return agents
 
 
+def parse_downloads(value: Any, context: str) -> list[AgentDownload]:
+    """
+    Parses an agent's `downloads` list; shared by release metadata and custom agent definitions.
+    """
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise CliError(f"{context} must be a list.")
+    downloads: list[AgentDownload] = []
+    for entry in value:
+        mapping = _expect_mapping(entry, f"{context} items")
+        _expect_keys(
+            mapping,
+            required={_DOWNLOAD_NAME_KEY, _DOWNLOAD_URL_KEY},
+            optional={_DOWNLOAD_PLATFORM_KEY},
+            context=f"{context} items",
+        )
+        name = _expect_string(mapping.get(_DOWNLOAD_NAME_KEY), f"{context}.{_DOWNLOAD_NAME_KEY}")
+        if name in (".", "..") or Path(name).name != name:
+            raise CliError(f"{context}.{_DOWNLOAD_NAME_KEY} '{name}' must be a plain file name.")
+        platform = mapping.get(_DOWNLOAD_PLATFORM_KEY)
+        if platform is not None:
+            platform = _expect_string(platform, f"{context}.{_DOWNLOAD_PLATFORM_KEY}")
+            if platform.count("/") != 1:
+                raise CliError(f"{context}.{_DOWNLOAD_PLATFORM_KEY} '{platform}' must look like linux/amd64.")
+        downloads.append(
+            AgentDownload(
+                name=name,
+                url=_expect_string(mapping.get(_DOWNLOAD_URL_KEY), f"{context}.{_DOWNLOAD_URL_KEY}"),
+                platform=platform,
+            )
+        )
+    return downloads
+
+
+def _download_mapping(download: AgentDownload) -> dict[str, str]:
+    mapping = {_DOWNLOAD_NAME_KEY: download.name, _DOWNLOAD_URL_KEY: download.url}
+    if download.platform is not None:
+        mapping[_DOWNLOAD_PLATFORM_KEY] = download.platform
+    return mapping
+
+
 def _local_definition_dir(agent_name: str, build_local: bool) -> Path | None:
     if not build_local:
         return None
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import http.client
+import os
+import shutil
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http import HTTPStatus
+from pathlib import Path
+
+import portalocker
+
+from aicage._logging import get_logger
+from aicage._tracing import HTTP, span
+from aicage.config.runtime_config import RunConfig
+from aicage.registry._http import RegistryHttpClient
+from aicage.registry._platform import host_platform
+from aicage.registry.custom_agent.loader import definition_downloads
+from aicage.registry.images_metadata.models import AgentDownload
+
+from ._store import sanitize
+
+_DEFAULT_CACHE_DIR = "~/.aicage/cache/artifacts"
+# Name of the BuildKit named context the Dockerfile bind-mounts for the install step.
+ARTIFACTS_CONTEXT: str = "artifacts"
+
+_VERSION_PLACEHOLDER = "{version}"
+_UNVERSIONED_DIR = "unversioned"
+
+# Another build of the same agent version may be downloading; waiting for it is cheaper than downloading again.
+_LOCK_TIMEOUT_SECONDS = 10 * 60
+_SHARED_LOCK = portalocker.LockFlags.SHARED | portalocker.LockFlags.NON_BLOCKING
+# Downloads run during a build, after the base pull has usually spent the launch's network budget; they use
+# their own client outside the budget so launches still fill the cache.
+_DOWNLOAD_CLIENT = RegistryHttpClient(budgeted=False)
+
+
+@contextmanager
+def agent_artifacts(run_config: RunConfig, base_dir: Path | None = None) -> Iterator[Path]:
+    """
+    Yields the host directory with the agent's declared downloads for its version, downloading each missing
+    file once; builds of the same version for other bases wait for a running download and reuse it. The
+    directory stays locked (shared) until the context exits, so pruning older versions never removes a
+    directory a build is mounting. Offline, or without a known version, nothing is downloaded.
+    """
+    agent_dir = (base_dir or Path(os.path.expanduser(_DEFAULT_CACHE_DIR))) / sanitize(run_config.agent)
+    version = run_config.agent_version
+    if version is None:
+        empty_dir = agent_dir / _UNVERSIONED_DIR
+        empty_dir.mkdir(parents=True, exist_ok=True)
+        yield empty_dir
+        return
+
+    version_dir = agent_dir / sanitize(version)
+    lock_path = _lock_path(version_dir)
+    agent_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with portalocker.Lock(str(lock_path), mode="a+", timeout=_LOCK_TIMEOUT_SECONDS):
+            version_dir.mkdir(parents=True, exist_ok=True)
+            if not run_config.global_cfg.offline:
+                for download in _platform_downloads(run_config):
+                    _ensure_download(download, version, version_dir)
+            _prune_other_versions(agent_dir, version_dir)
+    except portalocker.exceptions.LockException as exc:
+        get_logger().warning("Artifact cache for %s %s is locked: %s", run_config.agent, version, exc)
+
+    lock = portalocker.Lock(str(lock_path), mode="a+", timeout=_LOCK_TIMEOUT_SECONDS, flags=_SHARED_LOCK)
+    try:
+        lock.acquire()
+    except portalocker.exceptions.LockException as exc:
+        get_logger().warning("Artifact cache for %s %s is locked: %s", run_config.agent, version, exc)
+    try:
+        # A build of another version may have pruned this directory between the two locks.
+        version_dir.mkdir(parents=True, exist_ok=True)
+        yield version_dir
+    finally:
+        lock.release()
+
+
+def _platform_downloads(run_config: RunConfig) -> list[AgentDownload]:
+    downloads = _agent_downloads(run_config)
+    if all(download.platform is None for download in downloads):
+        return downloads
+    platform = host_platform()
+    current = f"{platform.os}/{platform.architecture}"
+    return [download for download in downloads if download.platform in (None, current)]
+
+
+def _agent_downloads(run_config: RunConfig) -> list[AgentDownload]:
+    agent_metadata = run_config.images_metadata.agents[run_config.agent]
+    if agent_metadata.downloads or agent_metadata.local_definition_dir is None:
+        return agent_metadata.downloads
+    # The release metadata does not carry the builtin agents' downloads; their packaged agent.yaml does. It is
+    # only parsed here, when a build runs, so launches keep loading the compiled metadata alone.
+    return definition_downloads(agent_metadata.local_definition_dir)
+
+
+def _prune_other_versions(agent_dir: Path, version_dir: Path) -> None:
+    # Runs under this version's exclusive lock; other versions are removed only while nothing holds theirs.
+    for stale in agent_dir.iterdir():
+        if not stale.is_dir() or stale in (version_dir, agent_dir / _UNVERSIONED_DIR):
+            continue
+        try:
+            with portalocker.Lock(str(_lock_path(stale)), mode="a+", timeout=0, fail_when_locked=True):
+                shutil.rmtree(stale, ignore_errors=True)
+        except portalocker.exceptions.LockException:
+            continue
+        _lock_path(stale).unlink(missing_ok=True)
+
+
+def _lock_path(version_dir: Path) -> Path:
+    return version_dir.with_name(f"{version_dir.name}.lock")
+
+
+def _ensure_download(download: AgentDownload, version: str, version_dir: Path) -> None:
+    path = version_dir / download.name
+    if path.is_file():
+        return
+    url = download.url.replace(_VERSION_PLACEHOLDER, version)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with span("GET", HTTP, url=url) as attrs, tmp_path.open("wb") as handle:
+            response = _DOWNLOAD_CLIENT.request("GET", url, sink=handle)
+            attrs["status"] = response.status
+        if response.status != HTTPStatus.OK:
+            raise OSError(f"HTTP {response.status}")
+        os.replace(tmp_path, path)
+    except (OSError, http.client.HTTPException) as exc:
+        # The installer still works without the cached file; it downloads the payload itself.
+        tmp_path.unlink(missing_ok=True)
+        get_logger().warning("Failed to download %s for the artifact cache: %s", url, exc)
+        return
+    get_logger().info("Cached %s (%d bytes) from %s", path, path.stat().st_size, url)
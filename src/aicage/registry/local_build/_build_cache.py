@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+from aicage._format import format_size
+from aicage._logging import get_logger
+
+_DEFAULT_CACHE_DIR = "~/.aicage/state/build-cache"
+_INDEX_NAME = "index.json"
+_BLOBS_DIR = "blobs"
+_DESCRIPTOR_KEYS = ("manifests", "layers", "config")
+# Caps the exported caches of all agent/base pairs together; least recently exported pairs are evicted first.
+_MAX_TOTAL_BYTES = 4 * 1024 * 1024 * 1024
+# An export writes its blobs before it replaces index.json: files this recent may belong to a running build.
+_GRACE_SECONDS = 60 * 60
+
+
+def build_cache_dir(agent: str, base: str, base_dir: Path | None = None) -> Path:
+    root = base_dir or Path(os.path.expanduser(_DEFAULT_CACHE_DIR))
+    return root / f"{agent}-{base}"
+
+
+def prune_build_cache(cache_dir: Path) -> None:
+    """
+    Keeps `build_cache: local` from growing without bound. Every `mode=max` export adds blobs to the cache
+    directory and only replaces its index, so blobs the index no longer references are removed. Then the
+    caches of other agent/base pairs are evicted, least recently exported first, until all fit the size cap.
+    """
+    _remove_unreferenced_blobs(cache_dir)
+    _evict_least_recent(cache_dir)
+
+
+def _remove_unreferenced_blobs(cache_dir: Path) -> None:
+    referenced = _referenced_digests(cache_dir)
+    if referenced is None:
+        return
+    removed = 0
+    cutoff = time.time() - _GRACE_SECONDS
+    for blob in (cache_dir / _BLOBS_DIR).glob("*/*"):
+        digest = f"{blob.parent.name}:{blob.name}"
+        try:
+            stat = blob.stat()
+            if digest in referenced or stat.st_mtime > cutoff:
+                continue
+            blob.unlink()
+        except OSError:
+            continue
+        removed += stat.st_size
+    if removed:
+        get_logger().info("Removed %s of unreferenced blobs from build cache %s", format_size(removed), cache_dir)
+
+
+def _referenced_digests(cache_dir: Path) -> set[str] | None:
+    index = _read_json(cache_dir / _INDEX_NAME)
+    if index is None:
+        # Without an index nothing is known to be unreferenced.
+        return None
+    referenced: set[str] = set()
+    pending = [index]
+    while pending:
+        document = pending.pop()
+        for descriptor in _descriptors(document):
+            digest = descriptor["digest"]
+            if digest in referenced:
+                continue
+            referenced.add(digest)
+            if str(descriptor.get("mediaType", "")).endswith("json"):
+                algorithm, _, encoded = digest.partition(":")
+                child = _read_json(cache_dir / _BLOBS_DIR / algorithm / encoded)
+                if child is not None:
+                    pending.append(child)
+    return referenced
+
+
+def _descriptors(document: dict[str, Any]) -> list[dict[str, Any]]:
+    descriptors: list[dict[str, Any]] = []
+    for key in _DESCRIPTOR_KEYS:
+        value = document.get(key)
+        entries = value if isinstance(value, list) else [value]
+        descriptors.extend(
+            entry for entry in entries if isinstance(entry, dict) and isinstance(entry.get("digest"), str)
+        )
+    return descriptors
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def _evict_least_recent(current: Path) -> None:
+    caches = [(_last_export(path), _directory_size(path), path) for path in current.parent.iterdir() if path.is_dir()]
+    total = sum(size for _, size, _ in caches)
+    cutoff = time.time() - _GRACE_SECONDS
+    for exported_at, size, path in sorted(caches, key=lambda cache: cache[0]):
+        if total <= _MAX_TOTAL_BYTES:
+            return
+        if path == current or exported_at > cutoff:
+            continue
+        get_logger().info("Evicting build cache %s (%s) to stay under the size cap", path, format_size(size))
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def _last_export(path: Path) -> float:
+    index = path / _INDEX_NAME
+    try:
+        return index.stat().st_mtime if index.exists() else path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _directory_size(path: Path) -> int:
+    size = 0
+    for file in path.rglob("*"):
+        try:
+            if file.is_file():
+                size += file.stat().st_size
+        except OSError:
+            continue
+    return size
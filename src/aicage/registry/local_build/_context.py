@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tarfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from aicage.config.resources import find_packaged_path
+from aicage.config.runtime_config import RunConfig
+
+from ._store import sanitize
+
+_DEFAULT_CACHE_DIR = "~/.aicage/cache/build-context"
+DOCKERFILE_NAME: str = "Dockerfile"
+
+
+@dataclass(frozen=True)
+class BuildContext:
+    path: Path
+    size_bytes: int
+    reused: bool
+
+
+def context_files(run_config: RunConfig) -> list[tuple[str, Path]]:
+    """
+    Lists the files a local build needs as (path in the context, path on disk): the packaged Dockerfile and
+    the agent's definition directory under `agents/<agent>/`, which the Dockerfile bind-mounts.
+    """
+    files = [(DOCKERFILE_NAME, find_packaged_path("agent-build/Dockerfile"))]
+    definition_dir = run_config.images_metadata.agents[run_config.agent].local_definition_dir
+    if definition_dir is not None and definition_dir.is_dir():
+        files.extend(
+            (f"agents/{run_config.agent}/{path.relative_to(definition_dir).as_posix()}", path)
+            for path in sorted(definition_dir.rglob("*"))
+            if path.is_file()
+        )
+    return files
+
+
+def file_entry(name: str, path: Path) -> bytes:
+    # The executable bit matters: install.sh is run directly.
+    header = f"file\0{name}\0{os.access(path, os.X_OK)}\0".encode()
+    return header + path.read_bytes() + b"\0"
+
+
+def build_context(run_config: RunConfig, base_dir: Path | None = None) -> BuildContext:
+    """
+    Returns a tarball with only the files of `context_files`, cached by content hash per agent. An unchanged
+    agent definition reuses the tarball of the previous build; older tarballs of the agent are removed.
+    """
+    files = context_files(run_config)
+    digest = hashlib.sha256()
+    for name, path in files:
+        digest.update(file_entry(name, path))
+    agent_dir = (base_dir or Path(os.path.expanduser(_DEFAULT_CACHE_DIR))) / sanitize(run_config.agent)
+    path = agent_dir / f"{digest.hexdigest()}.tar"
+    if path.is_file():
+        return BuildContext(path=path, size_bytes=path.stat().st_size, reused=True)
+
+    agent_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    with tarfile.open(tmp_path, "w") as archive:
+        for name, source in files:
+            data = source.read_bytes()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            # Fixed metadata keeps the tarball identical for identical content.
+            info.mode = 0o755 if os.access(source, os.X_OK) else 0o644
+            archive.addfile(info, io.BytesIO(data))
+    os.replace(tmp_path, path)
+    for stale in agent_dir.glob("*.tar"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return BuildContext(path=path, size_bytes=path.stat().st_size, reused=False)
@@ -3,33 +3,54 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from aicage._logging import get_logger
+from aicage._tracing import traced
 from aicage.errors import CliError
 from aicage.registry import _local_query, _remote_query
 from aicage.registry._logs import pull_log_path
+from aicage.registry._mirrors import mirror_image_refs
+from aicage.registry._network_budget import log_skipped_freshness_check
+from aicage.registry._pull_decision import is_local_image_current
 from aicage.registry._pull_runner import run_pull
 
 if TYPE_CHECKING:
     from aicage.config.global_config import GlobalConfig
 
 
+@traced("refresh_base_digest")
 def refresh_base_digest(
     base_image_ref: str,
     base_repository: str,
     global_cfg: GlobalConfig,
+    refresh: bool = False,
+    pull: bool = True,
 ) -> str | None:
+    """
+    Returns the digest of the current base image, pulling it first when the local copy is outdated. Without
+    `pull`, only the digests are compared and an outdated base yields the remote digest it would be pulled at.
+    """
     logger = get_logger()
-    local_digest = _local_query.get_local_repo_digest_for_repo(base_image_ref, base_repository)
-    remote_digest = _remote_query.get_remote_repo_digest_for_repo(
+    local_digest = _local_query.get_local_repo_digest_for_repo(
+        base_image_ref,
+        base_repository,
+        mirror_registries=[mirror.registry for mirror in global_cfg.registry_mirrors],
+    )
+    remote = _remote_query.get_remote_digest(
         base_image_ref,
         global_cfg.image_base_repository,
         global_cfg,
+        refresh=refresh,
     )
-    if remote_digest is None or remote_digest == local_digest:
+    if remote is None:
+        log_skipped_freshness_check(base_image_ref)
+        return local_digest
+    if is_local_image_current(base_image_ref, local_digest, remote):
         return local_digest
+    if not pull:
+        return remote.digest
 
     log_path = pull_log_path(base_image_ref)
     try:
-        run_pull(base_image_ref, log_path)
+        run_pull(base_image_ref, log_path, mirror_refs=mirror_image_refs(base_image_ref, remote.digest, global_cfg))
     except CliError:
         if local_digest:
             logger.warning(
@@ -38,4 +59,8 @@ def refresh_base_digest(
             return local_digest
         raise
 
-    return _local_query.get_local_repo_digest_for_repo(base_image_ref, base_repository)
+    return _local_query.get_local_repo_digest_for_repo(
+        base_image_ref,
+        base_repository,
+        mirror_registries=[mirror.registry for mirror in global_cfg.registry_mirrors],
+    )
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+
+from aicage.config.runtime_config import RunConfig
+
+from ._context import context_files, file_entry
+
+FINGERPRINT_LABEL: str = "org.aicage.build.fingerprint"
+
+
+def build_args(run_config: RunConfig, base_image_ref: str) -> dict[str, str]:
+    return {
+        "BASE_IMAGE": base_image_ref,
+        "AGENT": run_config.agent,
+        # Part of the install step's cache key, so a new agent version reinstalls the agent.
+        "AGENT_VERSION": run_config.agent_version or "",
+    }
+
+
+def build_fingerprint(run_config: RunConfig, base_image_ref: str) -> str:
+    """
+    Hashes every input of a local build: the Dockerfile, the agent definition directory and the build args.
+    """
+    digest = hashlib.sha256()
+    for name, path in context_files(run_config):
+        digest.update(file_entry(name, path))
+    for name, value in sorted(build_args(run_config, base_image_ref).items()):
+        digest.update(f"arg\0{name}\0{value}\0".encode())
+    return f"sha256:{digest.hexdigest()}"
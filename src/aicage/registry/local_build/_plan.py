@@ -3,8 +3,9 @@ from __future__ import annotations
 from datetime import datetime, timezone
 
 from aicage.config.runtime_config import RunConfig
+from aicage.registry import _local_query
 
-from ._runner import local_image_exists
+from ._fingerprint import FINGERPRINT_LABEL
 from ._store import BuildRecord
 
 
@@ -12,8 +13,12 @@ def should_build(
     run_config: RunConfig,
     record: BuildRecord | None,
     base_digest: str | None,
+    fingerprint: str,
 ) -> bool:
-    if not local_image_exists(run_config.image_ref):
+    labels = _local_query.get_local_image_labels(run_config.image_ref)
+    # A missing image, or one built from another Dockerfile, agent definition or build args (or before labels
+    # existed), is rebuilt.
+    if labels is None or labels.get(FINGERPRINT_LABEL) != fingerprint:
         return True
     if record is None:
         return True
@@ -1,66 +1,132 @@
 from __future__ import annotations
 
+import re
+import shutil
 import subprocess
+import time
 from pathlib import Path
 
+from aicage._format import format_size
 from aicage._logging import get_logger
-from aicage.config.resources import find_packaged_path
+from aicage._tracing import SUBPROCESS, span, traced
+from aicage.config.global_config import BUILD_CACHE_LOCAL
 from aicage.config.runtime_config import RunConfig
 from aicage.errors import CliError
 
+from ._artifacts import ARTIFACTS_CONTEXT, agent_artifacts
+from ._build_cache import build_cache_dir, prune_build_cache
+from ._context import DOCKERFILE_NAME, BuildContext, build_context
+from ._fingerprint import FINGERPRINT_LABEL, build_args
 
+# `--progress=plain` prints `#5 [runtime 2/3] RUN ...` for each Dockerfile step and `#5 CACHED` on a cache hit.
+_STEP_PATTERN = re.compile(r"^#(\d+) \[[^\]]* \d+/\d+\] ", re.MULTILINE)
+_CACHED_PATTERN = re.compile(r"^#(\d+) CACHED$", re.MULTILINE)
+
+
+@traced("run_build")
 def run_build(
     run_config: RunConfig,
     base_image_ref: str,
     log_path: Path,
+    fingerprint: str,
 ) -> None:
     logger = get_logger()
     log_path.parent.mkdir(parents=True, exist_ok=True)
     print(f"[aicage] Building local image {run_config.image_ref} (logs: {log_path})...")
     logger.info("Building local image %s (logs: %s)", run_config.image_ref, log_path)
 
-    dockerfile_path = find_packaged_path("agent-build/Dockerfile")
-    build_root = _build_context_dir(run_config, dockerfile_path)
-    command = [
-        "docker",
-        "build",
-        "--no-cache",
-        "--file",
-        str(dockerfile_path),
-        "--build-arg",
-        f"BASE_IMAGE={base_image_ref}",
-        "--build-arg",
-        f"AGENT={run_config.agent}",
-        "--tag",
-        run_config.image_ref,
-        str(build_root),
-    ]
-    with log_path.open("w", encoding="utf-8") as log_handle:
-        result = subprocess.run(command, check=False, stdout=log_handle, stderr=subprocess.STDOUT)
-    if result.returncode != 0:
+    context = build_context(run_config)
+    # The artifacts directory stays locked for the whole build, which bind-mounts it.
+    with agent_artifacts(run_config) as artifacts_dir:
+        command = _build_command(run_config, base_image_ref, fingerprint, artifacts_dir)
+        with (
+            log_path.open("w", encoding="utf-8") as log_handle,
+            span("docker build", SUBPROCESS, argv=command) as attrs,
+        ):
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=log_handle, stderr=subprocess.STDOUT)
+            upload_seconds = _send_context(process, context)
+            returncode = process.wait()
+            attrs["returncode"] = returncode
+            attrs["context_bytes"] = context.size_bytes
+    context_summary = _context_summary(context, upload_seconds)
+    logger.info("Build context for %s: %s", run_config.image_ref, context_summary)
+    if returncode != 0:
         logger.error("Local image build failed for %s (logs: %s)", run_config.image_ref, log_path)
         raise CliError(
             f"Local image build failed for {run_config.image_ref}. See log at {log_path}."
         )
 
-    logger.info("Local image build succeeded for %s", run_config.image_ref)
+    if run_config.global_cfg.build_cache == BUILD_CACHE_LOCAL:
+        prune_build_cache(build_cache_dir(run_config.agent, run_config.base))
+    summary = _cache_summary(log_path)
+    with log_path.open("a", encoding="utf-8") as log_handle:
+        log_handle.write(f"[aicage] {context_summary}\n[aicage] {summary}\n")
+    logger.info("Local image build succeeded for %s (%s)", run_config.image_ref, summary)
+
+
+def _build_command(
+    run_config: RunConfig,
+    base_image_ref: str,
+    fingerprint: str,
+    artifacts_dir: Path,
+) -> list[str]:
+    command = ["docker", "build"]
+    if run_config.global_cfg.build_cache == BUILD_CACHE_LOCAL:
+        # Cache export needs buildx; `--load` puts the result into the daemon like `docker build` does.
+        cache_dir = build_cache_dir(run_config.agent, run_config.base)
+        command = ["docker", "buildx", "build", "--load"]
+        if (cache_dir / "index.json").is_file():
+            command.extend(["--cache-from", f"type=local,src={cache_dir}"])
+        command.extend(["--cache-to", f"type=local,dest={cache_dir},mode=max"])
+    return [
+        *command,
+        "--progress=plain",
+        "--file",
+        DOCKERFILE_NAME,
+        *(
+            item
+            for name, value in build_args(run_config, base_image_ref).items()
+            for item in ("--build-arg", f"{name}={value}")
+        ),
+        # Cached downloads are bind-mounted by the install step instead of being part of the context tarball.
+        "--build-context",
+        f"{ARTIFACTS_CONTEXT}={artifacts_dir}",
+        "--label",
+        f"{FINGERPRINT_LABEL}={fingerprint}",
+        "--tag",
+        run_config.image_ref,
+        # The context is the tarball on stdin.
+        "-",
+    ]
+
+
+def _cache_summary(log_path: Path) -> str:
+    try:
+        output = log_path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return "build cache: unknown"
+    steps = set(_STEP_PATTERN.findall(output))
+    cached = steps & set(_CACHED_PATTERN.findall(output))
+    if not steps:
+        return "build cache: unknown"
+    return f"build cache: {len(cached)}/{len(steps)} steps cached ({100 * len(cached) // len(steps)}%)"
 
 
-def local_image_exists(image_ref: str) -> bool:
-    result = subprocess.run(
-        ["docker", "image", "inspect", image_ref],
-        check=False,
-        capture_output=True,
-        text=True,
-    )
-    return result.returncode == 0
+def _send_context(process: subprocess.Popen[bytes], context: BuildContext) -> float:
+    # docker reads the whole context before the build starts, so the write time is the upload time.
+    start = time.perf_counter()
+    stdin = process.stdin
+    if stdin is None:
+        return 0.0
+    try:
+        with context.path.open("rb") as handle, stdin:
+            shutil.copyfileobj(handle, stdin)
+    except OSError:
+        # docker exited early; its exit code and log explain why.
+        pass
+    return time.perf_counter() - start
 
 
-def _build_context_dir(run_config: RunConfig, dockerfile_path: Path) -> Path:
-    agent_metadata = run_config.images_metadata.agents[run_config.agent]
-    local_definition_dir = agent_metadata.local_definition_dir
-    if local_definition_dir is None:
-        return dockerfile_path.parent
-    if local_definition_dir.is_relative_to(dockerfile_path.parent):
-        return dockerfile_path.parent
-    return local_definition_dir.parent.parent
+def _context_summary(context: BuildContext, upload_seconds: float) -> str:
+    source = "cached" if context.reused else "new"
+    return f"build context: {format_size(context.size_bytes)} ({source}), uploaded in {upload_seconds:.2f}s"
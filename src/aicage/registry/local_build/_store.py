@@ -6,6 +6,8 @@ from pathlib import Path
 
 import yaml
 
+from aicage._state_files import write_text_atomic
+
 _DEFAULT_STATE_DIR = "~/.aicage/state/local-build"
 _AGENT_KEY: str = "agent"
 _BASE_KEY: str = "base"
@@ -14,6 +16,7 @@ _BASE_IMAGE_KEY: str = "base_image"
 _BASE_DIGEST_KEY: str = "base_digest"
 _IMAGE_REF_KEY: str = "image_ref"
 _BUILT_AT_KEY: str = "built_at"
+_FINGERPRINT_KEY: str = "fingerprint"
 
 
 @dataclass(frozen=True)
@@ -25,6 +28,7 @@ class BuildRecord:
     base_digest: str | None
     image_ref: str
     built_at: str
+    fingerprint: str | None = None
 
 
 class BuildStore:
@@ -39,6 +43,7 @@ class BuildStore:
         if not isinstance(payload, dict):
             return None
         base_digest = payload.get(_BASE_DIGEST_KEY)
+        fingerprint = payload.get(_FINGERPRINT_KEY)
         return BuildRecord(
             agent=str(payload.get(_AGENT_KEY, "")),
             base=str(payload.get(_BASE_KEY, "")),
@@ -47,10 +52,10 @@ class BuildStore:
             base_digest=str(base_digest) if base_digest is not None else None,
             image_ref=str(payload.get(_IMAGE_REF_KEY, "")),
             built_at=str(payload.get(_BUILT_AT_KEY, "")),
+            fingerprint=str(fingerprint) if fingerprint is not None else None,
         )
 
     def save(self, record: BuildRecord) -> Path:
-        self._base_dir.mkdir(parents=True, exist_ok=True)
         path = self._path(record.agent, record.base)
         payload = {
             _AGENT_KEY: record.agent,
@@ -60,8 +65,10 @@ class BuildStore:
             _BASE_DIGEST_KEY: record.base_digest,
             _IMAGE_REF_KEY: record.image_ref,
             _BUILT_AT_KEY: record.built_at,
+            _FINGERPRINT_KEY: record.fingerprint,
         }
-        path.write_text(yaml.safe_dump(payload, sort_keys=True), encoding="utf-8")
+        # Parallel `aicage build` jobs and launches read records while others are written.
+        write_text_atomic(path, yaml.safe_dump(payload, sort_keys=True))
         return path
 
     def _path(self, agent: str, base: str) -> Path:
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Collection, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import partial
+from pathlib import Path
+
+from aicage._logging import get_logger
+from aicage.config.errors import ConfigError
+from aicage.config.global_config import GlobalConfig
+from aicage.config.runtime_config import RunConfig, with_agent_version
+from aicage.errors import CliError
+from aicage.registry._image_refs import local_image_ref
+from aicage.registry.images_metadata.models import ImagesMetadata
+
+from ._digest import refresh_base_digest
+from ._fingerprint import build_fingerprint
+from ._plan import base_image_ref, base_repository, should_build
+from ._store import BuildStore
+from .ensure_local_image import build_local_image
+
+BUILD_BUILT: str = "built"
+BUILD_CURRENT: str = "current"
+BUILD_FAILED: str = "failed"
+_STATUSES: tuple[str, ...] = (BUILD_BUILT, BUILD_CURRENT, BUILD_FAILED)
+
+
+@dataclass(frozen=True)
+class BuildTarget:
+    run_config: RunConfig
+    base_image: str
+    fingerprint: str = ""
+    needs_build: bool = True
+    error: str = ""
+
+
+@dataclass(frozen=True)
+class BuildResult:
+    agent: str
+    base: str
+    image_ref: str
+    status: str
+    elapsed_seconds: float = 0.0
+    message: str = ""
+
+
+@dataclass(frozen=True)
+class _StepFailed:
+    # Returned instead of raised, so a failed version check or base pull only marks the affected targets.
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def default_build_jobs() -> int:
+    # Each build keeps the daemon busy with package installs; half the CPUs leaves room for the rest.
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def matrix_run_configs(
+    images_metadata: ImagesMetadata,
+    global_cfg: GlobalConfig,
+    agents: Collection[str] = (),
+    bases: Collection[str] = (),
+    refresh: bool = False,
+) -> list[RunConfig]:
+    """
+    Returns one run config per locally built agent and valid base, optionally restricted to `agents` and `bases`.
+    Agent versions are resolved later by `plan_builds`.
+    """
+    return [
+        RunConfig(
+            project_path=Path.cwd(),
+            agent=agent,
+            base=base,
+            image_ref=local_image_ref(global_cfg.local_image_repository, agent, base),
+            agent_version=None,
+            global_cfg=global_cfg,
+            images_metadata=images_metadata,
+            project_docker_args="",
+            mounts=[],
+            refresh=refresh,
+        )
+        for agent, agent_metadata in images_metadata.agents.items()
+        if agent_metadata.local_definition_dir is not None and (not agents or agent in agents)
+        for base in agent_metadata.valid_bases
+        if not bases or base in bases
+    ]
+
+
+def plan_builds(run_configs: list[RunConfig], jobs: int, pull_bases: bool = True) -> list[BuildTarget]:
+    """
+    Resolves each agent's version once and refreshes each distinct base image once, then decides per image
+    whether it needs a build. Failed version checks or base pulls mark only the affected targets. Without
+    `pull_bases`, outdated base images are only detected, not pulled.
+    """
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="aicage-build-plan") as executor:
+        first_by_agent = {run_config.agent: run_config for run_config in run_configs}
+        versions = dict(
+            zip(first_by_agent, executor.map(_resolve_version, first_by_agent.values()), strict=True)
+        )
+        first_by_base = {base_image_ref(run_config): run_config for run_config in run_configs}
+        base_digests = dict(
+            zip(
+                first_by_base,
+                executor.map(partial(_refresh_base, pull=pull_bases), first_by_base.values()),
+                strict=True,
+            )
+        )
+
+    store = BuildStore()
+    targets: list[BuildTarget] = []
+    for run_config in run_configs:
+        base_image = base_image_ref(run_config)
+        version = versions[run_config.agent]
+        base_digest = base_digests[base_image]
+        if isinstance(version, _StepFailed) or isinstance(base_digest, _StepFailed):
+            failure = version if isinstance(version, _StepFailed) else base_digest
+            targets.append(BuildTarget(run_config=run_config, base_image=base_image, error=str(failure)))
+            continue
+        versioned = replace(run_config, agent_version=version)
+        fingerprint = build_fingerprint(versioned, base_image)
+        record = store.load(versioned.agent, versioned.base)
+        targets.append(
+            BuildTarget(
+                run_config=versioned,
+                base_image=base_image,
+                fingerprint=fingerprint,
+                needs_build=should_build(versioned, record, base_digest, fingerprint),
+            )
+        )
+    return targets
+
+
+def run_builds(targets: Iterable[BuildTarget], jobs: int) -> list[BuildResult]:
+    """
+    Builds the targets that need it with at most `jobs` concurrent builds; a failed build does not stop the others.
+    """
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="aicage-build") as executor:
+        return list(executor.map(_build_target, targets))
+
+
+def format_results(results: list[BuildResult]) -> str:
+    rows = [("AGENT", "BASE", "STATUS", "TIME", "DETAIL")]
+    for result in results:
+        elapsed = f"{result.elapsed_seconds:.1f}s" if result.status == BUILD_BUILT else "-"
+        rows.append((result.agent, result.base, result.status, elapsed, result.message))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)).rstrip() for row in rows]
+    counts = {status: sum(1 for result in results if result.status == status) for status in _STATUSES}
+    lines.append(
+        f"{counts[BUILD_BUILT]} built, {counts[BUILD_CURRENT]} up to date, {counts[BUILD_FAILED]} failed."
+    )
+    return "\n".join(lines)
+
+
+def _build_target(target: BuildTarget) -> BuildResult:
+    run_config = target.run_config
+    if target.error:
+        return _result(run_config, BUILD_FAILED, message=target.error)
+    if not target.needs_build:
+        return _result(run_config, BUILD_CURRENT)
+    start = time.perf_counter()
+    try:
+        build_local_image(run_config, target.base_image, target.fingerprint, BuildStore())
+    except CliError as exc:
+        get_logger().warning("Build of %s failed: %s", run_config.image_ref, exc)
+        return _result(run_config, BUILD_FAILED, time.perf_counter() - start, str(exc))
+    return _result(run_config, BUILD_BUILT, time.perf_counter() - start)
+
+
+def _result(run_config: RunConfig, status: str, elapsed_seconds: float = 0.0, message: str = "") -> BuildResult:
+    return BuildResult(
+        agent=run_config.agent,
+        base=run_config.base,
+        image_ref=run_config.image_ref,
+        status=status,
+        elapsed_seconds=elapsed_seconds,
+        message=message,
+    )
+
+
+def _resolve_version(run_config: RunConfig) -> str | None | _StepFailed:
+    try:
+        return with_agent_version(run_config).agent_version
+    except (CliError, ConfigError) as exc:
+        return _StepFailed(str(exc))
+
+
+def _refresh_base(run_config: RunConfig, pull: bool) -> str | None | _StepFailed:
+    try:
+        return refresh_base_digest(
+            base_image_ref=base_image_ref(run_config),
+            base_repository=base_repository(run_config),
+            global_cfg=run_config.global_cfg,
+            refresh=run_config.refresh,
+            pull=pull,
+        )
+    except CliError as exc:
+        return _StepFailed(str(exc))
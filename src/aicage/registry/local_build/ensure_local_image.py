@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from aicage._tracing import traced
 from aicage.config.runtime_config import RunConfig
 from aicage.errors import CliError
 from aicage.registry import _local_query
 
 from ._digest import refresh_base_digest
+from ._fingerprint import build_fingerprint
 from ._logs import build_log_path
 from ._plan import base_image_ref, base_repository, now_iso, should_build
 from ._runner import run_build
 from ._store import BuildRecord, BuildStore
 
 
+@traced("ensure_local_image")
 def ensure_local_image(run_config: RunConfig) -> None:
     agent_metadata = run_config.images_metadata.agents[run_config.agent]
     if agent_metadata.local_definition_dir is None:
@@ -25,35 +28,56 @@ def ensure_local_image(run_config: RunConfig) -> None:
         base_image_ref=base_image,
         base_repository=base_repo,
         global_cfg=run_config.global_cfg,
+        refresh=run_config.refresh,
     )
 
     store = BuildStore()
     record = store.load(run_config.agent, run_config.base)
+    fingerprint = build_fingerprint(run_config, base_image)
 
     needs_build = should_build(
         run_config=run_config,
         record=record,
         base_digest=base_digest,
+        fingerprint=fingerprint,
     )
     if not needs_build:
         return
 
+    build_local_image(run_config, base_image, fingerprint, store)
+
+
+def build_local_image(
+    run_config: RunConfig,
+    base_image: str,
+    fingerprint: str,
+    store: BuildStore,
+) -> None:
+    """
+    Builds the local image of `run_config` on `base_image` and records the build.
+    """
     log_path = build_log_path(run_config.agent, run_config.base)
     run_build(
         run_config=run_config,
         base_image_ref=base_image,
         log_path=log_path,
+        fingerprint=fingerprint,
     )
 
-    updated_base_digest = _local_query.get_local_repo_digest_for_repo(base_image, base_repo)
+    updated_base_digest = _local_query.get_local_repo_digest_for_repo(
+        base_image,
+        base_repository(run_config),
+        mirror_registries=[mirror.registry for mirror in run_config.global_cfg.registry_mirrors],
+    )
     store.save(
         BuildRecord(
             agent=run_config.agent,
             base=run_config.base,
-            agent_version=run_config.agent_version,
+            agent_version=run_config.agent_version or "",
             base_image=base_image,
             base_digest=updated_base_digest,
             image_ref=run_config.image_ref,
             built_at=now_iso(),
+            fingerprint=fingerprint,
         )
     )
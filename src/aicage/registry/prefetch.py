@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Collection, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from aicage._logging import get_logger
+from aicage.config.config_store import SettingsStore
+from aicage.config.global_config import GlobalConfig, RegistryMirror
+from aicage.config.project_config import AGENT_BASE_KEY
+from aicage.errors import CliError
+from aicage.registry import _local_query, _remote_query
+from aicage.registry._logs import pull_log_path
+from aicage.registry._mirrors import mirror_image_refs, ranked_mirrors
+from aicage.registry._pull_runner import run_pull
+from aicage.registry.images_metadata.models import ImagesMetadata
+
+PREFETCH_PULLED: str = "pulled"
+PREFETCH_CURRENT: str = "current"
+PREFETCH_FAILED: str = "failed"
+
+
+@dataclass(frozen=True)
+class PrefetchTarget:
+    image_ref: str
+    base: str
+
+
+@dataclass(frozen=True)
+class PrefetchResult:
+    image_ref: str
+    status: str
+    downloaded_bytes: int = 0
+    message: str = ""
+
+
+@dataclass(frozen=True)
+class PrefetchSummary:
+    results: list[PrefetchResult]
+    elapsed_seconds: float
+
+    def count(self, status: str) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def pulled_bytes(self) -> int:
+        return sum(result.downloaded_bytes for result in self.results if result.status == PREFETCH_PULLED)
+
+
+def matrix_targets(
+    images_metadata: ImagesMetadata,
+    global_cfg: GlobalConfig,
+    agents: Collection[str] = (),
+    bases: Collection[str] = (),
+) -> list[PrefetchTarget]:
+    """
+    Expands every agent's valid bases into images, optionally restricted to `agents` and `bases`.
+    Locally built agents contribute their base image instead of a prebuilt agent image.
+    """
+    pairs = [
+        (agent, base)
+        for agent, agent_metadata in images_metadata.agents.items()
+        if not agents or agent in agents
+        for base in agent_metadata.valid_bases
+        if not bases or base in bases
+    ]
+    return _targets(pairs, images_metadata, global_cfg)
+
+
+def project_targets(
+    store: SettingsStore,
+    images_metadata: ImagesMetadata,
+    global_cfg: GlobalConfig,
+    agents: Collection[str] = (),
+    bases: Collection[str] = (),
+) -> list[PrefetchTarget]:
+    """
+    Returns the images of the agent/base combinations stored in project configs and global agent defaults.
+    """
+    pairs: list[tuple[str, str]] = []
+    for project_cfg in store.load_all_projects():
+        pairs.extend((agent, agent_cfg.base) for agent, agent_cfg in project_cfg.agents.items() if agent_cfg.base)
+    for agent, agent_cfg in global_cfg.agents.items():
+        base = agent_cfg.get(AGENT_BASE_KEY)
+        if isinstance(base, str):
+            pairs.append((agent, base))
+    pairs = [
+        (agent, base)
+        for agent, base in pairs
+        if agent in images_metadata.agents
+        and base in images_metadata.agents[agent].valid_bases
+        and (not agents or agent in agents)
+        and (not bases or base in bases)
+    ]
+    return _targets(pairs, images_metadata, global_cfg)
+
+
+def schedule_waves(targets: Iterable[PrefetchTarget], global_cfg: GlobalConfig) -> list[list[PrefetchTarget]]:
+    """
+    Orders pulls so images sharing a base do not download its layers concurrently.
+    The first wave holds one image per base (the base image itself when requested); the second wave holds
+    the remaining images, whose base layers are then already local.
+    """
+    groups: dict[str, list[PrefetchTarget]] = {}
+    for target in targets:
+        groups.setdefault(target.base, []).append(target)
+    first: list[PrefetchTarget] = []
+    rest: list[PrefetchTarget] = []
+    for base, group in groups.items():
+        base_ref = _base_image_ref(global_cfg, base)
+        ordered = sorted(group, key=lambda target: target.image_ref != base_ref)
+        first.append(ordered[0])
+        rest.extend(ordered[1:])
+    return [wave for wave in (first, rest) if wave]
+
+
+def prefetch_images(waves: list[list[PrefetchTarget]], jobs: int, global_cfg: GlobalConfig) -> PrefetchSummary:
+    """
+    Pulls each wave with at most `jobs` concurrent pulls and returns the per-image results.
+    """
+    start = time.perf_counter()
+    results: list[PrefetchResult] = []
+    pull = partial(_pull_target, global_cfg=global_cfg, mirrors=ranked_mirrors(global_cfg))
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="aicage-prefetch") as executor:
+        for wave in waves:
+            results.extend(executor.map(pull, wave))
+    return PrefetchSummary(results=results, elapsed_seconds=time.perf_counter() - start)
+
+
+def format_summary(summary: PrefetchSummary) -> str:
+    elapsed = max(summary.elapsed_seconds, 1e-9)
+    pulled_mib = summary.pulled_bytes / (1024 * 1024)
+    return (
+        f"Prefetched {len(summary.results)} images in {summary.elapsed_seconds:.1f}s: "
+        f"{summary.count(PREFETCH_PULLED)} pulled ({pulled_mib:.1f} MiB, {pulled_mib / elapsed:.1f} MiB/s), "
+        f"{summary.count(PREFETCH_CURRENT)} up to date, {summary.count(PREFETCH_FAILED)} failed."
+    )
+
+
+def _pull_target(target: PrefetchTarget, global_cfg: GlobalConfig, mirrors: list[RegistryMirror]) -> PrefetchResult:
+    before = _local_query.get_local_image_id(target.image_ref)
+    digest = _upstream_digest(target.image_ref, global_cfg, mirrors)
+    mirror_refs = mirror_image_refs(target.image_ref, digest, global_cfg, mirrors)
+    try:
+        downloaded_bytes = run_pull(
+            target.image_ref, pull_log_path(target.image_ref), progress=False, mirror_refs=mirror_refs
+        )
+    except CliError as exc:
+        get_logger().warning("Prefetch of %s failed: %s", target.image_ref, exc)
+        return PrefetchResult(image_ref=target.image_ref, status=PREFETCH_FAILED, message=str(exc))
+    if _local_query.get_local_image_id(target.image_ref) == before:
+        return PrefetchResult(image_ref=target.image_ref, status=PREFETCH_CURRENT)
+    # Bytes actually transferred, so layers that were already local do not inflate the throughput.
+    return PrefetchResult(image_ref=target.image_ref, status=PREFETCH_PULLED, downloaded_bytes=downloaded_bytes)
+
+
+def _upstream_digest(image_ref: str, global_cfg: GlobalConfig, mirrors: list[RegistryMirror]) -> str | None:
+    # Mirrors are only pulled from by digest; without any, the upstream lookup would be wasted.
+    if not mirrors:
+        return None
+    repository = image_ref.partition("/")[2].rsplit(":", 1)[0]
+    return _remote_query.get_remote_repo_digest_for_repo(image_ref, repository, global_cfg)
+
+
+def _targets(
+    pairs: Iterable[tuple[str, str]],
+    images_metadata: ImagesMetadata,
+    global_cfg: GlobalConfig,
+) -> list[PrefetchTarget]:
+    targets: dict[str, PrefetchTarget] = {}
+    for agent, base in pairs:
+        agent_metadata = images_metadata.agents[agent]
+        if agent_metadata.local_definition_dir is None:
+            image_ref = agent_metadata.valid_bases[base]
+        else:
+            image_ref = _base_image_ref(global_cfg, base)
+        targets.setdefault(image_ref, PrefetchTarget(image_ref=image_ref, base=base))
+    return list(targets.values())
+
+
+def _base_image_ref(global_cfg: GlobalConfig, base: str) -> str:
+    return f"{global_cfg.image_registry}/{global_cfg.image_base_repository}:{base}"
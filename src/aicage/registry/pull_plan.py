@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from aicage.config.global_config import GlobalConfig
+from aicage.registry import _local_query
+from aicage.registry._platform import Platform, host_platform, select_platform_manifest
+from aicage.registry._remote_api import RegistryDiscoveryError, fetch_pull_token_for_repository
+from aicage.registry._remote_query import MANIFEST_ACCEPT, get_registry_json, parse_reference
+
+_ESTIMATE_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class PullEstimate:
+    image_ref: str
+    download_bytes: int
+    total_bytes: int
+    layers: int
+    missing_layers: int
+
+
+def estimate_pull(
+    image_ref: str,
+    global_cfg: GlobalConfig,
+    local_layers: Collection[str] | None = None,
+) -> PullEstimate | None:
+    """
+    Estimates the compressed bytes a pull of `image_ref` downloads for the local platform.
+    Layers already present locally (matched by diff id from the image config) are not counted.
+    Returns None when the image is not in the configured registry or the registry cannot be reached.
+    """
+    repository = _repository(image_ref, global_cfg)
+    if repository is None:
+        return None
+    try:
+        token = fetch_pull_token_for_repository(global_cfg, repository)
+    except RegistryDiscoveryError:
+        return None
+    headers = {"Accept": MANIFEST_ACCEPT, "Authorization": f"Bearer {token}"}
+    base_url = f"{global_cfg.image_registry_api_url}/{repository}"
+    manifest = _platform_manifest(f"{base_url}/manifests", parse_reference(image_ref), headers, host_platform())
+    if manifest is None:
+        return None
+
+    layers = [layer for layer in manifest.get("layers", []) if isinstance(layer, dict)]
+    sizes = [layer.get("size") if isinstance(layer.get("size"), int) else 0 for layer in layers]
+    diff_ids = _diff_ids(base_url, manifest, headers)
+    if local_layers is None:
+        local_layers = _local_query.get_local_layer_ids()
+    if diff_ids is None or len(diff_ids) != len(layers):
+        missing = list(range(len(layers)))
+    else:
+        missing = [index for index, diff_id in enumerate(diff_ids) if diff_id not in local_layers]
+    return PullEstimate(
+        image_ref=image_ref,
+        download_bytes=sum(sizes[index] for index in missing),
+        total_bytes=sum(sizes),
+        layers=len(layers),
+        missing_layers=len(missing),
+    )
+
+
+def estimate_pulls(
+    image_refs: Sequence[str],
+    global_cfg: GlobalConfig,
+    timeout: float | None = None,
+) -> dict[str, PullEstimate]:
+    """
+    Estimates several images concurrently; images without an estimate within `timeout` seconds are omitted.
+    """
+    local_layers = _local_query.get_local_layer_ids()
+    executor = ThreadPoolExecutor(max_workers=_ESTIMATE_WORKERS, thread_name_prefix="aicage-estimate")
+    try:
+        futures = {
+            executor.submit(estimate_pull, image_ref, global_cfg, local_layers): image_ref
+            for image_ref in image_refs
+        }
+        done, _ = wait(futures, timeout=timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    estimates: dict[str, PullEstimate] = {}
+    for future in done:
+        estimate = future.result()
+        if estimate is not None:
+            estimates[futures[future]] = estimate
+    return estimates
+
+
+def _platform_manifest(
+    manifests_url: str,
+    reference: str,
+    headers: dict[str, str],
+    platform: Platform,
+) -> dict[str, Any] | None:
+    manifest = get_registry_json(f"{manifests_url}/{reference}", headers)
+    if manifest is None:
+        return None
+    entries = manifest.get("manifests")
+    if not isinstance(entries, list):
+        return manifest
+    digest = select_platform_manifest(entries, platform)
+    if digest is None:
+        return None
+    return get_registry_json(f"{manifests_url}/{digest}", headers)
+
+
+def _diff_ids(base_url: str, manifest: dict[str, Any], headers: dict[str, str]) -> list[str] | None:
+    config = manifest.get("config")
+    digest = config.get("digest") if isinstance(config, dict) else None
+    if not isinstance(digest, str):
+        return None
+    blob_headers = {"Authorization": headers["Authorization"]}
+    image_config = get_registry_json(f"{base_url}/blobs/{digest}", blob_headers)
+    root_fs = image_config.get("rootfs") if image_config is not None else None
+    diff_ids = root_fs.get("diff_ids") if isinstance(root_fs, dict) else None
+    if not isinstance(diff_ids, list):
+        return None
+    return [diff_id for diff_id in diff_ids if isinstance(diff_id, str)]
+
+
+def _repository(image_ref: str, global_cfg: GlobalConfig) -> str | None:
+    prefix = f"{global_cfg.image_registry}/"
+    if not image_ref.startswith(prefix):
+        return None
+    name = image_ref[len(prefix) :].split("@", 1)[0]
+    last_colon = name.rfind(":")
+    if last_colon > name.rfind("/"):
+        name = name[:last_colon]
+    return name
+
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from aicage._tracing import traced
 from aicage.cli_types import ParsedArgs
 from aicage.config.context import ConfigContext
 from aicage.config.project_config import AgentConfig
@@ -14,6 +15,7 @@ from ._gpg import resolve_gpg_mount
 from ._ssh_keys import resolve_ssh_mount
 
 
+@traced("resolve_mounts")
 def resolve_mounts(
     context: ConfigContext,
     agent: str,
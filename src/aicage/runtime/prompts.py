@@ -1,20 +1,47 @@
 import sys
+import threading
+from collections.abc import Callable, Iterator, Mapping
+from contextlib import contextmanager
 from dataclasses import dataclass
 
+from aicage._format import format_size
 from aicage._logging import get_logger
 from aicage.config.context import ConfigContext
 from aicage.errors import CliError
 from aicage.registry.images_metadata.models import AgentMetadata
 
+_PROMPT_STATE = threading.local()
+
+
+class PromptUnavailableError(CliError):
+    """Raised when a prompt is needed while prompting is disabled."""
+
 
 @dataclass(frozen=True)
 class BaseSelectionRequest:
     agent: str
     context: ConfigContext
     agent_metadata: AgentMetadata
+    # Returns the download size per base; called only once a prompt is actually shown.
+    estimate_download_sizes: Callable[[], Mapping[str, int]] | None = None
+
+
+@contextmanager
+def prompts_disabled() -> Iterator[None]:
+    """
+    Makes prompts on the current thread raise PromptUnavailableError instead of reading stdin.
+    """
+    previous = getattr(_PROMPT_STATE, "disabled", False)
+    _PROMPT_STATE.disabled = True
+    try:
+        yield
+    finally:
+        _PROMPT_STATE.disabled = previous
 
 
 def ensure_tty_for_prompt() -> None:
+    if getattr(_PROMPT_STATE, "disabled", False):
+        raise PromptUnavailableError("Interactive input required but prompts are disabled.")
     if not sys.stdin.isatty():
         raise CliError("Interactive input required but stdin is not a TTY.")
 
@@ -38,10 +65,11 @@ def prompt_for_base(request: BaseSelectionRequest) -> str:
     bases = _base_options(request.context, request.agent_metadata)
 
     if bases:
+        download_sizes = request.estimate_download_sizes() if request.estimate_download_sizes else {}
         print(title)
         for idx, option in enumerate(bases, start=1):
             suffix = " (default)" if option.base == request.context.global_cfg.default_image_base else ""
-            print(f"  {idx}) {option.base}: {option.description}{suffix}")
+            print(f"  {idx}) {option.base}: {option.description}{suffix}{_download_note(download_sizes, option.base)}")
         prompt = f"Enter number or name [{request.context.global_cfg.default_image_base}]: "
     else:
         prompt = f"{title} [{request.context.global_cfg.default_image_base}]: "
@@ -80,5 +108,14 @@ def _base_options(context: ConfigContext, agent_metadata: AgentMetadata) -> list
     ]
 
 
+def _download_note(download_sizes: Mapping[str, int], base: str) -> str:
+    size = download_sizes.get(base)
+    if size is None:
+        return ""
+    if size == 0:
+        return " [already downloaded]"
+    return f" [{format_size(size)} to download]"
+
+
 def _available_bases(options: list[_BaseOption]) -> list[str]:
     return [option.base for option in options]
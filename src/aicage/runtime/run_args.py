@@ -32,12 +32,24 @@ class DockerRunArgs:
     mounts: list[MountSpec] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class EngineRunSpec:
+    """
+    The `docker run --rm -it` invocation as Engine API create parameters.
+    """
+
+    image_ref: str
+    command: list[str]
+    env: list[str]
+    binds: list[str]
+
+
 def merge_docker_args(*args: str) -> str:
     return " ".join(part for part in args if part).strip()
 
 
-def _resolve_user_ids() -> list[str]:
-    env_flags: list[str] = []
+def _resolve_user_env() -> list[str]:
+    env: list[str] = []
     try:
         uid = os.getuid()
         gid = os.getgid()
@@ -46,25 +58,59 @@ def _resolve_user_ids() -> list[str]:
 
     user = os.environ.get("USER") or os.environ.get("USERNAME") or "aicage"
     if uid is not None:
-        env_flags.extend(["-e", f"{AICAGE_UID}={uid}", "-e", f"{AICAGE_GID}{'='}{gid}"])
-    env_flags.extend(["-e", f"{AICAGE_USER}={user}"])
+        env.extend([f"{AICAGE_UID}={uid}", f"{AICAGE_GID}={gid}"])
+    env.append(f"{AICAGE_USER}={user}")
+    return env
+
+
+def _resolve_user_ids() -> list[str]:
+    env_flags: list[str] = []
+    for env in _resolve_user_env():
+        env_flags.extend(["-e", env])
     return env_flags
 
 
+def _launch_env(args: DockerRunArgs) -> list[str]:
+    env = [f"{AICAGE_WORKSPACE}={args.project_path}"]
+    if args.agent_path:
+        env.append(f"{AICAGE_AGENT_CONFIG_PATH}={args.agent_path}")
+    env.extend(args.env)
+    return env
+
+
+def _binds(args: DockerRunArgs) -> list[str]:
+    binds = [
+        f"{args.project_path}:/workspace",
+        f"{args.project_path}:{args.project_path}",
+        f"{args.agent_config_host}:{args.agent_config_mount_container}",
+    ]
+    for mount in args.mounts:
+        suffix = ":ro" if mount.read_only else ""
+        binds.append(f"{mount.host_path}:{mount.container_path}{suffix}")
+    return binds
+
+
+def build_engine_spec(args: DockerRunArgs) -> EngineRunSpec | None:
+    """
+    Returns the Engine API equivalent of `assemble_docker_run`, or None when opaque docker args are present.
+    """
+    if args.merged_docker_args:
+        return None
+    return EngineRunSpec(
+        image_ref=args.image_ref,
+        command=list(args.agent_args),
+        env=_resolve_user_env() + _launch_env(args),
+        binds=_binds(args),
+    )
+
+
 def assemble_docker_run(args: DockerRunArgs) -> list[str]:
     cmd: list[str] = ["docker", "run", "--rm", "-it"]
     cmd.extend(_resolve_user_ids())
-    cmd.extend(["-e", f"{AICAGE_WORKSPACE}={args.project_path}"])
-    if args.agent_path:
-        cmd.extend(["-e", f"{AICAGE_AGENT_CONFIG_PATH}={args.agent_path}"])
-    for env in args.env:
+    for env in _launch_env(args):
         cmd.extend(["-e", env])
-    cmd.extend(["-v", f"{args.project_path}:/workspace"])
-    cmd.extend(["-v", f"{args.project_path}:{args.project_path}"])
-    cmd.extend(["-v", f"{args.agent_config_host}:{args.agent_config_mount_container}"])
-    for mount in args.mounts:
-        suffix = ":ro" if mount.read_only else ""
-        cmd.extend(["-v", f"{mount.host_path}:{mount.container_path}{suffix}"])
+    for bind in _binds(args):
+        cmd.extend(["-v", bind])
 
     if args.merged_docker_args:
         cmd.extend(shlex.split(args.merged_docker_args))
@@ -0,0 +1,82 @@
+import io
+from unittest import TestCase, mock
+
+from aicage.cli import _build
+from aicage.errors import CliError
+from aicage.registry.local_build.build_matrix import BUILD_BUILT, BUILD_FAILED, BuildResult, BuildTarget
+
+
+class BuildCommandTests(TestCase):
+    def test_rejects_non_positive_jobs(self) -> None:
+        with self.assertRaises(CliError):
+            _build.run_command(["--jobs", "0"])
+
+    def test_rejects_prebuilt_agent(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"codex": mock.Mock(local_definition_dir=None)}
+        with (
+            mock.patch("aicage.cli._build.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._build.load_images_metadata", return_value=metadata),
+        ):
+            store_mock.return_value.load_global.return_value.offline = False
+            with self.assertRaises(CliError):
+                _build.run_command(["--agent", "codex"])
+
+    def test_prints_summary_and_fails_when_a_build_failed(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"claude": mock.Mock()}
+        results = [
+            BuildResult("claude", "ubuntu", "aicage:claude-ubuntu", BUILD_BUILT, 12.5),
+            BuildResult("claude", "alpine", "aicage:claude-alpine", BUILD_FAILED, 3.0, "build failed"),
+        ]
+        with (
+            mock.patch("aicage.cli._build.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._build.load_images_metadata", return_value=metadata),
+            mock.patch("aicage.cli._build.matrix_run_configs", return_value=[mock.Mock(), mock.Mock()]),
+            mock.patch("aicage.cli._build.plan_builds") as plan_mock,
+            mock.patch("aicage.cli._build.run_builds", return_value=results) as run_mock,
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+        ):
+            store_mock.return_value.load_global.return_value.offline = False
+            exit_code = _build.run_command(["--agent", "claude", "--jobs", "3"])
+
+        self.assertEqual(1, exit_code)
+        self.assertEqual(3, plan_mock.call_args.args[1])
+        run_mock.assert_called_once_with(plan_mock.return_value, 3)
+        output = stdout.getvalue()
+        self.assertIn("claude  ubuntu  built   12.5s", output)
+        self.assertIn("1 built, 0 up to date, 1 failed.", output)
+
+    def test_dry_run_plans_without_pulling_and_reports_errors(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"claude": mock.Mock()}
+        targets = [
+            BuildTarget(run_config=mock.Mock(image_ref="aicage:claude-ubuntu"), base_image="base:ubuntu"),
+            BuildTarget(
+                run_config=mock.Mock(image_ref="aicage:claude-alpine"),
+                base_image="base:alpine",
+                needs_build=False,
+            ),
+            BuildTarget(
+                run_config=mock.Mock(image_ref="aicage:claude-debian"),
+                base_image="base:debian",
+                error="version check failed",
+            ),
+        ]
+        with (
+            mock.patch("aicage.cli._build.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._build.load_images_metadata", return_value=metadata),
+            mock.patch("aicage.cli._build.matrix_run_configs", return_value=[mock.Mock()]),
+            mock.patch("aicage.cli._build.plan_builds", return_value=targets) as plan_mock,
+            mock.patch("aicage.cli._build.run_builds") as run_mock,
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+            mock.patch("sys.stderr", new_callable=io.StringIO) as stderr,
+        ):
+            store_mock.return_value.load_global.return_value.offline = False
+            exit_code = _build.run_command(["--dry-run"])
+
+        self.assertEqual(1, exit_code)
+        self.assertFalse(plan_mock.call_args.kwargs["pull_bases"])
+        run_mock.assert_not_called()
+        self.assertEqual("aicage:claude-ubuntu\n", stdout.getvalue())
+        self.assertIn("aicage:claude-debian: version check failed", stderr.getvalue())
@@ -0,0 +1,85 @@
+import io
+import subprocess
+from unittest import TestCase, mock
+
+from aicage.cli._docker_run import LaunchPlan, run_docker
+from aicage.errors import CliError
+from aicage.runtime.run_args import EngineRunSpec
+
+
+class RunDockerTests(TestCase):
+    def test_dry_run_prints_command(self) -> None:
+        plan = LaunchPlan(command=["docker", "run", "--name", "a b"], launch_mode="exec")
+        with (
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+            mock.patch("aicage.cli._docker_run.os.execvp") as exec_mock,
+        ):
+            exit_code = run_docker(plan, dry_run=True)
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual("docker run --name 'a b'\n", stdout.getvalue())
+        exec_mock.assert_not_called()
+
+    def test_subprocess_mode_propagates_exit_code(self) -> None:
+        plan = LaunchPlan(command=["docker", "run", "image"], launch_mode="subprocess")
+        with mock.patch(
+            "aicage.cli._docker_run.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 42),
+        ) as run_mock:
+            exit_code = run_docker(plan, dry_run=False)
+
+        self.assertEqual(42, exit_code)
+        run_mock.assert_called_once_with(["docker", "run", "image"], check=False)
+
+    def test_exec_mode_replaces_process(self) -> None:
+        plan = LaunchPlan(command=["docker", "run", "image"], launch_mode="exec")
+        with (
+            mock.patch("aicage.cli._docker_run.os.execvp") as exec_mock,
+            mock.patch("aicage.cli._docker_run.finish_tracing") as finish_mock,
+            mock.patch("aicage.cli._docker_run.subprocess.run") as run_mock,
+        ):
+            exec_mock.side_effect = SystemExit(0)
+            with self.assertRaises(SystemExit):
+                run_docker(plan, dry_run=False)
+
+        exec_mock.assert_called_once_with("docker", ["docker", "run", "image"])
+        finish_mock.assert_called_once()
+        run_mock.assert_not_called()
+
+    def test_exec_failure_raises_cli_error(self) -> None:
+        plan = LaunchPlan(command=["docker", "run", "image"], launch_mode="exec")
+        with mock.patch("aicage.cli._docker_run.os.execvp", side_effect=FileNotFoundError("docker")):
+            with self.assertRaises(CliError):
+                run_docker(plan, dry_run=False)
+
+    def test_engine_mode_uses_engine_api_on_a_terminal(self) -> None:
+        spec = EngineRunSpec(image_ref="image", command=[], env=[], binds=[])
+        plan = LaunchPlan(command=["docker", "run", "image"], launch_mode="engine", engine_spec=spec)
+        with (
+            mock.patch("sys.stdin.isatty", return_value=True),
+            mock.patch("sys.stdout.isatty", return_value=True),
+            mock.patch("aicage.cli._engine_run.run_engine", return_value=5) as engine_mock,
+            mock.patch("aicage.cli._docker_run.subprocess.run") as run_mock,
+        ):
+            exit_code = run_docker(plan, dry_run=False)
+
+        self.assertEqual(5, exit_code)
+        engine_mock.assert_called_once_with(spec)
+        run_mock.assert_not_called()
+
+    def test_engine_mode_falls_back_to_cli_without_spec(self) -> None:
+        plan = LaunchPlan(command=["docker", "run", "--network=host", "image"], launch_mode="engine")
+        with (
+            mock.patch("sys.stdin.isatty", return_value=True),
+            mock.patch("sys.stdout.isatty", return_value=True),
+            mock.patch("aicage.cli._engine_run.run_engine") as engine_mock,
+            mock.patch(
+                "aicage.cli._docker_run.subprocess.run",
+                return_value=subprocess.CompletedProcess([], 0),
+            ) as run_mock,
+        ):
+            exit_code = run_docker(plan, dry_run=False)
+
+        self.assertEqual(0, exit_code)
+        engine_mock.assert_not_called()
+        run_mock.assert_called_once()
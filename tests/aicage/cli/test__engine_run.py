@@ -0,0 +1,99 @@
+import os
+import socket
+import threading
+from contextlib import nullcontext
+from unittest import TestCase, mock
+
+from aicage.cli import _engine_run
+from aicage.runtime.run_args import EngineRunSpec
+
+
+def _spec() -> EngineRunSpec:
+    return EngineRunSpec(
+        image_ref="ghcr.io/aicage/aicage:codex-ubuntu",
+        command=["--flag"],
+        env=["AICAGE_WORKSPACE=/work"],
+        binds=["/work:/workspace"],
+    )
+
+
+class EngineRunTests(TestCase):
+    def test_start_container_attaches_before_start(self) -> None:
+        api = mock.Mock()
+        api.create_container.return_value = {"Id": "abc"}
+        api.create_host_config.return_value = {"Binds": ["/work:/workspace"]}
+        attached = mock.Mock()
+        api.attach_socket.return_value = attached
+
+        container_id, attach_socket = _engine_run.start_container(api, _spec())
+
+        self.assertEqual("abc", container_id)
+        self.assertIs(attached._sock, attach_socket)
+        api.create_host_config.assert_called_once_with(binds=["/work:/workspace"])
+        api.create_container.assert_called_once_with(
+            image="ghcr.io/aicage/aicage:codex-ubuntu",
+            command=["--flag"],
+            environment=["AICAGE_WORKSPACE=/work"],
+            tty=True,
+            stdin_open=True,
+            host_config={"Binds": ["/work:/workspace"]},
+        )
+        call_names = [call[0] for call in api.method_calls]
+        self.assertLess(call_names.index("attach_socket"), call_names.index("start"))
+
+    def test_start_container_removes_container_when_start_fails(self) -> None:
+        api = mock.Mock()
+        api.create_container.return_value = {"Id": "abc"}
+        api.start.side_effect = RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            _engine_run.start_container(api, _spec())
+
+        api.remove_container.assert_called_once_with("abc", force=True)
+
+    def test_run_engine_returns_exit_code_and_removes_container(self) -> None:
+        client = mock.Mock()
+        client.api.create_container.return_value = {"Id": "abc"}
+        client.api.wait.return_value = {"StatusCode": 3}
+        with (
+            mock.patch("aicage.cli._engine_run.get_docker_client", return_value=client),
+            mock.patch("aicage.cli._engine_run._raw_terminal", return_value=nullcontext()),
+            mock.patch("aicage.cli._engine_run._forward_resize", return_value=nullcontext()),
+            mock.patch("aicage.cli._engine_run._pump") as pump_mock,
+        ):
+            exit_code = _engine_run.run_engine(_spec())
+
+        self.assertEqual(3, exit_code)
+        pump_mock.assert_called_once()
+        client.api.remove_container.assert_called_once_with("abc", force=True)
+
+    def test_pump_forwards_both_directions(self) -> None:
+        local, remote = socket.socketpair()
+        stdin_read, stdin_write = os.pipe()
+        stdout_read, stdout_write = os.pipe()
+        forwarded: list[bytes] = []
+
+        def _container() -> None:
+            forwarded.append(remote.recv(1024))
+            remote.sendall(b"prompt> ")
+            remote.shutdown(socket.SHUT_WR)
+
+        container = threading.Thread(target=_container, daemon=True)
+        container.start()
+        try:
+            os.write(stdin_write, b"hello")
+            with (
+                mock.patch("sys.stdin.fileno", return_value=stdin_read),
+                mock.patch("sys.stdout.fileno", return_value=stdout_write),
+            ):
+                _engine_run._pump(local)
+            container.join(5)
+            output = os.read(stdout_read, 1024)
+        finally:
+            for fd in (stdin_read, stdin_write, stdout_read, stdout_write):
+                os.close(fd)
+            local.close()
+            remote.close()
+
+        self.assertEqual([b"hello"], forwarded)
+        self.assertEqual(b"prompt> ", output)
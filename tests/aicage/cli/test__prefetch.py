@@ -0,0 +1,59 @@
+import io
+from unittest import TestCase, mock
+
+from aicage.cli import _prefetch
+from aicage.errors import CliError
+from aicage.registry.prefetch import PrefetchTarget
+
+
+class PrefetchCommandTests(TestCase):
+    def test_rejects_non_positive_jobs(self) -> None:
+        with self.assertRaises(CliError):
+            _prefetch.run_command(["--jobs", "0"])
+
+    def test_dry_run_prints_scheduled_images(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"codex": mock.Mock()}
+        targets = [
+            PrefetchTarget("ghcr.io/aicage/aicage:codex-ubuntu", "ubuntu"),
+            PrefetchTarget("ghcr.io/aicage/aicage:codex-alpine", "alpine"),
+        ]
+        with (
+            mock.patch("aicage.cli._prefetch.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._prefetch.load_images_metadata", return_value=metadata),
+            mock.patch("aicage.cli._prefetch.matrix_targets", return_value=targets) as matrix_mock,
+            mock.patch("aicage.cli._prefetch.prefetch_images") as prefetch_mock,
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+        ):
+            store_mock.return_value.load_global.return_value.offline = False
+            exit_code = _prefetch.run_command(["--agent", "codex", "--dry-run"])
+
+        self.assertEqual(0, exit_code)
+        self.assertEqual(["codex"], matrix_mock.call_args.args[2])
+        prefetch_mock.assert_not_called()
+        self.assertEqual(
+            "ghcr.io/aicage/aicage:codex-ubuntu\nghcr.io/aicage/aicage:codex-alpine\n",
+            stdout.getvalue(),
+        )
+
+    def test_rejects_unknown_agent(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"codex": mock.Mock()}
+        with (
+            mock.patch("aicage.cli._prefetch.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._prefetch.load_images_metadata", return_value=metadata),
+        ):
+            store_mock.return_value.load_global.return_value.offline = False
+            with self.assertRaises(CliError):
+                _prefetch.run_command(["--agent", "nope"])
+
+    def test_refuses_to_run_offline(self) -> None:
+        with (
+            mock.patch("aicage.cli._prefetch.SettingsStore") as store_mock,
+            mock.patch("aicage.cli._prefetch.load_images_metadata") as metadata_mock,
+        ):
+            store_mock.return_value.load_global.return_value.offline = True
+            with self.assertRaises(CliError):
+                _prefetch.run_command([])
+
+        metadata_mock.assert_not_called()
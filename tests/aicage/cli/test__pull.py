@@ -0,0 +1,62 @@
+import io
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.cli import _pull
+from aicage.errors import CliError
+from aicage.registry.pull_plan import PullEstimate
+
+
+class PullCommandTests(TestCase):
+    def test_plan_prints_download_sizes(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {
+            "codex": mock.Mock(
+                local_definition_dir=None,
+                valid_bases={
+                    "alpine": "ghcr.io/aicage/aicage:codex-alpine",
+                    "ubuntu": "ghcr.io/aicage/aicage:codex-ubuntu",
+                },
+            )
+        }
+        store = mock.Mock()
+        store.load_global.return_value.agents = {}
+        store.load_global.return_value.offline = False
+        store.load_global.return_value.image_registry = "ghcr.io"
+        store.load_global.return_value.image_base_repository = "aicage/aicage-image-base"
+        store.load_project.return_value.agents = {}
+        estimates = {
+            "ghcr.io/aicage/aicage:codex-alpine": PullEstimate(
+                "ghcr.io/aicage/aicage:codex-alpine", 3 * 1024 * 1024, 4 * 1024 * 1024, 4, 3
+            ),
+        }
+        with (
+            mock.patch("aicage.cli._pull.SettingsStore", return_value=store),
+            mock.patch("aicage.cli._pull.Path.cwd", return_value=Path("/tmp/project")),
+            mock.patch("aicage.cli._pull.load_images_metadata", return_value=metadata),
+            mock.patch("aicage.cli._pull.estimate_pulls", return_value=estimates),
+            mock.patch("aicage.cli._pull.prefetch_images") as prefetch_mock,
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+        ):
+            exit_code = _pull.run_command(["codex", "--plan"])
+
+        self.assertEqual(0, exit_code)
+        prefetch_mock.assert_not_called()
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual(["BASE", "IMAGE", "DOWNLOAD", "TOTAL", "LAYERS"], lines[0].split())
+        self.assertEqual(
+            ["alpine", "ghcr.io/aicage/aicage:codex-alpine", "3.0", "MiB", "4.0", "MiB", "3/4"],
+            lines[1].split(),
+        )
+        self.assertEqual(["ubuntu", "ghcr.io/aicage/aicage:codex-ubuntu", "unknown", "unknown", "-"], lines[2].split())
+        self.assertEqual("Total download: 3.0 MiB", lines[3])
+
+    def test_rejects_invalid_base(self) -> None:
+        metadata = mock.Mock()
+        metadata.agents = {"codex": mock.Mock(valid_bases={"ubuntu": "ref"})}
+        with (
+            mock.patch("aicage.cli._pull.SettingsStore"),
+            mock.patch("aicage.cli._pull.load_images_metadata", return_value=metadata),
+        ):
+            with self.assertRaises(CliError):
+                _pull.run_command(["codex", "--base", "alpine"])
@@ -1,13 +1,16 @@
+import dataclasses
 import io
+import subprocess
 import tempfile
 from pathlib import Path
 from unittest import TestCase, mock
 
 from aicage import cli
+from aicage.cli import _launch, entrypoint
 from aicage.cli import _print_config as print_config
-from aicage.cli_types import ParsedArgs
+from aicage.cli_types import COMMAND_NAMES, ParsedArgs
 from aicage.config import ConfigError, RunConfig
-from aicage.config.global_config import GlobalConfig
+from aicage.config.global_config import IMAGE_REFRESH_BACKGROUND, GlobalConfig
 from aicage.config.project_config import _PROJECT_AGENTS_KEY
 from aicage.errors import CliError
 from aicage.registry.images_metadata.models import (
@@ -115,6 +118,16 @@ def _build_images_metadata() -> ImagesMetadata:
 
 
 class MainFlowTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch(
+            "aicage.daemon._protocol._DEFAULT_SOCKET_PATH",
+            str(Path(tmp_dir.name) / "daemon.sock"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_print_project_config_missing(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             config_path = Path(tmp_dir) / "project.yaml"
@@ -165,8 +178,8 @@ class MainFlowTests(TestCase):
                 "aicage.cli.entrypoint.parse_cli",
                 return_value=ParsedArgs(False, "", "", [], None, False, "print"),
             ),
-            mock.patch("aicage.cli.entrypoint.print_project_config") as print_mock,
-            mock.patch("aicage.cli.entrypoint.load_run_config") as load_mock,
+            mock.patch("aicage.cli._print_config.print_project_config") as print_mock,
+            mock.patch("aicage.cli._launch.load_run_config") as load_mock,
         ):
             exit_code = cli.main([])
 
@@ -192,20 +205,23 @@ class MainFlowTests(TestCase):
                     "aicage.cli.entrypoint.parse_cli",
                     return_value=ParsedArgs(False, "--cli", "codex", ["--flag"], None, False, None),
                 ),
-                mock.patch("aicage.cli.entrypoint.load_run_config", return_value=run_config),
-                mock.patch("aicage.cli.entrypoint.pull_image"),
-                mock.patch("aicage.cli.entrypoint.build_run_args", return_value=run_args),
+                mock.patch("aicage.cli._launch.load_run_config", return_value=run_config),
+                mock.patch("aicage.cli._launch.pull_image"),
+                mock.patch("aicage.cli._launch.build_run_args", return_value=run_args),
                 mock.patch(
-                    "aicage.cli.entrypoint.assemble_docker_run",
+                    "aicage.cli._launch.assemble_docker_run",
                     return_value=["docker", "run", "--flag"],
                 ) as assemble_mock,
-                mock.patch("aicage.cli.entrypoint.subprocess.run") as run_mock,
+                mock.patch(
+                    "aicage.cli._docker_run.subprocess.run",
+                    return_value=subprocess.CompletedProcess([], 0),
+                ) as run_mock,
             ):
                 exit_code = cli.main([])
 
             self.assertEqual(0, exit_code)
             assemble_mock.assert_called_once()
-            run_mock.assert_called_once_with(["docker", "run", "--flag"], check=True)
+            run_mock.assert_called_once_with(["docker", "run", "--flag"], check=False)
 
     def test_main_prompts_and_saves_base(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -225,11 +241,11 @@ class MainFlowTests(TestCase):
                     "aicage.cli.entrypoint.parse_cli",
                     return_value=ParsedArgs(True, "--cli", "codex", ["--flag"], None, False, None),
                 ),
-                mock.patch("aicage.cli.entrypoint.load_run_config", return_value=run_config),
-                mock.patch("aicage.cli.entrypoint.pull_image"),
-                mock.patch("aicage.cli.entrypoint.build_run_args", return_value=run_args),
+                mock.patch("aicage.cli._launch.load_run_config", return_value=run_config),
+                mock.patch("aicage.cli._launch.pull_image"),
+                mock.patch("aicage.cli._launch.build_run_args", return_value=run_args),
                 mock.patch(
-                    "aicage.cli.entrypoint.assemble_docker_run",
+                    "aicage.cli._launch.assemble_docker_run",
                     return_value=["docker", "run", "cmd"],
                 ),
                 mock.patch("sys.stderr", new_callable=io.StringIO) as stderr,
@@ -253,10 +269,10 @@ class MainFlowTests(TestCase):
                     "aicage.cli.entrypoint.parse_cli",
                     return_value=ParsedArgs(True, "", "codex", [], None, False, None),
                 ),
-                mock.patch("aicage.cli.entrypoint.load_run_config", return_value=run_config),
-                mock.patch("aicage.cli.entrypoint.pull_image"),
+                mock.patch("aicage.cli._launch.load_run_config", return_value=run_config),
+                mock.patch("aicage.cli._launch.pull_image"),
                 mock.patch(
-                    "aicage.cli.entrypoint.build_run_args",
+                    "aicage.cli._launch.build_run_args",
                     side_effect=CliError("No base images found"),
                 ),
                 mock.patch("sys.stderr", new_callable=io.StringIO) as stderr,
@@ -273,7 +289,7 @@ class MainFlowTests(TestCase):
                 return_value=ParsedArgs(False, "", "codex", [], None, False, None),
             ),
             mock.patch(
-                "aicage.cli.entrypoint.load_run_config",
+                "aicage.cli._launch.load_run_config",
                 side_effect=ConfigError("bad config"),
             ),
             mock.patch("sys.stderr", new_callable=io.StringIO) as stderr,
@@ -288,3 +304,95 @@ class MainFlowTests(TestCase):
             with mock.patch("sys.stdout", new_callable=io.StringIO):
                 exit_code = cli.main([])
         self.assertEqual(130, exit_code)
+
+    def test_subcommands_are_the_reserved_agent_names(self) -> None:
+        self.assertEqual(COMMAND_NAMES, set(entrypoint._COMMAND_MODULES))
+
+
+class BackgroundRefreshLaunchTests(TestCase):
+    def test_deferred_refresh_launches_local_image_and_refreshes_in_background(self) -> None:
+        run_config = _background_run_config(refresh_deferred=True)
+        with (
+            mock.patch("aicage.cli._launch.report_background_refresh") as report_mock,
+            mock.patch("aicage.cli._launch.local_image_available", return_value=True),
+            mock.patch("aicage.cli._launch.start_background_refresh") as start_mock,
+            mock.patch("aicage.cli._launch.pull_image") as pull_mock,
+            mock.patch("aicage.cli._launch.mark_refreshed") as mark_mock,
+        ):
+            result = _launch._ensure_image(run_config)
+
+        self.assertIs(run_config, result)
+        report_mock.assert_called_once_with(run_config.image_ref)
+        start_mock.assert_called_once_with(run_config)
+        pull_mock.assert_not_called()
+        mark_mock.assert_not_called()
+
+    def test_deferred_refresh_without_local_image_blocks(self) -> None:
+        run_config = _background_run_config(refresh_deferred=True)
+        resolved = dataclasses.replace(run_config, refresh_deferred=False)
+        with (
+            mock.patch("aicage.cli._launch.report_background_refresh"),
+            mock.patch("aicage.cli._launch.local_image_available", return_value=False),
+            mock.patch("aicage.cli._launch.with_agent_version", return_value=resolved),
+            mock.patch("aicage.cli._launch.start_background_refresh") as start_mock,
+            mock.patch("aicage.cli._launch.pull_image") as pull_mock,
+            mock.patch("aicage.cli._launch.mark_refreshed") as mark_mock,
+        ):
+            result = _launch._ensure_image(run_config)
+
+        self.assertIs(resolved, result)
+        start_mock.assert_not_called()
+        pull_mock.assert_called_once_with(resolved)
+        mark_mock.assert_called_once_with(run_config.image_ref)
+
+    def test_stale_image_refreshes_before_launch(self) -> None:
+        run_config = _background_run_config(refresh_deferred=False)
+        with (
+            mock.patch("aicage.cli._launch.report_background_refresh"),
+            mock.patch("aicage.cli._launch.start_background_refresh") as start_mock,
+            mock.patch("aicage.cli._launch.pull_image") as pull_mock,
+            mock.patch("aicage.cli._launch.mark_refreshed") as mark_mock,
+        ):
+            _launch._ensure_image(run_config)
+
+        start_mock.assert_not_called()
+        pull_mock.assert_called_once_with(run_config)
+        mark_mock.assert_called_once_with(run_config.image_ref)
+
+
+class OfflineLaunchTests(TestCase):
+    def test_offline_launch_uses_local_image_without_pulling(self) -> None:
+        run_config = _offline_run_config()
+        with (
+            mock.patch("aicage.cli._launch.local_image_available", return_value=True),
+            mock.patch("aicage.cli._launch.pull_image") as pull_mock,
+            mock.patch("aicage.cli._launch.report_background_refresh") as report_mock,
+        ):
+            result = _launch._ensure_image(run_config)
+
+        self.assertIs(run_config, result)
+        pull_mock.assert_not_called()
+        report_mock.assert_not_called()
+
+    def test_offline_launch_fails_without_local_image(self) -> None:
+        with (
+            mock.patch("aicage.cli._launch.local_image_available", return_value=False),
+            mock.patch("aicage.cli._launch.pull_image") as pull_mock,
+        ):
+            with self.assertRaises(CliError) as ctx:
+                _launch._ensure_image(_offline_run_config())
+
+        pull_mock.assert_not_called()
+        self.assertIn("Offline mode", str(ctx.exception))
+
+
+def _offline_run_config() -> RunConfig:
+    run_config = _build_run_config(Path("/tmp/project"), "ghcr.io/aicage/aicage:codex-ubuntu")
+    run_config.global_cfg.offline = True
+    return run_config
+
+
+def _background_run_config(refresh_deferred: bool) -> RunConfig:
+    run_config = _build_run_config(Path("/tmp/project"), "ghcr.io/aicage/aicage:codex-ubuntu")
+    run_config.global_cfg.image_refresh = IMAGE_REFRESH_BACKGROUND
+    return dataclasses.replace(run_config, refresh_deferred=refresh_deferred)
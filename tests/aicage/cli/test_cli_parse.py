@@ -89,3 +89,15 @@ class ParseCliTests(TestCase):
         self.assertEqual("/tmp/entrypoint.sh", parsed.entrypoint)
         self.assertEqual("", parsed.docker_args)
         self.assertEqual("codex", parsed.agent)
+
+    def test_parse_refresh_flag(self) -> None:
+        parsed = parse_cli(["--refresh", "codex"])
+        self.assertTrue(parsed.refresh)
+        self.assertEqual("codex", parsed.agent)
+        self.assertFalse(parse_cli(["codex"]).refresh)
+
+    def test_parse_offline_flag(self) -> None:
+        self.assertTrue(parse_cli(["--offline", "codex"]).offline)
+        self.assertFalse(parse_cli(["codex"]).offline)
+        with self.assertRaises(CliError):
+            parse_cli(["--offline", "--refresh", "codex"])
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+# Modules imported by `aicage -h` on top of a bare interpreter. Raise deliberately, never casually.
+_HELP_MODULE_BUDGET = 90
+_HEAVY_MODULES = ("docker", "yaml", "portalocker", "requests", "urllib3")
+
+
+def _imported_modules(args: list[str], cwd: Path, home_dir: Path) -> set[str]:
+    env = dict(os.environ)
+    env["HOME"] = str(home_dir)
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parents[3] / "src")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        env=env,
+    )
+    modules: set[str] = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        name = line.rsplit("|", 1)[-1].strip()
+        if name and name != "imported package":
+            modules.add(name)
+    return modules
+
+
+class ImportBudgetTests(TestCase):
+    def test_help_stays_within_module_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            baseline = _imported_modules(["-c", "pass"], tmp_path, tmp_path)
+            modules = _imported_modules(["-m", "aicage", "-h"], tmp_path, tmp_path)
+
+        extra = sorted(modules - baseline)
+        self.assertLessEqual(len(extra), _HELP_MODULE_BUDGET, f"aicage -h imported: {extra}")
+        self.assertEqual([], _heavy(modules))
+
+    def test_config_print_skips_heavy_dependencies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            modules = _imported_modules(["-m", "aicage", "--config", "print"], tmp_path, tmp_path)
+
+        self.assertIn("aicage.cli._print_config", modules)
+        self.assertEqual([], _heavy(modules))
+
+    def test_launch_pipeline_imports_in_fresh_interpreter(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            modules = _imported_modules(["-c", "import aicage.cli._launch"], tmp_path, tmp_path)
+
+        self.assertIn("aicage.registry.image_selection", modules)
+
+
+def _heavy(modules: set[str]) -> list[str]:
+    return sorted(
+        name for name in modules if any(name == heavy or name.startswith(f"{heavy}.") for heavy in _HEAVY_MODULES)
+    )
@@ -12,6 +12,7 @@ from aicage.config.global_config import (
     _IMAGE_REGISTRY_API_URL_KEY,
     _IMAGE_REGISTRY_KEY,
     _IMAGE_REPOSITORY_KEY,
+    _LAUNCH_MODE_KEY,
     _LOCAL_IMAGE_REPOSITORY_KEY,
     _VERSION_CHECK_IMAGE_KEY,
 )
@@ -78,6 +79,17 @@ class ConfigStoreTests(TestCase):
                 raw = yaml.safe_load(handle)
             self.assertEqual(project_cfg.to_mapping(), raw)
 
+    def test_load_all_projects_returns_stored_project_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SettingsStore(base_dir=Path(tmp_dir))
+            project_path = Path(tmp_dir) / "project"
+            store.save_project(project_path, ProjectConfig(path=str(project_path), agents={"codex": AgentConfig()}))
+            (store.projects_dir / "unknown.yaml").write_text("agents: {}\n", encoding="utf-8")
+
+            projects = store.load_all_projects()
+
+        self.assertEqual([str(project_path)], [project.path for project in projects])
+
     def test_load_yaml_reports_parse_errors(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             base_dir = Path(tmp_dir)
@@ -86,3 +98,48 @@ class ConfigStoreTests(TestCase):
             store = SettingsStore(base_dir=base_dir)
             with self.assertRaises(ConfigError):
                 store._load_yaml(bad_file)  # noqa: SLF001
+
+    def test_load_global_rejects_non_mapping_user_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SettingsStore(base_dir=Path(tmp_dir))
+            store.user_config_path().write_text("- launch_mode\n- exec\n", encoding="utf-8")
+
+            with self.assertRaises(ConfigError) as ctx:
+                store.load_global()
+
+        self.assertIn(str(store.user_config_path()), str(ctx.exception))
+
+    def test_load_global_applies_user_config(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = Path(tmp_dir)
+            packaged_config = base_dir / "packaged.yaml"
+            packaged_config.write_text(
+                yaml.safe_dump(
+                    {
+                        _IMAGE_REGISTRY_KEY: "ghcr.io",
+                        _IMAGE_REGISTRY_API_URL_KEY: "https://ghcr.io/v2",
+                        _IMAGE_REGISTRY_API_TOKEN_URL_KEY: "https://ghcr.io/token",
+                        _IMAGE_REPOSITORY_KEY: "aicage/aicage",
+                        _IMAGE_BASE_REPOSITORY_KEY: "aicage/aicage-image-base",
+                        _DEFAULT_IMAGE_BASE_KEY: "ubuntu",
+                        _VERSION_CHECK_IMAGE_KEY: "ghcr.io/aicage/aicage-image-util:agent-version",
+                        _LOCAL_IMAGE_REPOSITORY_KEY: "aicage",
+                    }
+                ),
+                encoding="utf-8",
+            )
+            store = SettingsStore(base_dir=base_dir)
+            store.user_config_path().write_text(
+                yaml.safe_dump({_LAUNCH_MODE_KEY: "exec", _DEFAULT_IMAGE_BASE_KEY: "fedora"}),
+                encoding="utf-8",
+            )
+
+            with mock.patch(
+                "aicage.config.config_store.find_packaged_path",
+                return_value=packaged_config,
+            ):
+                global_cfg = store.load_global()
+
+        self.assertEqual("exec", global_cfg.launch_mode)
+        self.assertEqual("fedora", global_cfg.default_image_base)
+        self.assertEqual("aicage/aicage", global_cfg.image_repository)
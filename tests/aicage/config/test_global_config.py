@@ -2,15 +2,25 @@ from unittest import TestCase
 
 from aicage.config.errors import ConfigError
 from aicage.config.global_config import (
+    _BUILD_CACHE_KEY,
     _DEFAULT_IMAGE_BASE_KEY,
+    _DIGEST_CACHE_TTL_SECONDS_KEY,
     _GLOBAL_AGENTS_KEY,
     _IMAGE_BASE_REPOSITORY_KEY,
+    _IMAGE_MAX_AGE_SECONDS_KEY,
+    _IMAGE_REFRESH_KEY,
     _IMAGE_REGISTRY_API_TOKEN_URL_KEY,
     _IMAGE_REGISTRY_API_URL_KEY,
     _IMAGE_REGISTRY_KEY,
     _IMAGE_REPOSITORY_KEY,
+    _LAUNCH_MODE_KEY,
     _LOCAL_IMAGE_REPOSITORY_KEY,
+    _NETWORK_BUDGET_SECONDS_KEY,
+    _NETWORK_REQUEST_TIMEOUT_SECONDS_KEY,
+    _OFFLINE_KEY,
+    _REGISTRY_MIRRORS_KEY,
     _VERSION_CHECK_IMAGE_KEY,
+    LAUNCH_MODE_SUBPROCESS,
     GlobalConfig,
 )
 from aicage.config.project_config import AGENT_BASE_KEY
@@ -32,6 +42,75 @@ class GlobalConfigTests(TestCase):
             _VERSION_CHECK_IMAGE_KEY: "ghcr.io/aicage/aicage-image-util:agent-version",
             _LOCAL_IMAGE_REPOSITORY_KEY: "aicage",
             _GLOBAL_AGENTS_KEY: {"codex": {AGENT_BASE_KEY: "ubuntu"}},
+            _LAUNCH_MODE_KEY: "exec",
+            _DIGEST_CACHE_TTL_SECONDS_KEY: 60,
+            _IMAGE_REFRESH_KEY: "background",
+            _IMAGE_MAX_AGE_SECONDS_KEY: 3600,
+            _NETWORK_BUDGET_SECONDS_KEY: 20,
+            _NETWORK_REQUEST_TIMEOUT_SECONDS_KEY: 3,
+            _OFFLINE_KEY: True,
+            _REGISTRY_MIRRORS_KEY: [{"registry": "localhost:5000", "api_url": "http://localhost:5000/v2"}],
+            _BUILD_CACHE_KEY: "local",
         }
         cfg = GlobalConfig.from_mapping(data)
         self.assertEqual(data, cfg.to_mapping())
+
+    def test_launch_mode_defaults_to_subprocess(self) -> None:
+        cfg = GlobalConfig.from_mapping(_required_mapping())
+
+        self.assertEqual(LAUNCH_MODE_SUBPROCESS, cfg.launch_mode)
+
+    def test_from_mapping_rejects_unknown_launch_mode(self) -> None:
+        data = _required_mapping()
+        data[_LAUNCH_MODE_KEY] = "fork"
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+    def test_from_mapping_rejects_negative_digest_cache_ttl(self) -> None:
+        data = _required_mapping()
+        data[_DIGEST_CACHE_TTL_SECONDS_KEY] = -1
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+    def test_from_mapping_rejects_unknown_image_refresh(self) -> None:
+        data = _required_mapping()
+        data[_IMAGE_REFRESH_KEY] = "lazy"
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+    def test_from_mapping_rejects_zero_network_budget(self) -> None:
+        data = _required_mapping()
+        data[_NETWORK_BUDGET_SECONDS_KEY] = 0
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+    def test_from_mapping_rejects_mirror_without_api_url(self) -> None:
+        data = _required_mapping()
+        data[_REGISTRY_MIRRORS_KEY] = [{"registry": "localhost:5000"}]
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+    def test_from_mapping_rejects_unknown_build_cache(self) -> None:
+        data = _required_mapping()
+        data[_BUILD_CACHE_KEY] = "registry"
+
+        with self.assertRaises(ConfigError):
+            GlobalConfig.from_mapping(data)
+
+
+def _required_mapping() -> dict[str, object]:
+    return {
+        _IMAGE_REGISTRY_KEY: "ghcr.io",
+        _IMAGE_REGISTRY_API_URL_KEY: "https://ghcr.io/v2",
+        _IMAGE_REGISTRY_API_TOKEN_URL_KEY: "https://ghcr.io/token",
+        _IMAGE_REPOSITORY_KEY: "aicage/aicage",
+        _IMAGE_BASE_REPOSITORY_KEY: "aicage/aicage-image-base",
+        _DEFAULT_IMAGE_BASE_KEY: "ubuntu",
+        _VERSION_CHECK_IMAGE_KEY: "ghcr.io/aicage/aicage-image-util:agent-version",
+        _LOCAL_IMAGE_REPOSITORY_KEY: "aicage",
+    }
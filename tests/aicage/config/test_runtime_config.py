@@ -8,6 +8,7 @@ from aicage.config.global_config import GlobalConfig
 from aicage.config.project_config import AgentConfig, AgentMounts
 from aicage.config.runtime_config import RunConfig, load_run_config
 from aicage.errors import CliError
+from aicage.registry._network_budget import clear_network_budget
 from aicage.registry.images_metadata.models import (
     _AGENT_KEY,
     _AICAGE_IMAGE_BASE_KEY,
@@ -30,6 +31,9 @@ from aicage.runtime.run_args import MountSpec
 
 
 class RuntimeConfigTests(TestCase):
+    def setUp(self) -> None:
+        self.addCleanup(clear_network_budget)
+
     def test_load_run_config_reads_docker_args_and_mount_prefs(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             base_dir = Path(tmp_dir) / "config"
@@ -54,6 +58,7 @@ class RuntimeConfigTests(TestCase):
                 mock.patch("aicage.config.runtime_config.SettingsStore", new=store_factory),
                 mock.patch("aicage.config.runtime_config.Path.cwd", return_value=project_path),
                 mock.patch("aicage.config.runtime_config.resolve_mounts", return_value=mounts),
+                mock.patch("aicage.config.runtime_config.prefetch_remote_digest"),
                 mock.patch(
                     "aicage.config.runtime_config.load_images_metadata",
                     return_value=self._get_images_metadata(),
@@ -95,6 +100,7 @@ class RuntimeConfigTests(TestCase):
                 mock.patch("aicage.config.runtime_config.SettingsStore", new=store_factory),
                 mock.patch("aicage.config.runtime_config.Path.cwd", return_value=project_path),
                 mock.patch("aicage.config.runtime_config.resolve_mounts", return_value=[]),
+                mock.patch("aicage.config.runtime_config.prefetch_remote_digest"),
                 mock.patch(
                     "aicage.config.runtime_config.load_images_metadata",
                     return_value=self._get_images_metadata(),
@@ -124,6 +130,7 @@ class RuntimeConfigTests(TestCase):
                 mock.patch("aicage.config.runtime_config.SettingsStore", new=store_factory),
                 mock.patch("aicage.config.runtime_config.Path.cwd", return_value=project_path),
                 mock.patch("aicage.config.runtime_config.resolve_mounts", return_value=[]),
+                mock.patch("aicage.config.runtime_config.prefetch_remote_digest"),
                 mock.patch(
                     "aicage.config.runtime_config.load_images_metadata",
                     return_value=self._get_images_metadata(),
@@ -133,6 +140,117 @@ class RuntimeConfigTests(TestCase):
                 with self.assertRaises(CliError):
                     load_run_config("codex")
 
+    def test_load_run_config_prefetches_agent_image_digest(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = Path(tmp_dir) / "config"
+            project_path = Path(tmp_dir) / "project"
+            project_path.mkdir()
+
+            store = SettingsStore(base_dir=base_dir)
+            project_cfg = store.load_project(project_path)
+            project_cfg.agents["codex"] = AgentConfig(base="ubuntu")
+            store.save_project(project_path, project_cfg)
+
+            def store_factory(*args: object, **kwargs: object) -> SettingsStore:
+                return SettingsStore(base_dir=base_dir)
+
+            with (
+                mock.patch("aicage.config.runtime_config.SettingsStore", new=store_factory),
+                mock.patch("aicage.config.runtime_config.Path.cwd", return_value=project_path),
+                mock.patch("aicage.config.runtime_config.resolve_mounts", return_value=[]),
+                mock.patch("aicage.config.runtime_config.prefetch_remote_digest") as prefetch_mock,
+                mock.patch(
+                    "aicage.config.runtime_config.load_images_metadata",
+                    return_value=self._get_images_metadata(),
+                ),
+                mock.patch("aicage.config.runtime_config.select_agent_image", return_value="ref"),
+            ):
+                parsed = ParsedArgs(
+                    dry_run=False,
+                    docker_args="",
+                    agent="codex",
+                    agent_args=[],
+                    entrypoint=None,
+                    docker_socket=False,
+                    config_action=None,
+                    refresh=True,
+                )
+                run_config = load_run_config("codex", parsed)
+
+        prefetch_mock.assert_called_once_with(
+            mock.ANY,
+            "ref",
+            run_config.global_cfg.image_repository,
+            run_config.global_cfg,
+            True,
+        )
+
+    def test_load_run_config_offline_skips_network_checks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = Path(tmp_dir) / "config"
+            project_path = Path(tmp_dir) / "project"
+            project_path.mkdir()
+
+            store = SettingsStore(base_dir=base_dir)
+            project_cfg = store.load_project(project_path)
+            project_cfg.agents["codex"] = AgentConfig(base="ubuntu")
+            store.save_project(project_path, project_cfg)
+
+            def store_factory(*args: object, **kwargs: object) -> SettingsStore:
+                return SettingsStore(base_dir=base_dir)
+
+            with (
+                mock.patch("aicage.config.runtime_config.SettingsStore", new=store_factory),
+                mock.patch("aicage.config.runtime_config.Path.cwd", return_value=project_path),
+                mock.patch("aicage.config.runtime_config.resolve_mounts", return_value=[]),
+                mock.patch("aicage.config.runtime_config.prefetch_remote_digest") as prefetch_mock,
+                mock.patch("aicage.config.runtime_config._check_agent_version") as version_mock,
+                mock.patch("aicage.config.runtime_config.start_network_budget") as budget_mock,
+                mock.patch(
+                    "aicage.config.runtime_config.load_images_metadata",
+                    return_value=self._get_images_metadata(),
+                ),
+                mock.patch("aicage.config.runtime_config.select_agent_image", return_value="ref"),
+            ):
+                parsed = ParsedArgs(
+                    dry_run=False,
+                    docker_args="",
+                    agent="codex",
+                    agent_args=[],
+                    entrypoint=None,
+                    docker_socket=False,
+                    config_action=None,
+                    offline=True,
+                )
+                run_config = load_run_config("codex", parsed)
+
+        self.assertTrue(run_config.global_cfg.offline)
+        prefetch_mock.assert_not_called()
+        version_mock.assert_not_called()
+        budget_mock.assert_not_called()
+
+    def test_digest_prefetch_target_uses_base_image_for_build_local(self) -> None:
+        global_cfg = GlobalConfig(
+            image_registry="ghcr.io",
+            image_registry_api_url="https://ghcr.io/v2",
+            image_registry_api_token_url="https://ghcr.io/token?service=ghcr.io&scope=repository",
+            image_repository="aicage/aicage",
+            image_base_repository="aicage/aicage-image-base",
+            default_image_base="ubuntu",
+            version_check_image="ghcr.io/aicage/aicage-image-util:agent-version",
+            local_image_repository="aicage",
+            agents={},
+        )
+        agent_metadata = mock.Mock(local_definition_dir=Path("/tmp/codex"))
+
+        target = runtime_config._digest_prefetch_target(agent_metadata, "ref", "ubuntu", global_cfg)
+
+        self.assertEqual(
+            ("ghcr.io/aicage/aicage-image-base:ubuntu", "aicage/aicage-image-base"),
+            target,
+        )
+        self.assertIsNone(runtime_config._digest_prefetch_target(agent_metadata, "ref", None, global_cfg))
+
     def test_check_agent_version_uses_definition_dir_for_build_local(self) -> None:
         global_cfg = GlobalConfig(
             image_registry="ghcr.io",
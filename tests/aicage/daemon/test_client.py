@@ -0,0 +1,94 @@
+import io
+import socket
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.cli._docker_run import LaunchPlan
+from aicage.daemon import client
+from aicage.daemon._protocol import (
+    COMMAND_KEY,
+    MESSAGE_KEY,
+    STATUS_ERROR,
+    STATUS_FALLBACK,
+    STATUS_KEY,
+    STATUS_OK,
+    STDOUT_KEY,
+    encode_message,
+    read_message,
+)
+from aicage.errors import CliError
+
+
+class RequestLaunchTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._socket_path = Path(tmp_dir.name) / "daemon.sock"
+        patcher = mock.patch("aicage.daemon._protocol._DEFAULT_SOCKET_PATH", str(self._socket_path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _serve_once(
+        self,
+        reply: dict[str, object],
+        output: tuple[dict[str, object], ...] = (),
+    ) -> list[dict[str, object]]:
+        received: list[dict[str, object]] = []
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(self._socket_path))
+        listener.listen(1)
+        self.addCleanup(listener.close)
+
+        def _handle() -> None:
+            connection, _ = listener.accept()
+            with connection, connection.makefile("rb") as stream:
+                request = read_message(stream)
+                if request is not None:
+                    received.append(request)
+                for message in (*output, reply):
+                    connection.sendall(encode_message(message))
+
+        thread = threading.Thread(target=_handle, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        return received
+
+    def test_returns_none_without_daemon(self) -> None:
+        self.assertIsNone(client.request_launch(["codex"], Path("/work")))
+
+    def test_returns_command_from_daemon(self) -> None:
+        received = self._serve_once(
+            {STATUS_KEY: STATUS_OK, COMMAND_KEY: ["docker", "run", "image"]},
+            output=({STDOUT_KEY: "[aicage] Pulling\n"}, {STDOUT_KEY: "[aicage] ok\n"}),
+        )
+
+        with (
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+            mock.patch.dict("os.environ", {"USER": "client"}),
+        ):
+            reply = client.request_launch(["codex"], Path("/work"))
+
+        self.assertEqual(LaunchPlan(command=["docker", "run", "image"], launch_mode="subprocess"), reply)
+        self.assertEqual("[aicage] Pulling\n[aicage] ok\n", stdout.getvalue())
+        self.assertEqual(["codex"], received[0]["argv"])
+        self.assertEqual("/work", received[0]["cwd"])
+        self.assertEqual("client", received[0]["env"]["USER"])
+
+    def test_returns_none_on_fallback(self) -> None:
+        self._serve_once({STATUS_KEY: STATUS_FALLBACK})
+
+        self.assertIsNone(client.request_launch(["codex"], Path("/work")))
+
+    def test_raises_on_error(self) -> None:
+        self._serve_once({STATUS_KEY: STATUS_ERROR, MESSAGE_KEY: "boom"})
+
+        with self.assertRaises(CliError) as ctx:
+            client.request_launch(["codex"], Path("/work"))
+        self.assertEqual("boom", str(ctx.exception))
+
+    def test_returns_none_for_stale_socket(self) -> None:
+        self._socket_path.touch()
+
+        self.assertIsNone(client.request_launch(["codex"], Path("/work")))
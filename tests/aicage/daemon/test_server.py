@@ -0,0 +1,127 @@
+import io
+import os
+import tempfile
+import threading
+from unittest import TestCase, mock
+
+from aicage import __version__
+from aicage.cli._docker_run import LaunchPlan
+from aicage.daemon import server
+from aicage.daemon._protocol import (
+    ARGV_KEY,
+    COMMAND_KEY,
+    CWD_KEY,
+    ENV_KEY,
+    LAUNCH_MODE_KEY,
+    MESSAGE_KEY,
+    STATUS_ERROR,
+    STATUS_FALLBACK,
+    STATUS_KEY,
+    STATUS_OK,
+    STDOUT_KEY,
+    VERSION_KEY,
+)
+from aicage.errors import CliError
+from aicage.runtime.prompts import PromptUnavailableError
+
+
+class HandleLaunchRequestTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._cwd = tmp_dir.name
+        patcher = mock.patch("aicage.daemon.server.os.chdir")
+        self._chdir = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, argv: list[str]) -> dict[str, object]:
+        return {ARGV_KEY: argv, CWD_KEY: self._cwd, ENV_KEY: {"USER": "client"}, VERSION_KEY: __version__}
+
+    @staticmethod
+    def _handle(request: dict[str, object], stdout: io.StringIO | None = None) -> dict[str, object]:
+        return server.handle_launch_request(request, stdout=stdout or io.StringIO(), stderr=io.StringIO())
+
+    def test_returns_prepared_command(self) -> None:
+        def fake_prepare(_parsed: object) -> LaunchPlan:
+            print("[aicage] Pulling image")
+            return LaunchPlan(command=["docker", "run", "image"], launch_mode="exec")
+
+        stdout = io.StringIO()
+        with mock.patch("aicage.daemon.server.prepare_launch", side_effect=fake_prepare):
+            reply = self._handle(self._request(["codex"]), stdout)
+
+        self._chdir.assert_called_once_with(self._cwd)
+        self.assertEqual(STATUS_OK, reply[STATUS_KEY])
+        self.assertEqual(["docker", "run", "image"], reply[COMMAND_KEY])
+        self.assertEqual("exec", reply[LAUNCH_MODE_KEY])
+        self.assertEqual("[aicage] Pulling image\n", stdout.getvalue())
+
+    def test_prepares_in_client_environment(self) -> None:
+        seen: list[str | None] = []
+
+        def fake_prepare(_parsed: object) -> LaunchPlan:
+            seen.append(os.environ.get("USER"))
+            return LaunchPlan(command=["docker", "run", "image"], launch_mode="exec")
+
+        before = dict(os.environ)
+        with mock.patch("aicage.daemon.server.prepare_launch", side_effect=fake_prepare):
+            self._handle(self._request(["codex"]))
+
+        self.assertEqual(["client"], seen)
+        self.assertEqual(before, dict(os.environ))
+
+    def test_defers_without_client_environment(self) -> None:
+        request = self._request(["codex"])
+        del request[ENV_KEY]
+        with mock.patch("aicage.daemon.server.prepare_launch") as prepare_mock:
+            reply = self._handle(request)
+
+        self.assertEqual({STATUS_KEY: STATUS_FALLBACK}, reply)
+        prepare_mock.assert_not_called()
+
+    def test_defers_when_prompt_needed(self) -> None:
+        with mock.patch(
+            "aicage.daemon.server.prepare_launch",
+            side_effect=PromptUnavailableError("prompt"),
+        ):
+            reply = self._handle(self._request(["codex"]))
+
+        self.assertEqual({STATUS_KEY: STATUS_FALLBACK}, reply)
+
+    def test_defers_on_version_mismatch(self) -> None:
+        request = self._request(["codex"])
+        request[VERSION_KEY] = "0.0.0-other"
+        with mock.patch("aicage.daemon.server.prepare_launch") as prepare_mock:
+            reply = self._handle(request)
+
+        self.assertEqual({STATUS_KEY: STATUS_FALLBACK}, reply)
+        prepare_mock.assert_not_called()
+
+    def test_defers_on_help(self) -> None:
+        reply = self._handle(self._request(["--help"]))
+
+        self.assertEqual({STATUS_KEY: STATUS_FALLBACK}, reply)
+
+    def test_reports_cli_errors(self) -> None:
+        with mock.patch("aicage.daemon.server.prepare_launch", side_effect=CliError("boom")):
+            reply = self._handle(self._request(["codex"]))
+
+        self.assertEqual(STATUS_ERROR, reply[STATUS_KEY])
+        self.assertEqual("boom", reply[MESSAGE_KEY])
+
+
+class StreamedOutputTests(TestCase):
+    def test_sends_each_write_as_message(self) -> None:
+        connection = io.BytesIO()
+        output = server._StreamedOutput(connection, STDOUT_KEY, threading.Lock())
+
+        output.write("[aicage] Pulling\n")
+        output.write("")
+
+        self.assertEqual(b'{"stdout": "[aicage] Pulling\\n"}\n', connection.getvalue())
+
+
+class RunCommandTests(TestCase):
+    def test_rejects_extra_arguments(self) -> None:
+        with self.assertRaises(CliError):
+            server.run_command(["extra"])
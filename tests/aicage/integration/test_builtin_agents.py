@@ -53,6 +53,7 @@ def _force_record(
         base_digest=base_digest if base_digest is not None else record.base_digest,
         image_ref=record.image_ref,
         built_at=built_at,
+        fingerprint=record.fingerprint,
     )
     store.save(updated)
 
@@ -24,3 +24,12 @@ class VersionCheckStoreTests(TestCase):
             self.assertEqual("custom/agent", payload[_AGENT_KEY])
             self.assertEqual("1.2.3", payload[_VERSION_KEY])
             self.assertIn(_CHECKED_AT_KEY, payload)
+
+    def test_load_returns_last_saved_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = VersionCheckStore(Path(tmp_dir))
+            self.assertIsNone(store.load("custom/agent"))
+
+            store.save("custom/agent", "1.2.3")
+
+            self.assertEqual("1.2.3", store.load("custom/agent"))
@@ -0,0 +1,44 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from aicage.registry.custom_agent._cache import CustomAgentCache, agent_fingerprint
+
+
+class CustomAgentCacheTests(TestCase):
+    def test_load_returns_saved_mapping_for_same_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = CustomAgentCache(Path(tmp_dir) / "cache")
+            fingerprint = [[".", 1, 2]]
+            cache.save("custom", fingerprint, {"agent_path": "~/.custom"})
+
+            self.assertEqual({"agent_path": "~/.custom"}, cache.load("custom", fingerprint))
+            self.assertIsNone(cache.load("custom", [[".", 1, 3]]))
+
+    def test_load_ignores_entries_in_an_older_format(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = Path(tmp_dir)
+            fingerprint = [[".", 1, 2]]
+            # Entries cached before the format key existed were validated without `downloads`.
+            (cache_dir / "custom.json").write_text(
+                json.dumps({"fingerprint": fingerprint, "mapping": {"agent_path": "~/.custom"}}), encoding="utf-8"
+            )
+
+            self.assertIsNone(CustomAgentCache(cache_dir).load("custom", fingerprint))
+
+    def test_load_returns_none_for_corrupt_entry(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = Path(tmp_dir)
+            (cache_dir / "custom.json").write_text("{not json", encoding="utf-8")
+
+            self.assertIsNone(CustomAgentCache(cache_dir).load("custom", []))
+
+    def test_fingerprint_changes_when_file_is_added(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            agent_dir = Path(tmp_dir)
+            before = agent_fingerprint(agent_dir)
+            (agent_dir / "install.sh").write_text("#!/usr/bin/env bash\n", encoding="utf-8")
+            after = agent_fingerprint(agent_dir)
+
+        self.assertNotEqual(before, after)
@@ -37,3 +37,25 @@ class CustomAgentValidationTests(TestCase):
             }
         )
         self.assertTrue(payload[BUILD_LOCAL_KEY])
+
+    def test_validate_agent_mapping_accepts_downloads(self) -> None:
+        payload = _validation.validate_agent_mapping(
+            {
+                AGENT_PATH_KEY: "~/.custom",
+                AGENT_FULL_NAME_KEY: "Custom",
+                AGENT_HOMEPAGE_KEY: "https://example.com",
+                "downloads": [{"name": "custom.tgz", "url": "https://example.com/{version}/custom.tgz"}],
+            }
+        )
+        self.assertEqual("custom.tgz", payload["downloads"][0]["name"])
+
+    def test_validate_agent_mapping_rejects_download_without_url(self) -> None:
+        with self.assertRaises(CliError):
+            _validation.validate_agent_mapping(
+                {
+                    AGENT_PATH_KEY: "~/.custom",
+                    AGENT_FULL_NAME_KEY: "Custom",
+                    AGENT_HOMEPAGE_KEY: "https://example.com",
+                    "downloads": [{"name": "custom.tgz"}],
+                }
+            )
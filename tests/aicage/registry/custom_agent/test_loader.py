@@ -22,11 +22,23 @@ from aicage.registry.images_metadata.models import (
     BASE_DISTRO_EXCLUDE_KEY,
     BASE_EXCLUDE_KEY,
     BUILD_LOCAL_KEY,
+    DOWNLOADS_KEY,
+    AgentDownload,
     ImagesMetadata,
 )
 
 
 class CustomAgentLoaderTests(TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache_patch = mock.patch(
+            "aicage.registry.custom_agent._cache._DEFAULT_STATE_DIR",
+            cache_dir.name,
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
     def test_load_custom_agents_returns_empty_when_missing_dir(self) -> None:
         metadata = self._metadata_with_bases(["ubuntu"])
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -93,6 +105,111 @@ class CustomAgentLoaderTests(TestCase):
                 with self.assertRaises(CliError):
                     load_custom_agents(metadata, "aicage")
 
+    def test_load_custom_agents_rejects_command_names(self) -> None:
+        metadata = self._metadata_with_bases(["ubuntu"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            custom_dir = Path(tmp_dir)
+            (custom_dir / "build").mkdir()
+            with mock.patch(
+                "aicage.registry.custom_agent.loader.DEFAULT_CUSTOM_AGENTS_DIR",
+                str(custom_dir),
+            ):
+                with self.assertRaisesRegex(CliError, "aicage build"):
+                    load_custom_agents(metadata, "aicage")
+
+    def test_load_custom_agents_resolves_only_requested_agent(self) -> None:
+        metadata = self._metadata_with_bases(["ubuntu"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            custom_dir = Path(tmp_dir)
+            self._write_agent(custom_dir / "custom")
+            broken_dir = custom_dir / "broken"
+            broken_dir.mkdir()
+            with mock.patch(
+                "aicage.registry.custom_agent.loader.DEFAULT_CUSTOM_AGENTS_DIR",
+                str(custom_dir),
+            ):
+                custom_agents = load_custom_agents(metadata, "aicage", "custom")
+                builtin_agents = load_custom_agents(metadata, "aicage", "codex")
+
+        self.assertEqual(["custom"], list(custom_agents))
+        self.assertEqual({}, builtin_agents)
+
+    def test_load_custom_agents_reads_downloads(self) -> None:
+        metadata = self._metadata_with_bases(["ubuntu"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            custom_dir = Path(tmp_dir)
+            agent_dir = custom_dir / "custom"
+            self._write_agent(agent_dir)
+            with (agent_dir / "agent.yml").open("a", encoding="utf-8") as handle:
+                handle.write(f"\n{DOWNLOADS_KEY}:\n  - name: forge.tgz\n    url: https://example.com/{{version}}/forge.tgz\n")
+            with mock.patch(
+                "aicage.registry.custom_agent.loader.DEFAULT_CUSTOM_AGENTS_DIR",
+                str(custom_dir),
+            ):
+                first = load_custom_agents(metadata, "aicage")
+                second = load_custom_agents(metadata, "aicage")
+
+        expected = [AgentDownload(name="forge.tgz", url="https://example.com/{version}/forge.tgz")]
+        self.assertEqual(expected, first["custom"].downloads)
+        self.assertEqual(expected, second["custom"].downloads)
+
+    def test_load_custom_agents_reuses_cached_definition(self) -> None:
+        metadata = self._metadata_with_bases(["ubuntu"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            custom_dir = Path(tmp_dir)
+            self._write_agent(custom_dir / "custom")
+            with mock.patch(
+                "aicage.registry.custom_agent.loader.DEFAULT_CUSTOM_AGENTS_DIR",
+                str(custom_dir),
+            ):
+                first = load_custom_agents(metadata, "aicage")
+                with mock.patch("aicage.registry.custom_agent.loader._load_yaml") as load_yaml_mock:
+                    second = load_custom_agents(metadata, "aicage")
+
+        load_yaml_mock.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_load_custom_agents_reloads_changed_definition(self) -> None:
+        metadata = self._metadata_with_bases(["ubuntu"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            custom_dir = Path(tmp_dir)
+            agent_dir = custom_dir / "custom"
+            self._write_agent(agent_dir)
+            with mock.patch(
+                "aicage.registry.custom_agent.loader.DEFAULT_CUSTOM_AGENTS_DIR",
+                str(custom_dir),
+            ):
+                load_custom_agents(metadata, "aicage")
+                (agent_dir / "agent.yml").write_text(
+                    "\n".join(
+                        [
+                            f"{AGENT_PATH_KEY}: ~/.custom",
+                            f"{AGENT_FULL_NAME_KEY}: Renamed Custom Agent",
+                            f"{AGENT_HOMEPAGE_KEY}: https://example.com",
+                        ]
+                    ),
+                    encoding="utf-8",
+                )
+                custom_agents = load_custom_agents(metadata, "aicage")
+
+        self.assertEqual("Renamed Custom Agent", custom_agents["custom"].agent_full_name)
+
+    @staticmethod
+    def _write_agent(agent_dir: Path) -> None:
+        agent_dir.mkdir()
+        (agent_dir / "agent.yml").write_text(
+            "\n".join(
+                [
+                    f"{AGENT_PATH_KEY}: ~/.custom",
+                    f"{AGENT_FULL_NAME_KEY}: Custom",
+                    f"{AGENT_HOMEPAGE_KEY}: https://example.com",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        (agent_dir / "install.sh").write_text("#!/usr/bin/env bash\n", encoding="utf-8")
+        (agent_dir / "version.sh").write_text("echo 1.0.0\n", encoding="utf-8")
+
     @staticmethod
     def _metadata_with_bases(bases: list[str]) -> ImagesMetadata:
         return ImagesMetadata.from_mapping(
@@ -0,0 +1,50 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from aicage.registry.images_metadata._compiled import (
+    _SOURCE_SHA256_KEY,
+    compile_images_metadata,
+    load_compiled_images_metadata,
+)
+from aicage.registry.images_metadata.models import ImagesMetadata
+
+from .test_loader import _valid_payload
+
+
+class CompiledImagesMetadataTests(TestCase):
+    def test_compiled_artifact_round_trips(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = Path(tmp_dir) / "images-metadata.yaml"
+            source_path.write_text(_valid_payload(), encoding="utf-8")
+            compiled_path = compile_images_metadata(source_path, Path(tmp_dir) / "images-metadata.json")
+
+            metadata = load_compiled_images_metadata(compiled_path, source_path.read_bytes())
+
+        self.assertEqual(ImagesMetadata.from_yaml(_valid_payload()), metadata)
+
+    def test_load_compiled_rejects_stale_artifact(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = Path(tmp_dir) / "images-metadata.yaml"
+            source_path.write_text(_valid_payload(), encoding="utf-8")
+            compiled_path = compile_images_metadata(source_path, Path(tmp_dir) / "images-metadata.json")
+
+            metadata = load_compiled_images_metadata(compiled_path, b"changed: true\n")
+
+        self.assertIsNone(metadata)
+
+    def test_load_compiled_returns_none_when_missing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metadata = load_compiled_images_metadata(Path(tmp_dir) / "missing.json", b"")
+
+        self.assertIsNone(metadata)
+
+    def test_compiled_artifact_records_source_hash(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source_path = Path(tmp_dir) / "images-metadata.yaml"
+            source_path.write_text(_valid_payload(), encoding="utf-8")
+            compiled_path = compile_images_metadata(source_path, Path(tmp_dir) / "images-metadata.json")
+            payload = json.loads(compiled_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(64, len(payload[_SOURCE_SHA256_KEY]))
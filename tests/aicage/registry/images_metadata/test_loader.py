@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest import TestCase, mock
 
 from aicage.errors import CliError
+from aicage.registry.images_metadata._compiled import compile_images_metadata
 from aicage.registry.images_metadata.loader import load_images_metadata
 from aicage.registry.images_metadata.models import (
     _AGENT_KEY,
@@ -36,6 +37,25 @@ class ImagesMetadataLoaderTests(TestCase):
                 metadata = load_images_metadata("aicage")
             self.assertEqual("0.3.3", metadata.aicage_image.version)
 
+    def test_load_images_metadata_prefers_compiled_artifact(self) -> None:
+        payload = _valid_payload()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "images-metadata.yaml"
+            path.write_text(payload, encoding="utf-8")
+            compile_images_metadata(path, Path(tmp_dir) / "images-metadata.json")
+            with (
+                mock.patch(
+                    "aicage.registry.images_metadata.loader.find_packaged_path",
+                    return_value=path,
+                ),
+                mock.patch(
+                    "aicage.registry.images_metadata.loader.ImagesMetadata.from_yaml"
+                ) as from_yaml_mock,
+            ):
+                metadata = load_images_metadata("aicage")
+            from_yaml_mock.assert_not_called()
+            self.assertEqual("0.3.3", metadata.aicage_image.version)
+
     def test_load_images_metadata_raises_without_file(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             missing = Path(tmp_dir) / "images-metadata.yaml"
@@ -18,7 +18,10 @@ from aicage.registry.images_metadata.models import (
     AGENT_PATH_KEY,
     BASE_EXCLUDE_KEY,
     BUILD_LOCAL_KEY,
+    DOWNLOADS_KEY,
+    AgentDownload,
     ImagesMetadata,
+    parse_downloads,
 )
 
 
@@ -279,6 +282,41 @@ class ImagesMetadataModelTests(TestCase):
         metadata = ImagesMetadata.from_mapping(data)
         self.assertEqual(["ubuntu"], metadata.agents["codex"].base_exclude)
 
+    def test_from_mapping_parses_downloads(self) -> None:
+        data = {
+            _AICAGE_IMAGE_KEY: {_VERSION_KEY: "0.3.3"},
+            _AICAGE_IMAGE_BASE_KEY: {_VERSION_KEY: "0.3.3"},
+            _BASES_KEY: {},
+            _AGENT_KEY: {
+                "claude": {
+                    AGENT_PATH_KEY: "~/.claude",
+                    AGENT_FULL_NAME_KEY: "Claude Code",
+                    AGENT_HOMEPAGE_KEY: "https://example.com",
+                    BUILD_LOCAL_KEY: True,
+                    _VALID_BASES_KEY: {"ubuntu": "aicage:claude-ubuntu"},
+                    DOWNLOADS_KEY: [
+                        {"name": "claude", "url": "https://example.com/{version}/claude", "platform": "linux/arm64"}
+                    ],
+                }
+            },
+        }
+        metadata = ImagesMetadata.from_mapping(data)
+
+        expected = [AgentDownload(name="claude", url="https://example.com/{version}/claude", platform="linux/arm64")]
+        self.assertEqual(expected, metadata.agents["claude"].downloads)
+        self.assertEqual(expected, ImagesMetadata.from_compiled(metadata.to_compiled()).agents["claude"].downloads)
+
+    def test_parse_downloads_rejects_invalid_entries(self) -> None:
+        for entry in (
+            {"name": "../claude", "url": "https://example.com/claude"},
+            {"name": "claude"},
+            {"name": "claude", "url": "https://example.com/claude", "platform": "arm64"},
+            {"name": "claude", "url": "https://example.com/claude", "sha256": "abc"},
+        ):
+            with self.subTest(entry=entry), self.assertRaises(CliError):
+                parse_downloads([entry], DOWNLOADS_KEY)
+        self.assertEqual([], parse_downloads(None, DOWNLOADS_KEY))
+
     def test_from_mapping_rejects_invalid_bases_mapping(self) -> None:
         data = {
             _AICAGE_IMAGE_KEY: {_VERSION_KEY: "0.3.3"},
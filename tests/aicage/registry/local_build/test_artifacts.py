@@ -0,0 +1,186 @@
+import tempfile
+import threading
+from dataclasses import replace
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import BinaryIO
+from unittest import TestCase, mock
+
+from aicage.config.runtime_config import RunConfig
+from aicage.registry import _network_budget
+from aicage.registry._http import HttpResponse
+from aicage.registry._platform import Platform
+from aicage.registry.images_metadata.models import AgentDownload
+from aicage.registry.local_build import _artifacts
+
+from ._fixtures import build_run_config
+
+_DOWNLOAD = AgentDownload(name="claude", url="https://example.com/{version}/claude")
+
+
+def _serve(payload: bytes, status: int = HTTPStatus.OK) -> mock.Mock:
+    def request(method: str, url: str, sink: BinaryIO) -> HttpResponse:
+        if status == HTTPStatus.OK:
+            sink.write(payload)
+        return HttpResponse(status=status, headers={}, body=b"")
+
+    return mock.Mock(side_effect=request)
+
+
+class _PayloadHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:  # noqa: N802
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Length", "7")
+        self.end_headers()
+        self.wfile.write(b"payload")
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+class AgentArtifactsTests(TestCase):
+    def test_agent_artifacts_downloads_each_file_once_per_version(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            run_config = _run_config([_DOWNLOAD])
+            request_mock = _serve(b"payload")
+            with mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", request_mock):
+                with _artifacts.agent_artifacts(run_config, base_dir=root) as first:
+                    payload = (first / "claude").read_bytes()
+                with _artifacts.agent_artifacts(replace(run_config, base="alpine"), base_dir=root) as second:
+                    pass
+
+            self.assertEqual(root / "claude" / "1.2.3", first)
+            self.assertEqual(first, second)
+            self.assertEqual(b"payload", payload)
+            request_mock.assert_called_once_with("GET", "https://example.com/1.2.3/claude", sink=mock.ANY)
+
+    def test_agent_artifacts_removes_older_versions(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            run_config = _run_config([_DOWNLOAD])
+            with mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", _serve(b"payload")):
+                with _artifacts.agent_artifacts(run_config, base_dir=root) as old:
+                    pass
+                with _artifacts.agent_artifacts(replace(run_config, agent_version="1.2.4"), base_dir=root) as new:
+                    pass
+
+            self.assertFalse(old.exists())
+            self.assertTrue((new / "claude").is_file())
+
+    def test_agent_artifacts_keeps_versions_mounted_by_running_builds(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            run_config = _run_config([_DOWNLOAD])
+            with mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", _serve(b"payload")):
+                with _artifacts.agent_artifacts(run_config, base_dir=root) as old:
+                    with _artifacts.agent_artifacts(replace(run_config, agent_version="1.2.4"), base_dir=root):
+                        pass
+                    self.assertTrue((old / "claude").is_file())
+                with _artifacts.agent_artifacts(replace(run_config, agent_version="1.2.4"), base_dir=root):
+                    pass
+
+            self.assertFalse(old.exists())
+
+    def test_agent_artifacts_without_version_is_empty(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_config = replace(_run_config([_DOWNLOAD]), agent_version=None)
+            with (
+                mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request") as request_mock,
+                _artifacts.agent_artifacts(run_config, base_dir=Path(tmp_dir)) as path,
+            ):
+                contents = list(path.iterdir())
+
+            self.assertEqual([], contents)
+            request_mock.assert_not_called()
+
+    def test_agent_artifacts_does_not_download_offline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_config = _run_config([_DOWNLOAD])
+            run_config = replace(run_config, global_cfg=replace(run_config.global_cfg, offline=True))
+            with (
+                mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request") as request_mock,
+                _artifacts.agent_artifacts(run_config, base_dir=Path(tmp_dir)) as path,
+            ):
+                contents = list(path.iterdir())
+
+            self.assertEqual([], contents)
+            request_mock.assert_not_called()
+
+    def test_agent_artifacts_ignores_failed_downloads(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_config = _run_config([_DOWNLOAD])
+            for request_mock in (_serve(b"", status=404), mock.Mock(side_effect=OSError("budget exhausted"))):
+                with (
+                    mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", request_mock),
+                    _artifacts.agent_artifacts(run_config, base_dir=Path(tmp_dir)) as path,
+                ):
+                    contents = list(path.iterdir())
+
+                self.assertEqual([], contents)
+
+    def test_agent_artifacts_downloads_after_the_network_budget_is_exhausted(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _PayloadHandler)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(_network_budget.clear_network_budget)
+        download = AgentDownload(name="claude", url=f"http://127.0.0.1:{server.server_address[1]}/{{version}}/claude")
+        _network_budget.start_network_budget(10, 2)
+
+        with (
+            tempfile.TemporaryDirectory() as tmp_dir,
+            mock.patch("aicage.registry._network_budget.time.monotonic", return_value=float("inf")),
+        ):
+            with _artifacts.agent_artifacts(_run_config([download]), base_dir=Path(tmp_dir)) as path:
+                payload = (path / "claude").read_bytes()
+
+        self.assertEqual(b"payload", payload)
+
+    def test_agent_artifacts_downloads_only_the_daemon_platform(self) -> None:
+        downloads = [
+            AgentDownload(name="claude", url="https://example.com/{version}/x64/claude", platform="linux/amd64"),
+            AgentDownload(name="claude", url="https://example.com/{version}/arm64/claude", platform="linux/arm64"),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            request_mock = _serve(b"payload")
+            with (
+                mock.patch(
+                    "aicage.registry.local_build._artifacts.host_platform",
+                    return_value=Platform(os="linux", architecture="arm64"),
+                ),
+                mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", request_mock),
+                _artifacts.agent_artifacts(_run_config(downloads), base_dir=Path(tmp_dir)),
+            ):
+                pass
+
+        request_mock.assert_called_once_with("GET", "https://example.com/1.2.3/arm64/claude", sink=mock.ANY)
+
+    def test_agent_artifacts_reads_builtin_downloads_from_packaged_definition(self) -> None:
+        run_config = build_run_config()
+        self.assertEqual([], run_config.images_metadata.agents["claude"].downloads)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            request_mock = _serve(b"payload")
+            with (
+                mock.patch(
+                    "aicage.registry.local_build._artifacts.host_platform",
+                    return_value=Platform(os="linux", architecture="amd64"),
+                ),
+                mock.patch.object(_artifacts._DOWNLOAD_CLIENT, "request", request_mock),
+                _artifacts.agent_artifacts(run_config, base_dir=Path(tmp_dir)) as path,
+            ):
+                names = sorted(entry.name for entry in path.iterdir())
+
+        self.assertEqual(["claude", "manifest.json"], names)
+        urls = [call.args[1] for call in request_mock.call_args_list]
+        self.assertTrue(any(url.endswith("/1.2.3/linux-x64/claude") for url in urls))
+
+
+def _run_config(downloads: list[AgentDownload]) -> RunConfig:
+    run_config = build_run_config()
+    agents = run_config.images_metadata.agents
+    agents["claude"] = replace(agents["claude"], downloads=downloads)
+    return run_config
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.registry.local_build import _build_cache
+
+_OLD = time.time() - 2 * 60 * 60
+
+
+class BuildCacheTests(TestCase):
+    def test_prune_build_cache_removes_unreferenced_blobs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = _build_cache.build_cache_dir("claude", "ubuntu", Path(tmp_dir))
+            _blob(cache_dir, "manifest", json.dumps({"layers": [{"digest": "sha256:layer"}]}))
+            _blob(cache_dir, "layer", "layer")
+            _blob(cache_dir, "stale", "stale")
+            _blob(cache_dir, "fresh", "fresh", mtime=time.time())
+            manifest = {"digest": "sha256:manifest", "mediaType": "application/vnd.oci.image.index.v1+json"}
+            (cache_dir / "index.json").write_text(json.dumps({"manifests": [manifest]}), encoding="utf-8")
+
+            _build_cache.prune_build_cache(cache_dir)
+
+            remaining = sorted(path.name for path in (cache_dir / "blobs" / "sha256").iterdir())
+
+        # Fresh blobs may belong to an export that has not replaced index.json yet.
+        self.assertEqual(["fresh", "layer", "manifest"], remaining)
+
+    def test_prune_build_cache_keeps_blobs_without_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache_dir = _build_cache.build_cache_dir("claude", "ubuntu", Path(tmp_dir))
+            blob = _blob(cache_dir, "layer", "layer")
+
+            _build_cache.prune_build_cache(cache_dir)
+
+            self.assertTrue(blob.exists())
+
+    def test_prune_build_cache_evicts_least_recent_caches_over_cap(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            # Each cache holds 102 bytes; the one being pruned is never evicted, even when it is the oldest.
+            oldest = _cache(root, "codex-ubuntu", exported_at=_OLD - 60)
+            older = _cache(root, "droid-ubuntu", exported_at=_OLD)
+            recent = _cache(root, "goose-ubuntu", exported_at=time.time())
+            current = _cache(root, "claude-ubuntu", exported_at=_OLD - 120)
+
+            with (
+                mock.patch("aicage.registry.local_build._build_cache._remove_unreferenced_blobs"),
+                mock.patch("aicage.registry.local_build._build_cache._MAX_TOTAL_BYTES", 350),
+            ):
+                _build_cache.prune_build_cache(current)
+
+            self.assertEqual(
+                (False, True, True, True),
+                (oldest.exists(), older.exists(), recent.exists(), current.exists()),
+            )
+
+
+def _blob(cache_dir: Path, name: str, content: str, mtime: float = _OLD) -> Path:
+    path = cache_dir / "blobs" / "sha256" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _cache(root: Path, name: str, exported_at: float) -> Path:
+    cache_dir = root / name
+    _blob(cache_dir, "layer", "x" * 100)
+    index = cache_dir / "index.json"
+    index.write_text("{}", encoding="utf-8")
+    os.utime(index, (exported_at, exported_at))
+    return cache_dir
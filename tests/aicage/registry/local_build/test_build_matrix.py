@@ -0,0 +1,76 @@
+from dataclasses import replace
+from unittest import TestCase, mock
+
+from aicage.errors import CliError
+from aicage.registry.local_build import build_matrix
+
+from ._fixtures import build_run_config
+
+
+class BuildMatrixTests(TestCase):
+    def test_matrix_run_configs_only_includes_local_agents(self) -> None:
+        run_config = build_run_config()
+
+        configs = build_matrix.matrix_run_configs(run_config.images_metadata, run_config.global_cfg)
+        prebuilt = build_run_config(build_local=False)
+        none = build_matrix.matrix_run_configs(prebuilt.images_metadata, prebuilt.global_cfg)
+
+        self.assertEqual(
+            [("claude", "ubuntu", "aicage:claude-ubuntu")],
+            [(config.agent, config.base, config.image_ref) for config in configs],
+        )
+        self.assertEqual([], none)
+
+    def test_plan_builds_checks_each_agent_and_base_once(self) -> None:
+        ubuntu = build_run_config(agent_version=None)
+        debian = replace(ubuntu, base="debian", image_ref="aicage:claude-debian")
+
+        def refresh_base_digest(base_image_ref: str, **_: object) -> str | None:
+            if base_image_ref.endswith(":debian"):
+                raise CliError("pull failed")
+            return None
+
+        with (
+            mock.patch(
+                "aicage.registry.local_build.build_matrix.with_agent_version",
+                side_effect=lambda run_config: replace(run_config, agent_version="2.0.0"),
+            ) as version_mock,
+            mock.patch(
+                "aicage.registry.local_build.build_matrix.refresh_base_digest",
+                side_effect=refresh_base_digest,
+            ) as refresh_mock,
+            mock.patch("aicage.registry.local_build.build_matrix.build_fingerprint", return_value="sha256:fp"),
+            mock.patch("aicage.registry.local_build.build_matrix.BuildStore"),
+            mock.patch("aicage.registry.local_build.build_matrix.should_build", return_value=True),
+        ):
+            targets = build_matrix.plan_builds([ubuntu, debian], jobs=2)
+
+        version_mock.assert_called_once()
+        self.assertEqual(2, refresh_mock.call_count)
+        self.assertEqual(("2.0.0", ""), (targets[0].run_config.agent_version, targets[0].error))
+        self.assertEqual("pull failed", targets[1].error)
+
+    def test_run_builds_continues_after_failure(self) -> None:
+        ubuntu = build_run_config()
+        debian = replace(ubuntu, base="debian", image_ref="aicage:claude-debian")
+        alpine = replace(ubuntu, base="alpine", image_ref="aicage:claude-alpine")
+        targets = [
+            build_matrix.BuildTarget(run_config=ubuntu, base_image="base:ubuntu", fingerprint="sha256:fp"),
+            build_matrix.BuildTarget(run_config=debian, base_image="base:debian", needs_build=False),
+            build_matrix.BuildTarget(run_config=alpine, base_image="base:alpine", fingerprint="sha256:fp"),
+        ]
+        with (
+            mock.patch(
+                "aicage.registry.local_build.build_matrix.build_local_image",
+                side_effect=[CliError("build failed"), None],
+            ) as build_mock,
+            mock.patch("aicage.registry.local_build.build_matrix.BuildStore"),
+        ):
+            results = build_matrix.run_builds(targets, jobs=1)
+
+        self.assertEqual(2, build_mock.call_count)
+        self.assertEqual(
+            [build_matrix.BUILD_FAILED, build_matrix.BUILD_CURRENT, build_matrix.BUILD_BUILT],
+            [result.status for result in results],
+        )
+        self.assertEqual("build failed", results[0].message)
@@ -0,0 +1,62 @@
+import tarfile
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.config.runtime_config import RunConfig
+from aicage.registry.local_build import _context
+
+from ._fixtures import build_run_config
+
+
+class BuildContextTests(TestCase):
+    def test_build_context_contains_only_dockerfile_and_agent(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            run_config = self._run_config(root)
+            (root / "agents" / "other").mkdir(parents=True)
+            (root / "agents" / "other" / "big.bin").write_bytes(b"x" * 1024)
+
+            context = self._build(root, run_config)
+
+            with tarfile.open(context.path) as archive:
+                members = {member.name: member.mode for member in archive.getmembers()}
+
+        self.assertFalse(context.reused)
+        self.assertEqual({"Dockerfile": 0o644, "agents/claude/install.sh": 0o755}, members)
+
+    def test_build_context_is_reused_until_content_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            run_config = self._run_config(root)
+
+            first = self._build(root, run_config)
+            second = self._build(root, run_config)
+            (root / "agents" / "claude" / "install.sh").write_text("echo v2\n", encoding="utf-8")
+            third = self._build(root, run_config)
+
+            self.assertEqual((first.path, True), (second.path, second.reused))
+            self.assertNotEqual(first.path, third.path)
+            self.assertFalse(first.path.exists())
+
+    @staticmethod
+    def _run_config(root: Path) -> RunConfig:
+        (root / "Dockerfile").write_text("FROM base\n", encoding="utf-8")
+        definition_dir = root / "agents" / "claude"
+        definition_dir.mkdir(parents=True)
+        install = definition_dir / "install.sh"
+        install.write_text("echo v1\n", encoding="utf-8")
+        install.chmod(0o755)
+        run_config = build_run_config()
+        agents = run_config.images_metadata.agents
+        agents["claude"] = replace(agents["claude"], local_definition_dir=definition_dir)
+        return run_config
+
+    @staticmethod
+    def _build(root: Path, run_config: RunConfig) -> _context.BuildContext:
+        with mock.patch(
+            "aicage.registry.local_build._context.find_packaged_path",
+            return_value=root / "Dockerfile",
+        ):
+            return _context.build_context(run_config, base_dir=root / "cache")
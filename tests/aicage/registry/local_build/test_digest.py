@@ -3,6 +3,7 @@ from pathlib import Path
 from unittest import TestCase, mock
 
 from aicage.errors import CliError
+from aicage.registry._remote_query import RemoteDigest
 from aicage.registry.local_build import _digest
 
 from ._fixtures import build_run_config
@@ -17,7 +18,7 @@ class LocalBuildDigestTests(TestCase):
                 return_value="sha256:local",
             ),
             mock.patch(
-                "aicage.registry.local_build._digest._remote_query.get_remote_repo_digest_for_repo",
+                "aicage.registry.local_build._digest._remote_query.get_remote_digest",
                 return_value=None,
             ),
             mock.patch("aicage.registry.local_build._digest.run_pull") as run_mock,
@@ -30,6 +31,28 @@ class LocalBuildDigestTests(TestCase):
         self.assertEqual("sha256:local", digest)
         run_mock.assert_not_called()
 
+    def test_refresh_base_digest_without_pull_returns_remote_digest(self) -> None:
+        global_cfg = build_run_config().global_cfg
+        with (
+            mock.patch(
+                "aicage.registry.local_build._digest._local_query.get_local_repo_digest_for_repo",
+                return_value="sha256:local",
+            ),
+            mock.patch(
+                "aicage.registry.local_build._digest._remote_query.get_remote_digest",
+                return_value=RemoteDigest(digest="sha256:remote"),
+            ),
+            mock.patch("aicage.registry.local_build._digest.run_pull") as run_mock,
+        ):
+            digest = _digest.refresh_base_digest(
+                base_image_ref="ghcr.io/aicage/aicage-image-base:ubuntu",
+                base_repository="ghcr.io/aicage/aicage-image-base",
+                global_cfg=global_cfg,
+                pull=False,
+            )
+        self.assertEqual("sha256:remote", digest)
+        run_mock.assert_not_called()
+
     def test_refresh_base_digest_pull_failure_uses_local_digest(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             global_cfg = build_run_config().global_cfg
@@ -39,8 +62,8 @@ class LocalBuildDigestTests(TestCase):
                     return_value="sha256:local",
                 ),
                 mock.patch(
-                    "aicage.registry.local_build._digest._remote_query.get_remote_repo_digest_for_repo",
-                    return_value="sha256:remote",
+                    "aicage.registry.local_build._digest._remote_query.get_remote_digest",
+                    return_value=RemoteDigest("sha256:remote"),
                 ),
                 mock.patch(
                     "aicage.registry.local_build._digest.run_pull",
@@ -64,8 +87,8 @@ class LocalBuildDigestTests(TestCase):
                     return_value=None,
                 ),
                 mock.patch(
-                    "aicage.registry.local_build._digest._remote_query.get_remote_repo_digest_for_repo",
-                    return_value="sha256:remote",
+                    "aicage.registry.local_build._digest._remote_query.get_remote_digest",
+                    return_value=RemoteDigest("sha256:remote"),
                 ),
                 mock.patch(
                     "aicage.registry.local_build._digest.run_pull",
@@ -90,8 +113,8 @@ class LocalBuildDigestTests(TestCase):
                     side_effect=["sha256:old", "sha256:new"],
                 ),
                 mock.patch(
-                    "aicage.registry.local_build._digest._remote_query.get_remote_repo_digest_for_repo",
-                    return_value="sha256:remote",
+                    "aicage.registry.local_build._digest._remote_query.get_remote_digest",
+                    return_value=RemoteDigest("sha256:remote"),
                 ),
                 mock.patch(
                     "aicage.registry.local_build._digest.run_pull",
@@ -14,6 +14,7 @@ from aicage.registry.images_metadata.models import (
     ImagesMetadata,
 )
 from aicage.registry.local_build import ensure_local_image as ensure_local_image_module
+from aicage.registry.local_build._fingerprint import FINGERPRINT_LABEL
 from aicage.registry.local_build._store import (
     _AGENT_KEY,
     _AGENT_VERSION_KEY,
@@ -21,6 +22,7 @@ from aicage.registry.local_build._store import (
     _BASE_IMAGE_KEY,
     _BASE_KEY,
     _BUILT_AT_KEY,
+    _FINGERPRINT_KEY,
     _IMAGE_REF_KEY,
 )
 
@@ -79,8 +81,8 @@ class EnsureLocalImageTests(TestCase):
                     str(log_dir),
                 ),
                 mock.patch(
-                    "aicage.registry.local_build._plan.local_image_exists",
-                    return_value=False,
+                    "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+                    return_value=None,
                 ),
                 mock.patch(
                     "aicage.registry.local_build.ensure_local_image.refresh_base_digest",
@@ -100,6 +102,10 @@ class EnsureLocalImageTests(TestCase):
             record_path = state_dir / "claude-ubuntu.yaml"
             payload = yaml.safe_load(record_path.read_text(encoding="utf-8"))
             self.assertEqual("1.2.3", payload[_AGENT_VERSION_KEY])
+            self.assertEqual(
+                build_mock.call_args.kwargs["fingerprint"],
+                payload[_FINGERPRINT_KEY],
+            )
 
     def test_ensure_local_image_skips_when_up_to_date(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -133,8 +139,12 @@ class EnsureLocalImageTests(TestCase):
                     str(log_dir),
                 ),
                 mock.patch(
-                    "aicage.registry.local_build._plan.local_image_exists",
-                    return_value=True,
+                    "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+                    return_value={FINGERPRINT_LABEL: "sha256:fingerprint"},
+                ),
+                mock.patch(
+                    "aicage.registry.local_build.ensure_local_image.build_fingerprint",
+                    return_value="sha256:fingerprint",
                 ),
                 mock.patch(
                     "aicage.registry.local_build.ensure_local_image.refresh_base_digest",
@@ -0,0 +1,44 @@
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.registry.local_build import _fingerprint
+
+from ._fixtures import build_run_config
+
+
+class BuildFingerprintTests(TestCase):
+    def test_fingerprint_changes_with_build_inputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            dockerfile = root / "Dockerfile"
+            dockerfile.write_text("FROM base\n", encoding="utf-8")
+            definition_dir = root / "agents" / "claude"
+            definition_dir.mkdir(parents=True)
+            install = definition_dir / "install.sh"
+            install.write_text("echo v1\n", encoding="utf-8")
+            run_config = build_run_config()
+            agents = run_config.images_metadata.agents
+            agents["claude"] = replace(agents["claude"], local_definition_dir=definition_dir)
+
+            def fingerprint(agent_version: str = "1.2.3") -> str:
+                with mock.patch(
+                    "aicage.registry.local_build._context.find_packaged_path",
+                    return_value=dockerfile,
+                ):
+                    return _fingerprint.build_fingerprint(
+                        replace(run_config, agent_version=agent_version),
+                        "ghcr.io/aicage/aicage-image-base:ubuntu",
+                    )
+
+            original = fingerprint()
+            self.assertEqual(original, fingerprint())
+
+            install.write_text("echo v2\n", encoding="utf-8")
+            changed_install = fingerprint()
+            dockerfile.write_text("FROM base\nRUN true\n", encoding="utf-8")
+            changed_dockerfile = fingerprint()
+            changed_version = fingerprint(agent_version="2.0.0")
+
+        self.assertEqual(4, len({original, changed_install, changed_dockerfile, changed_version}))
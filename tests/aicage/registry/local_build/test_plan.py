@@ -1,28 +1,51 @@
 from unittest import TestCase, mock
 
 from aicage.registry.local_build import _plan
+from aicage.registry.local_build._fingerprint import FINGERPRINT_LABEL
 from aicage.registry.local_build._store import BuildRecord
 
 from ._fixtures import build_run_config
 
+_FINGERPRINT = "sha256:fingerprint"
+_LABELS = {FINGERPRINT_LABEL: _FINGERPRINT}
+
 
 class LocalBuildPlanTests(TestCase):
     def test_should_build_when_missing_local_image(self) -> None:
         run_config = build_run_config()
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=False,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=None,
+        ):
+            should_build = _plan.should_build(run_config, None, "sha256:base", _FINGERPRINT)
+        self.assertTrue(should_build)
+
+    def test_should_build_when_fingerprint_changes(self) -> None:
+        run_config = build_run_config()
+        record = BuildRecord(
+            agent="claude",
+            base="ubuntu",
+            agent_version="1.2.3",
+            base_image="ghcr.io/aicage/aicage-image-base:ubuntu",
+            base_digest="sha256:base",
+            image_ref="aicage:claude-ubuntu",
+            built_at="2024-01-01T00:00:00+00:00",
+            fingerprint="sha256:old",
+        )
+        with mock.patch(
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value={FINGERPRINT_LABEL: "sha256:old"},
         ):
-            should_build = _plan.should_build(run_config, None, "sha256:base")
+            should_build = _plan.should_build(run_config, record, "sha256:base", _FINGERPRINT)
         self.assertTrue(should_build)
 
     def test_should_build_when_record_missing(self) -> None:
         run_config = build_run_config()
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=True,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=_LABELS,
         ):
-            should_build = _plan.should_build(run_config, None, "sha256:base")
+            should_build = _plan.should_build(run_config, None, "sha256:base", _FINGERPRINT)
         self.assertTrue(should_build)
 
     def test_should_build_when_agent_version_changes(self) -> None:
@@ -37,10 +60,10 @@ class LocalBuildPlanTests(TestCase):
             built_at="2024-01-01T00:00:00+00:00",
         )
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=True,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=_LABELS,
         ):
-            should_build = _plan.should_build(run_config, record, "sha256:base")
+            should_build = _plan.should_build(run_config, record, "sha256:base", _FINGERPRINT)
         self.assertTrue(should_build)
 
     def test_should_build_when_record_missing_digest(self) -> None:
@@ -55,10 +78,10 @@ class LocalBuildPlanTests(TestCase):
             built_at="2024-01-01T00:00:00+00:00",
         )
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=True,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=_LABELS,
         ):
-            should_build = _plan.should_build(run_config, record, "sha256:base")
+            should_build = _plan.should_build(run_config, record, "sha256:base", _FINGERPRINT)
         self.assertTrue(should_build)
 
     def test_should_build_when_base_digest_changes(self) -> None:
@@ -73,10 +96,10 @@ class LocalBuildPlanTests(TestCase):
             built_at="2024-01-01T00:00:00+00:00",
         )
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=True,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=_LABELS,
         ):
-            should_build = _plan.should_build(run_config, record, "sha256:new")
+            should_build = _plan.should_build(run_config, record, "sha256:new", _FINGERPRINT)
         self.assertTrue(should_build)
 
     def test_should_build_false_when_up_to_date(self) -> None:
@@ -91,8 +114,8 @@ class LocalBuildPlanTests(TestCase):
             built_at="2024-01-01T00:00:00+00:00",
         )
         with mock.patch(
-            "aicage.registry.local_build._plan.local_image_exists",
-            return_value=True,
+            "aicage.registry.local_build._plan._local_query.get_local_image_labels",
+            return_value=_LABELS,
         ):
-            should_build = _plan.should_build(run_config, record, "sha256:base")
+            should_build = _plan.should_build(run_config, record, "sha256:base", _FINGERPRINT)
         self.assertFalse(should_build)
@@ -1,95 +1,146 @@
+import contextlib
+import io
 import tempfile
 from pathlib import Path
 from unittest import TestCase, mock
 
+from aicage.config.global_config import BUILD_CACHE_LOCAL
+from aicage.config.runtime_config import RunConfig
 from aicage.errors import CliError
 from aicage.registry.local_build import _runner
+from aicage.registry.local_build._context import BuildContext
 
 from ._fixtures import build_run_config
 
 
+class _FakeProcess:
+    def __init__(self, returncode: int, output: str = "", stdout: io.TextIOBase | None = None) -> None:
+        self.stdin = io.BytesIO()
+        self.stdin.close = lambda: None  # type: ignore[method-assign]
+        self._returncode = returncode
+        self._output = output
+        self._stdout = stdout
+
+    def wait(self) -> int:
+        if self._stdout is not None:
+            self._stdout.write(self._output)
+        return self._returncode
+
+
 class LocalBuildRunnerTests(TestCase):
-    def test_run_build_invokes_docker(self) -> None:
-        with mock.patch(
-            "aicage.registry.images_metadata.models.find_packaged_path",
-            return_value=Path("/tmp/build/Dockerfile"),
-        ):
-            run_config = build_run_config()
+    def test_run_build_sends_context_tarball_to_docker(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
-            log_path = Path(tmp_dir) / "logs" / "build.log"
-            with (
-                mock.patch(
-                    "aicage.registry.local_build._runner.find_packaged_path",
-                    return_value=Path("/tmp/build/Dockerfile"),
-                ),
-                mock.patch(
-                    "aicage.registry.local_build._runner.subprocess.run",
-                    return_value=mock.Mock(returncode=0),
-                ) as run_mock,
-            ):
-                _runner.run_build(
-                    run_config=run_config,
-                    base_image_ref="ghcr.io/aicage/aicage-image-base:ubuntu",
-                    log_path=log_path,
-                )
-
-        run_mock.assert_called_once()
-        command = run_mock.call_args.args[0]
+            popen_mock, process = self._run_build(build_run_config(), Path(tmp_dir), returncode=0)
+            log_text = (Path(tmp_dir) / "logs" / "build.log").read_text(encoding="utf-8")
+
+        command = popen_mock.call_args.args[0]
         self.assertEqual(
             [
                 "docker",
                 "build",
-                "--no-cache",
+                "--progress=plain",
                 "--file",
-                "/tmp/build/Dockerfile",
+                "Dockerfile",
                 "--build-arg",
                 "BASE_IMAGE=ghcr.io/aicage/aicage-image-base:ubuntu",
                 "--build-arg",
                 "AGENT=claude",
+                "--build-arg",
+                "AGENT_VERSION=1.2.3",
+                "--build-context",
+                f"artifacts={Path(tmp_dir) / 'artifacts'}",
+                "--label",
+                "org.aicage.build.fingerprint=sha256:fingerprint",
                 "--tag",
                 "aicage:claude-ubuntu",
-                "/tmp/build",
+                "-",
             ],
             command,
         )
+        self.assertEqual(b"context-tar", process.stdin.getvalue())
+        self.assertIn("[aicage] build context: 11 B (cached), uploaded in", log_text)
 
-    def test_run_build_raises_on_failure(self) -> None:
-        with mock.patch(
-            "aicage.registry.images_metadata.models.find_packaged_path",
-            return_value=Path("/tmp/build/Dockerfile"),
-        ):
-            run_config = build_run_config()
+    def test_run_build_uses_local_cache_with_buildx(self) -> None:
+        run_config = build_run_config()
+        run_config.global_cfg.build_cache = BUILD_CACHE_LOCAL
         with tempfile.TemporaryDirectory() as tmp_dir:
-            log_path = Path(tmp_dir) / "logs" / "build.log"
+            cache_dir = Path(tmp_dir) / "cache" / "claude-ubuntu"
+            cache_dir.mkdir(parents=True)
+            (cache_dir / "index.json").write_text("{}", encoding="utf-8")
             with (
-                mock.patch(
-                    "aicage.registry.local_build._runner.find_packaged_path",
-                    return_value=Path("/tmp/build/Dockerfile"),
-                ),
-                mock.patch(
-                    "aicage.registry.local_build._runner.subprocess.run",
-                    return_value=mock.Mock(returncode=1),
-                ),
-                self.assertRaises(CliError),
+                mock.patch("aicage.registry.local_build._build_cache._DEFAULT_CACHE_DIR", f"{tmp_dir}/cache"),
+                mock.patch("aicage.registry.local_build._runner.prune_build_cache") as prune_mock,
             ):
-                _runner.run_build(
-                    run_config=run_config,
-                    base_image_ref="ghcr.io/aicage/aicage-image-base:ubuntu",
-                    log_path=log_path,
-                )
-
-    def test_local_image_exists_true_on_success(self) -> None:
-        with mock.patch(
-            "aicage.registry.local_build._runner.subprocess.run",
-            return_value=mock.Mock(returncode=0),
-        ):
-            exists = _runner.local_image_exists("aicage:claude-ubuntu")
-        self.assertTrue(exists)
+                popen_mock, _ = self._run_build(run_config, Path(tmp_dir), returncode=0)
+
+        command = popen_mock.call_args.args[0]
+        self.assertEqual(
+            [
+                "docker",
+                "buildx",
+                "build",
+                "--load",
+                "--cache-from",
+                f"type=local,src={cache_dir}",
+                "--cache-to",
+                f"type=local,dest={cache_dir},mode=max",
+                "--progress=plain",
+            ],
+            command[:9],
+        )
+        prune_mock.assert_called_once_with(cache_dir)
+
+    def test_run_build_logs_cache_hit_rate(self) -> None:
+        output = "\n".join(
+            [
+                "#1 [internal] load build definition from Dockerfile",
+                "#1 DONE 0.0s",
+                "#4 [runtime 1/2] FROM ghcr.io/aicage/aicage-image-base:ubuntu@sha256:abc",
+                "#4 CACHED",
+                "#5 [runtime 2/2] RUN --mount=type=bind,source=agents/,target=/tmp/agents,readonly",
+                "#5 DONE 12.0s",
+                "",
+            ]
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._run_build(build_run_config(), Path(tmp_dir), returncode=0, output=output)
+            log_text = (Path(tmp_dir) / "logs" / "build.log").read_text(encoding="utf-8")
+
+        self.assertTrue(log_text.endswith("[aicage] build cache: 1/2 steps cached (50%)\n"))
+
+    def test_run_build_raises_on_failure(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, self.assertRaises(CliError):
+            self._run_build(build_run_config(), Path(tmp_dir), returncode=1)
+
+    @staticmethod
+    def _run_build(
+        run_config: RunConfig,
+        tmp_dir: Path,
+        returncode: int,
+        output: str = "",
+    ) -> tuple[mock.Mock, _FakeProcess]:
+        context_path = tmp_dir / "context.tar"
+        context_path.write_bytes(b"context-tar")
+        context = BuildContext(path=context_path, size_bytes=11, reused=True)
+        processes: list[_FakeProcess] = []
+
+        def popen(command: list[str], stdin: object, stdout: io.TextIOBase, stderr: object) -> _FakeProcess:
+            processes.append(_FakeProcess(returncode, output, stdout))
+            return processes[-1]
 
-    def test_local_image_exists_false_on_failure(self) -> None:
-        with mock.patch(
-            "aicage.registry.local_build._runner.subprocess.run",
-            return_value=mock.Mock(returncode=1),
+        with (
+            mock.patch(
+                "aicage.registry.local_build._runner.agent_artifacts",
+                return_value=contextlib.nullcontext(tmp_dir / "artifacts"),
+            ),
+            mock.patch("aicage.registry.local_build._runner.build_context", return_value=context),
+            mock.patch("aicage.registry.local_build._runner.subprocess.Popen", side_effect=popen) as popen_mock,
+            mock.patch("sys.stdout", new_callable=io.StringIO),
         ):
-            exists = _runner.local_image_exists("aicage:claude-ubuntu")
-        self.assertFalse(exists)
+            _runner.run_build(
+                run_config=run_config,
+                base_image_ref="ghcr.io/aicage/aicage-image-base:ubuntu",
+                log_path=tmp_dir / "logs" / "build.log",
+                fingerprint="sha256:fingerprint",
+            )
+        return popen_mock, processes[-1]
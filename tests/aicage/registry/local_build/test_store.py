@@ -17,6 +17,7 @@ class LocalBuildStoreTests(TestCase):
                 base_digest="sha256:base",
                 image_ref="aicage:claude-ubuntu",
                 built_at="2024-01-01T00:00:00+00:00",
+                fingerprint="sha256:fingerprint",
             )
             store.save(record)
             loaded = store.load("claude", "ubuntu")
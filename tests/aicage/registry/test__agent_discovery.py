@@ -26,6 +26,16 @@ from aicage.registry.images_metadata.models import (
 
 
 class AgentDiscoveryTests(TestCase):
+    def setUp(self) -> None:
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache_patch = mock.patch(
+            "aicage.registry.custom_agent._cache._DEFAULT_STATE_DIR",
+            cache_dir.name,
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
     def test_discover_agents_returns_release_metadata_when_missing_custom_dir(self) -> None:
         metadata = self._metadata_with_bases(["ubuntu"])
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -0,0 +1,150 @@
+import io
+import socket
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest import TestCase, mock
+
+from aicage.registry import _network_budget
+from aicage.registry._http import RegistryHttpClient, registry_request
+from aicage.registry._network_budget import NetworkBudgetExhausted
+from aicage.registry._rate_limit import RateLimitStore, RegistryRateLimited
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/redirect":
+            self._reply(307, b"", {"Location": "/token"})
+            return
+        if self.path == "/close":
+            self._reply(200, b"bye", {"Connection": "close"})
+            self.close_connection = True
+            return
+        self._reply(200, b'{"token": "abc"}', {"Authorization-Seen": self.headers.get("Authorization", "")})
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._reply(200, b"", {"Docker-Content-Digest": "sha256:abc"})
+
+    def _reply(self, status: int, body: bytes, headers: dict[str, str]) -> None:
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.accepted = 0
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        self.accepted += 1
+        return super().get_request()
+
+
+class RegistryHttpClientTests(TestCase):
+    def setUp(self) -> None:
+        self._server = _CountingServer()
+        thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(self._server.server_close)
+        self.addCleanup(self._server.shutdown)
+        self._base = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._client = RegistryHttpClient()
+        self.addCleanup(self._client.close)
+
+    def test_reuses_keep_alive_connection(self) -> None:
+        token = self._client.request("GET", f"{self._base}/token")
+        head = self._client.request("HEAD", f"{self._base}/v2/repo/manifests/tag")
+        again = self._client.request("GET", f"{self._base}/token")
+
+        self.assertEqual(b'{"token": "abc"}', token.body)
+        self.assertEqual("sha256:abc", head.headers["Docker-Content-Digest"])
+        self.assertEqual(200, again.status)
+        self.assertEqual(1, self._client.connections_opened)
+        self.assertEqual(1, self._server.accepted)
+        self.assertEqual({"GET": 2, "HEAD": 1}, self._client.request_counts())
+        self._client.reset_request_counts()
+        self.assertEqual({}, self._client.request_counts())
+
+    def test_streams_body_into_sink_after_redirect(self) -> None:
+        sink = io.BytesIO()
+
+        response = self._client.request("GET", f"{self._base}/redirect", sink=sink)
+
+        self.assertEqual((200, b""), (response.status, response.body))
+        self.assertEqual(b'{"token": "abc"}', sink.getvalue())
+        self.assertEqual(1, self._client.connections_opened)
+
+    def test_reconnects_when_server_closes(self) -> None:
+        self._client.request("GET", f"{self._base}/close")
+        self._client.request("GET", f"{self._base}/token")
+
+        self.assertEqual(2, self._client.connections_opened)
+
+    def test_follows_redirects_on_same_host(self) -> None:
+        response = self._client.request("GET", f"{self._base}/redirect", {"Authorization": "Bearer t"})
+
+        self.assertEqual(200, response.status)
+        self.assertEqual("Bearer t", response.headers["Authorization-Seen"])
+
+    def test_bounds_idle_pool(self) -> None:
+        client = RegistryHttpClient(max_idle_per_host=0)
+        self.addCleanup(client.close)
+        client.request("GET", f"{self._base}/token")
+        client.request("GET", f"{self._base}/token")
+
+        self.assertEqual(2, client.connections_opened)
+
+    def test_caps_reused_connection_timeout_by_budget(self) -> None:
+        self.addCleanup(_network_budget.clear_network_budget)
+        self._client.request("GET", f"{self._base}/token")
+        _network_budget.start_network_budget(10, 2)
+
+        self._client.request("GET", f"{self._base}/token")
+
+        connection = self._client._idle[("http", "127.0.0.1", self._server.server_address[1])][0]
+        self.assertEqual(2, connection.timeout)
+
+    def test_exhausted_budget_fails_without_connecting(self) -> None:
+        self.addCleanup(_network_budget.clear_network_budget)
+        _network_budget.start_network_budget(10, 2)
+
+        with mock.patch("aicage.registry._network_budget.time.monotonic", return_value=float("inf")):
+            with self.assertRaises(NetworkBudgetExhausted):
+                self._client.request("GET", f"{self._base}/token")
+
+        self.assertEqual(0, self._client.connections_opened)
+
+    def test_unbudgeted_client_ignores_exhausted_budget(self) -> None:
+        self.addCleanup(_network_budget.clear_network_budget)
+        client = RegistryHttpClient(budgeted=False)
+        self.addCleanup(client.close)
+        _network_budget.start_network_budget(10, 2)
+
+        with mock.patch("aicage.registry._network_budget.time.monotonic", return_value=float("inf")):
+            response = client.request("GET", f"{self._base}/token")
+
+        self.assertEqual(200, response.status)
+
+    def test_registry_request_holds_back_rate_limited_host(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch("aicage.registry._rate_limit._DEFAULT_STATE_DIR", tmp_dir):
+                RateLimitStore().observe(f"127.0.0.1:{self._server.server_address[1]}", 429, {"Retry-After": "60"})
+
+                with self.assertRaises(RegistryRateLimited):
+                    registry_request("GET", f"{self._base}/token")
+
+        self.assertEqual(0, self._server.accepted)
@@ -0,0 +1,102 @@
+import tempfile
+import time
+from unittest import TestCase, mock
+
+from aicage.config.global_config import GlobalConfig, RegistryMirror
+from aicage.registry import _mirrors
+from aicage.registry._http import HttpResponse
+from aicage.registry._mirrors import MirrorHealth, MirrorHealthStore
+from aicage.registry._network_budget import NetworkBudgetExhausted
+from aicage.registry._rate_limit import RegistryRateLimited
+
+_NEAR = RegistryMirror(registry="near:5000", api_url="http://near:5000/v2")
+_FAR = RegistryMirror(registry="far:5000", api_url="http://far:5000/v2")
+
+
+class MirrorsTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch("aicage.registry._mirrors._DEFAULT_STATE_DIR", tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ranked_mirrors_orders_by_latency_and_drops_unhealthy(self) -> None:
+        down = RegistryMirror(registry="down:5000", api_url="http://down:5000/v2")
+        store = MirrorHealthStore()
+        now = time.time()
+        store.save(_FAR.api_url, MirrorHealth(healthy=True, latency_seconds=0.4, checked_at=now))
+        store.save(_NEAR.api_url, MirrorHealth(healthy=True, latency_seconds=0.05, checked_at=now))
+        store.save(down.api_url, MirrorHealth(healthy=False, latency_seconds=0.01, checked_at=now))
+
+        with mock.patch("aicage.registry._mirrors.registry_request") as request_mock:
+            ranked = _mirrors.ranked_mirrors(_global_config([_FAR, down, _NEAR]))
+
+        self.assertEqual([_NEAR, _FAR], ranked)
+        request_mock.assert_not_called()
+
+    def test_ranked_mirrors_probes_stale_measurements(self) -> None:
+        MirrorHealthStore().save(
+            _NEAR.api_url,
+            MirrorHealth(healthy=False, latency_seconds=1.0, checked_at=time.time() - 3600),
+        )
+
+        with mock.patch(
+            "aicage.registry._mirrors.registry_request",
+            return_value=HttpResponse(status=401, headers={}, body=b""),
+        ) as request_mock:
+            ranked = _mirrors.ranked_mirrors(_global_config([_NEAR]))
+
+        self.assertEqual([_NEAR], ranked)
+        request_mock.assert_called_once_with("GET", "http://near:5000/v2/")
+        health = MirrorHealthStore().load(_NEAR.api_url)
+        self.assertIsNotNone(health)
+        self.assertTrue(health.healthy)
+
+    def test_probe_mirror_marks_unreachable_mirror_unhealthy(self) -> None:
+        with mock.patch("aicage.registry._mirrors.registry_request", side_effect=OSError("refused")):
+            health = _mirrors.probe_mirror(_NEAR)
+
+        self.assertFalse(health.healthy)
+
+    def test_ranked_mirrors_keeps_health_when_probe_is_not_sent(self) -> None:
+        checked_at = time.time() - 3600
+        MirrorHealthStore().save(_NEAR.api_url, MirrorHealth(healthy=True, latency_seconds=0.1, checked_at=checked_at))
+
+        for error in (NetworkBudgetExhausted("budget"), RegistryRateLimited("rate limited")):
+            with mock.patch("aicage.registry._mirrors.registry_request", side_effect=error):
+                self.assertIsNone(_mirrors.probe_mirror(_FAR))
+                ranked = _mirrors.ranked_mirrors(_global_config([_NEAR, _FAR]))
+
+            self.assertEqual([_NEAR], ranked)
+            self.assertIsNone(MirrorHealthStore().load(_FAR.api_url))
+            self.assertEqual(checked_at, MirrorHealthStore().load(_NEAR.api_url).checked_at)
+
+    def test_mirror_image_refs_pins_upstream_images_to_digest(self) -> None:
+        global_cfg = _global_config([_NEAR, _FAR])
+        image_ref = "ghcr.io/aicage/aicage:codex-ubuntu"
+
+        self.assertEqual(
+            ["near:5000/aicage/aicage@sha256:abc", "far:5000/aicage/aicage@sha256:abc"],
+            _mirrors.mirror_image_refs(image_ref, "sha256:abc", global_cfg, [_NEAR, _FAR]),
+        )
+        self.assertEqual([], _mirrors.mirror_image_refs(image_ref, None, global_cfg, [_NEAR]))
+        self.assertEqual([], _mirrors.mirror_image_refs("aicage:codex-ubuntu", "sha256:abc", global_cfg, [_NEAR]))
+        self.assertEqual(
+            [], _mirrors.mirror_image_refs("docker.io/library/ubuntu:24.04", "sha256:abc", global_cfg, [_NEAR])
+        )
+
+
+def _global_config(mirrors: list[RegistryMirror]) -> GlobalConfig:
+    return GlobalConfig(
+        image_registry="ghcr.io",
+        image_registry_api_url="https://ghcr.io/v2",
+        image_registry_api_token_url="https://ghcr.io/token?service=ghcr.io&scope=repository",
+        image_repository="aicage/aicage",
+        image_base_repository="aicage/aicage-image-base",
+        default_image_base="ubuntu",
+        version_check_image="ghcr.io/aicage/aicage-image-util:agent-version",
+        local_image_repository="aicage",
+        agents={},
+        registry_mirrors=mirrors,
+    )
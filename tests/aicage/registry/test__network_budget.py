@@ -0,0 +1,38 @@
+from unittest import TestCase, mock
+
+from aicage.registry import _network_budget
+from aicage.registry._network_budget import NetworkBudgetExhausted
+
+_MONOTONIC = "aicage.registry._network_budget.time.monotonic"
+
+
+class NetworkBudgetTests(TestCase):
+    def setUp(self) -> None:
+        self.addCleanup(_network_budget.clear_network_budget)
+
+    def test_request_timeout_defaults_without_budget(self) -> None:
+        self.assertEqual(30, _network_budget.request_timeout(30))
+        self.assertFalse(_network_budget.network_budget_exhausted())
+
+    def test_request_timeout_is_capped_by_remaining_budget(self) -> None:
+        with mock.patch(_MONOTONIC, return_value=100.0):
+            _network_budget.start_network_budget(10, 5)
+        with mock.patch(_MONOTONIC, return_value=101.0):
+            self.assertEqual(5, _network_budget.request_timeout(30))
+        with mock.patch(_MONOTONIC, return_value=108.0):
+            self.assertEqual(2, _network_budget.request_timeout(30))
+
+    def test_exhausted_budget_raises_and_logs_skipped_check(self) -> None:
+        with mock.patch(_MONOTONIC, return_value=100.0):
+            _network_budget.start_network_budget(10, 5)
+        with (
+            mock.patch(_MONOTONIC, return_value=110.0),
+            mock.patch("aicage.registry._network_budget.get_logger") as logger_mock,
+        ):
+            with self.assertRaises(NetworkBudgetExhausted):
+                _network_budget.request_timeout(30)
+            self.assertTrue(_network_budget.network_budget_exhausted())
+            _network_budget.log_skipped_freshness_check("repo:tag")
+
+        logger_mock.return_value.warning.assert_called_once()
+        self.assertEqual("repo:tag", logger_mock.return_value.warning.call_args.args[1])
@@ -0,0 +1,41 @@
+from unittest import TestCase, mock
+
+from docker.errors import DockerException
+
+from aicage.registry import _platform
+from aicage.registry._platform import Platform
+
+
+class PlatformTests(TestCase):
+    def test_select_platform_manifest_matches_os_and_architecture(self) -> None:
+        entries = [
+            {"digest": "sha256:att", "platform": {"os": "unknown", "architecture": "unknown"}},
+            {"digest": "sha256:amd", "platform": {"os": "linux", "architecture": "amd64"}},
+            {"digest": "sha256:arm", "platform": {"os": "linux", "architecture": "arm64", "variant": "v8"}},
+        ]
+
+        self.assertEqual(
+            "sha256:arm",
+            _platform.select_platform_manifest(entries, Platform(os="linux", architecture="arm64")),
+        )
+        self.assertIsNone(_platform.select_platform_manifest(entries, Platform(os="linux", architecture="s390x")))
+
+    def test_get_local_platform_returns_none_without_daemon(self) -> None:
+        _platform._daemon_platform.cache_clear()
+        self.addCleanup(_platform._daemon_platform.cache_clear)
+        with mock.patch(
+            "aicage.registry._platform.get_docker_client",
+            side_effect=DockerException("no daemon"),
+        ):
+            self.assertIsNone(_platform.get_local_platform())
+
+    def test_get_local_platform_reads_daemon_version(self) -> None:
+        _platform._daemon_platform.cache_clear()
+        self.addCleanup(_platform._daemon_platform.cache_clear)
+        client = mock.Mock()
+        client.version.return_value = {"Os": "linux", "Arch": "amd64"}
+        with mock.patch("aicage.registry._platform.get_docker_client", return_value=client):
+            self.assertEqual(Platform(os="linux", architecture="amd64"), _platform.get_local_platform())
+            _platform.get_local_platform()
+
+        client.version.assert_called_once()
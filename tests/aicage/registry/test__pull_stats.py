@@ -0,0 +1,23 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from aicage.registry._pull_stats import PullStats, PullStatsStore
+
+
+class PullStatsStoreTests(TestCase):
+    def test_record_appends_and_load_skips_malformed_lines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = PullStatsStore(base_dir=Path(tmp_dir))
+            first = PullStats("repo:one", 1.0, 2.5, 4096, 3, 1, True)
+            second = PullStats("repo:two", 5.0, 0.5, 0, 0, 0, False)
+            store.record(first)
+            with (Path(tmp_dir) / "pulls.jsonl").open("a", encoding="utf-8") as handle:
+                handle.write("not json\n")
+            store.record(second)
+
+            self.assertEqual([first, second], store.load())
+
+    def test_load_returns_empty_without_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertEqual([], PullStatsStore(base_dir=Path(tmp_dir)).load())
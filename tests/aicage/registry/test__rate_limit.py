@@ -0,0 +1,45 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.registry._rate_limit import RateLimitStore
+
+
+class RateLimitStoreTests(TestCase):
+    def test_too_many_requests_honors_retry_after(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RateLimitStore(base_dir=Path(tmp_dir))
+            store.observe("ghcr.io", 429, {"Retry-After": "120"})
+
+            until = store.blocked_until("ghcr.io")
+            self.assertIsNotNone(until)
+            assert until is not None
+            self.assertAlmostEqual(time.time() + 120, until, delta=5)
+            self.assertIsNone(store.blocked_until("registry-1.docker.io"))
+
+    def test_exhausted_docker_hub_limit_backs_off_for_capped_window(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RateLimitStore(base_dir=Path(tmp_dir))
+            store.observe("registry-1.docker.io", 200, {"RateLimit-Remaining": "0;w=21600"})
+
+            until = store.blocked_until("registry-1.docker.io")
+            assert until is not None
+            self.assertAlmostEqual(time.time() + 3600, until, delta=5)
+
+    def test_remaining_requests_do_not_back_off(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RateLimitStore(base_dir=Path(tmp_dir))
+            store.observe("ghcr.io", 200, {"X-RateLimit-Remaining": "12"})
+            store.observe("ghcr.io", 404, {})
+
+            self.assertIsNone(store.blocked_until("ghcr.io"))
+            self.assertFalse((Path(tmp_dir) / "hosts.json").exists())
+
+    def test_backoff_expires(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RateLimitStore(base_dir=Path(tmp_dir))
+            store.observe("ghcr.io", 429, {})
+
+            with mock.patch("aicage.registry._rate_limit.time.time", return_value=time.time() + 61):
+                self.assertIsNone(store.blocked_until("ghcr.io"))
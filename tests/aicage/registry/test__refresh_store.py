@@ -0,0 +1,35 @@
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from aicage.registry._refresh_store import RESULT_UPDATED, RefreshState, RefreshStore
+
+_IMAGE_REF = "ghcr.io/aicage/aicage:codex-ubuntu"
+
+
+class RefreshStoreTests(TestCase):
+    def test_save_and_load_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RefreshStore(base_dir=Path(tmp_dir))
+            state = RefreshState(checked_at=123.0, result=RESULT_UPDATED, message="")
+            store.save(_IMAGE_REF, state)
+
+            self.assertEqual(state, store.load(_IMAGE_REF))
+            self.assertIsNone(store.load("ghcr.io/aicage/aicage:other"))
+
+    def test_is_fresh_respects_max_age(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = RefreshStore(base_dir=Path(tmp_dir))
+            self.assertFalse(store.is_fresh(_IMAGE_REF, 60))
+
+            store.save(_IMAGE_REF, RefreshState(checked_at=time.time() - 30))
+
+            self.assertTrue(store.is_fresh(_IMAGE_REF, 60))
+            self.assertFalse(store.is_fresh(_IMAGE_REF, 10))
+
+    def test_load_tolerates_corrupt_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "images.json").write_text("{not json", encoding="utf-8")
+
+            self.assertIsNone(RefreshStore(base_dir=Path(tmp_dir)).load(_IMAGE_REF))
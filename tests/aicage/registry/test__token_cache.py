@@ -0,0 +1,42 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest import TestCase
+
+from aicage.registry._token_cache import TokenCache
+
+_TOKEN_URL = "https://ghcr.io/token?service=ghcr.io&scope=repository"
+
+
+class TokenCacheTests(TestCase):
+    def test_load_returns_token_for_any_cached_scope(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TokenCache(base_dir=Path(tmp_dir))
+            cache.save(_TOKEN_URL, ["aicage/aicage", "aicage/aicage-image-base"], "abc", time.time() + 60)
+
+            self.assertEqual("abc", cache.load(_TOKEN_URL, "aicage/aicage-image-base"))
+            self.assertIsNone(cache.load(_TOKEN_URL, "other/repo"))
+            self.assertIsNone(cache.load("https://other.test/token", "aicage/aicage"))
+
+    def test_load_ignores_expired_tokens(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TokenCache(base_dir=Path(tmp_dir))
+            cache.save(_TOKEN_URL, ["aicage/aicage"], "abc", time.time() - 1)
+
+            self.assertIsNone(cache.load(_TOKEN_URL, "aicage/aicage"))
+
+    def test_save_writes_private_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = TokenCache(base_dir=Path(tmp_dir))
+            cache.save(_TOKEN_URL, ["aicage/aicage"], "abc", time.time() + 60)
+
+            mode = os.stat(Path(tmp_dir) / "tokens.json").st_mode & 0o777
+        self.assertEqual(0o600, mode)
+
+    def test_load_tolerates_corrupt_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            (Path(tmp_dir) / "tokens.json").write_text("{not json", encoding="utf-8")
+            cache = TokenCache(base_dir=Path(tmp_dir))
+
+            self.assertIsNone(cache.load(_TOKEN_URL, "aicage/aicage"))
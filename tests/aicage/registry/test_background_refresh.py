@@ -0,0 +1,135 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.config.global_config import GlobalConfig
+from aicage.errors import CliError
+from aicage.registry import background_refresh
+from aicage.registry._refresh_store import (
+    RESULT_CURRENT,
+    RESULT_FAILED,
+    RESULT_UPDATED,
+    RefreshState,
+    RefreshStore,
+)
+
+_IMAGE_REF = "ghcr.io/aicage/aicage:codex-ubuntu"
+
+
+class BackgroundRefreshTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self._tmp_path = Path(tmp_dir.name)
+        for target, name in (
+            ("aicage.registry._refresh_store._DEFAULT_STATE_DIR", "state"),
+            ("aicage.registry._logs._DEFAULT_REFRESH_LOG_DIR", "logs"),
+        ):
+            patcher = mock.patch(target, str(self._tmp_path / name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_report_prints_result_once(self) -> None:
+        RefreshStore().save(_IMAGE_REF, RefreshState(checked_at=1.0, result=RESULT_UPDATED))
+
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            background_refresh.report_background_refresh(_IMAGE_REF)
+            background_refresh.report_background_refresh(_IMAGE_REF)
+
+        self.assertEqual(f"[aicage] Background refresh updated {_IMAGE_REF}.\n", stdout.getvalue())
+        self.assertEqual(RefreshState(checked_at=1.0), RefreshStore().load(_IMAGE_REF))
+
+    def test_refresh_image_records_update(self) -> None:
+        with (
+            mock.patch(
+                "aicage.registry.background_refresh._local_query.get_local_image_id",
+                side_effect=["sha256:old", "sha256:new"],
+            ),
+            mock.patch("aicage.registry.background_refresh.load_images_metadata", return_value=_images_metadata()),
+            mock.patch("aicage.registry.background_refresh.with_agent_version", side_effect=lambda cfg: cfg),
+            mock.patch("aicage.registry.background_refresh.pull_image") as pull_mock,
+        ):
+            background_refresh.refresh_image(_payload())
+
+        pull_mock.assert_called_once()
+        self.assertTrue(pull_mock.call_args.args[0].refresh)
+        state = RefreshStore().load(_IMAGE_REF)
+        assert state is not None
+        self.assertEqual(RESULT_UPDATED, state.result)
+        self.assertGreater(state.checked_at, 0)
+
+    def test_refresh_image_records_current_image(self) -> None:
+        with (
+            mock.patch(
+                "aicage.registry.background_refresh._local_query.get_local_image_id",
+                return_value="sha256:same",
+            ),
+            mock.patch("aicage.registry.background_refresh.load_images_metadata", return_value=_images_metadata()),
+            mock.patch("aicage.registry.background_refresh.with_agent_version", side_effect=lambda cfg: cfg),
+            mock.patch("aicage.registry.background_refresh.pull_image"),
+        ):
+            background_refresh.refresh_image(_payload())
+
+        state = RefreshStore().load(_IMAGE_REF)
+        assert state is not None
+        self.assertEqual(RESULT_CURRENT, state.result)
+
+    def test_refresh_image_records_failure_without_extending_freshness(self) -> None:
+        RefreshStore().save(_IMAGE_REF, RefreshState(checked_at=5.0))
+        with (
+            mock.patch(
+                "aicage.registry.background_refresh._local_query.get_local_image_id",
+                return_value="sha256:same",
+            ),
+            mock.patch("aicage.registry.background_refresh.load_images_metadata", return_value=_images_metadata()),
+            mock.patch("aicage.registry.background_refresh.with_agent_version", side_effect=lambda cfg: cfg),
+            mock.patch("aicage.registry.background_refresh.pull_image", side_effect=CliError("pull failed")),
+        ):
+            background_refresh.refresh_image(_payload())
+
+        self.assertEqual(
+            RefreshState(checked_at=5.0, result=RESULT_FAILED, message="pull failed"),
+            RefreshStore().load(_IMAGE_REF),
+        )
+
+    def test_start_background_refresh_spawns_detached_worker(self) -> None:
+        with (
+            mock.patch("aicage.registry.background_refresh.load_images_metadata", return_value=_images_metadata()),
+            mock.patch.dict("os.environ", {"AICAGE_TRACE": "/tmp/trace.json"}),
+            mock.patch("aicage.registry.background_refresh.subprocess.Popen") as popen_mock,
+        ):
+            background_refresh.start_background_refresh(background_refresh._run_config(_payload()))
+
+        kwargs = popen_mock.call_args.kwargs
+        self.assertEqual(["-m", "aicage.registry.background_refresh"], popen_mock.call_args.args[0][1:])
+        self.assertTrue(kwargs["start_new_session"])
+        self.assertNotIn("AICAGE_TRACE", kwargs["env"])
+        written = popen_mock.return_value.stdin.write.call_args.args[0]
+        self.assertEqual(_IMAGE_REF, json.loads(written)["image_ref"])
+
+
+def _payload() -> dict[str, object]:
+    return {
+        "project_path": "/tmp/project",
+        "agent": "codex",
+        "base": "ubuntu",
+        "image_ref": _IMAGE_REF,
+        "global_config": GlobalConfig(
+            image_registry="ghcr.io",
+            image_registry_api_url="https://ghcr.io/v2",
+            image_registry_api_token_url="https://ghcr.io/token?service=ghcr.io&scope=repository",
+            image_repository="aicage/aicage",
+            image_base_repository="aicage/aicage-image-base",
+            default_image_base="ubuntu",
+            version_check_image="ghcr.io/aicage/aicage-image-util:agent-version",
+            local_image_repository="aicage",
+        ).to_mapping(),
+    }
+
+
+def _images_metadata() -> mock.Mock:
+    metadata = mock.Mock()
+    metadata.agents = {"codex": mock.Mock(local_definition_dir=None)}
+    return metadata
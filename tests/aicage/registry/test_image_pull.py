@@ -1,12 +1,17 @@
 import io
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 from unittest import TestCase, mock
 
-from aicage.config.global_config import GlobalConfig
+from docker.errors import APIError, ImageNotFound
+
+from aicage.config.global_config import GlobalConfig, RegistryMirror
 from aicage.config.runtime_config import RunConfig
 from aicage.errors import CliError
-from aicage.registry import image_pull
+from aicage.registry import _pull_decision, _pull_runner, image_pull
+from aicage.registry._pull_stats import PullStatsStore
+from aicage.registry._remote_query import RemoteDigest
 from aicage.registry.images_metadata.models import (
     _AGENT_KEY,
     _AICAGE_IMAGE_BASE_KEY,
@@ -27,23 +32,14 @@ from aicage.registry.images_metadata.models import (
 )
 
 
-class FakeCompleted:
-    def __init__(self, stdout: str = "", stderr: str = "", returncode: int = 0):
-        self.stdout = stdout
-        self.stderr = stderr
-        self.returncode = returncode
-
-
-class FakeProcess:
-    def __init__(self, output: str = "", returncode: int = 0) -> None:
-        self.stdout = io.StringIO(output)
-        self.returncode = returncode
-
-    def wait(self) -> int:
-        return self.returncode
-
-
 class DockerInvocationTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch("aicage.registry._pull_stats._DEFAULT_STATE_DIR", tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def _build_run_config(self, image_ref: str) -> RunConfig:
         return RunConfig(
             project_path=Path("/tmp/project"),
@@ -96,10 +92,15 @@ class DockerInvocationTests(TestCase):
 
     def test_pull_image_success_and_warning(self) -> None:
         run_config = self._build_run_config("repo:tag")
-        pull_ok = FakeProcess(
-            output="repo:tag\n",
-            returncode=0,
-        )
+        events = [
+            {"status": "Pulling from org/repo", "id": "tag"},
+            {"status": "Pulling fs layer", "id": "abc123"},
+            {"status": "Already exists", "id": "def456"},
+            {"status": "Downloading", "id": "abc123", "progressDetail": {"current": 512, "total": 2048}},
+            {"status": "Download complete", "id": "abc123"},
+            {"status": "Pull complete", "id": "abc123"},
+            {"status": "Status: Downloaded newer image for repo:tag"},
+        ]
         with tempfile.TemporaryDirectory() as tmp_dir:
             log_path = Path(tmp_dir) / "pull.log"
             with (
@@ -108,61 +109,38 @@ class DockerInvocationTests(TestCase):
                     return_value=None,
                 ),
                 mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo"
+                    "aicage.registry._pull_decision._remote_query.get_remote_digest"
                 ) as remote_mock,
                 mock.patch(
-                    "aicage.registry._pull_runner.subprocess.Popen",
-                    return_value=pull_ok,
-                ) as popen_mock,
-                mock.patch("aicage.registry._pull_runner.subprocess.run") as run_mock,
+                    "aicage.registry._pull_runner.get_docker_client",
+                    return_value=_docker_client(events),
+                ) as client_mock,
                 mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
                 mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
             ):
                 image_pull.pull_image(run_config)
             remote_mock.assert_not_called()
-            popen_mock.assert_called_once()
-            run_mock.assert_not_called()
-            self.assertIn("Pulling image repo:tag", stdout.getvalue())
-            self.assertIn("repo:tag", log_path.read_text(encoding="utf-8"))
-
-        pull_download = FakeProcess(
-            output=(
-                "repo:tag: Pulling from org/repo\n"
-                "abc123: Pulling fs layer\n"
-                "abc123: Downloading\n"
-                "Status: Downloaded newer image for repo:tag\n"
-            ),
-            returncode=0,
-        )
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            log_path = Path(tmp_dir) / "pull.log"
-            with (
-                mock.patch(
-                    "aicage.registry._pull_decision._local_query.get_local_repo_digest",
-                    return_value=None,
-                ),
-                mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo"
-                ) as remote_mock,
-                mock.patch(
-                    "aicage.registry._pull_runner.subprocess.Popen",
-                    return_value=pull_download,
-                ) as popen_mock,
-                mock.patch("aicage.registry._pull_runner.subprocess.run") as run_mock,
-                mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
-                mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
-            ):
-                image_pull.pull_image(run_config)
-            remote_mock.assert_not_called()
-            popen_mock.assert_called_once()
-            run_mock.assert_not_called()
+            client_mock.return_value.api.pull.assert_called_once_with("repo:tag", stream=True, decode=True)
+            client_mock.return_value.images.get.assert_not_called()
             output = stdout.getvalue()
             self.assertIn("Pulling image repo:tag", output)
+            self.assertIn("Pulled repo:tag: 0.0 MiB", output)
+            self.assertIn("1/2 layers downloaded", output)
             self.assertNotIn("Pulling fs layer", output)
-            self.assertIn("Pulling fs layer", log_path.read_text(encoding="utf-8"))
+            self.assertIn("abc123: Pulling fs layer", log_path.read_text(encoding="utf-8"))
+            stats = PullStatsStore().load()
+            self.assertEqual(1, len(stats))
+            self.assertEqual(
+                ("repo:tag", 2048, 2, 1, True),
+                (
+                    stats[0].image_ref,
+                    stats[0].downloaded_bytes,
+                    stats[0].layers,
+                    stats[0].cached_layers,
+                    stats[0].succeeded,
+                ),
+            )
 
-        pull_fail = FakeProcess(output="timeout\n", returncode=1)
-        inspect_ok = FakeCompleted(returncode=0)
         with tempfile.TemporaryDirectory() as tmp_dir:
             log_path = Path(tmp_dir) / "pull.log"
             with (
@@ -171,22 +149,82 @@ class DockerInvocationTests(TestCase):
                     return_value=None,
                 ),
                 mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo"
+                    "aicage.registry._pull_decision._remote_query.get_remote_digest"
                 ) as remote_mock,
-                mock.patch("aicage.registry._pull_runner.subprocess.Popen", return_value=pull_fail),
-                mock.patch("aicage.registry._pull_runner.subprocess.run", return_value=inspect_ok),
+                mock.patch(
+                    "aicage.registry._pull_runner.get_docker_client",
+                    return_value=_docker_client([{"error": "timeout"}]),
+                ),
                 mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
                 mock.patch("sys.stderr", new_callable=io.StringIO) as stderr,
                 mock.patch("sys.stdout", new_callable=io.StringIO),
             ):
                 image_pull.pull_image(run_config)
             remote_mock.assert_not_called()
-            self.assertIn("Warning", stderr.getvalue())
+            self.assertIn("Warning: timeout", stderr.getvalue())
+            self.assertFalse(PullStatsStore().load()[-1].succeeded)
+
+    def test_run_pull_returns_downloaded_bytes(self) -> None:
+        events = [
+            {"status": "Already exists", "id": "def456"},
+            {"status": "Downloading", "id": "abc123", "progressDetail": {"current": 512, "total": 2048}},
+            {"status": "Download complete", "id": "abc123"},
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with (
+                mock.patch("aicage.registry._pull_runner.get_docker_client", return_value=_docker_client(events)),
+                mock.patch("sys.stdout", new_callable=io.StringIO),
+            ):
+                downloaded = _pull_runner.run_pull("repo:tag", Path(tmp_dir) / "pull.log", progress=False)
+
+        self.assertEqual(2048, downloaded)
+
+    def test_run_pull_tags_image_pulled_from_mirror(self) -> None:
+        client = _docker_client([{"status": "Status: Downloaded newer image"}])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with (
+                mock.patch("aicage.registry._pull_runner.get_docker_client", return_value=client),
+                mock.patch("sys.stdout", new_callable=io.StringIO),
+            ):
+                _pull_runner.run_pull(
+                    "ghcr.io/aicage/aicage:codex-ubuntu",
+                    Path(tmp_dir) / "pull.log",
+                    mirror_refs=["localhost:5000/aicage/aicage@sha256:abc"],
+                )
+
+        client.api.pull.assert_called_once_with("localhost:5000/aicage/aicage@sha256:abc", stream=True, decode=True)
+        client.api.tag.assert_called_once_with(
+            "localhost:5000/aicage/aicage@sha256:abc", "ghcr.io/aicage/aicage", "codex-ubuntu"
+        )
+
+    def test_run_pull_falls_back_upstream_when_mirror_fails(self) -> None:
+        client = _docker_client([])
+        client.api.pull.side_effect = [
+            iter([{"error": "manifest unknown"}]),
+            iter([{"status": "Status: Downloaded newer image"}]),
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with (
+                mock.patch("aicage.registry._pull_runner.get_docker_client", return_value=client),
+                mock.patch("sys.stdout", new_callable=io.StringIO),
+            ):
+                _pull_runner.run_pull(
+                    "ghcr.io/aicage/aicage:codex-ubuntu",
+                    Path(tmp_dir) / "pull.log",
+                    mirror_refs=["localhost:5000/aicage/aicage@sha256:abc"],
+                )
+
+        self.assertEqual(
+            ["localhost:5000/aicage/aicage@sha256:abc", "ghcr.io/aicage/aicage:codex-ubuntu"],
+            [call.args[0] for call in client.api.pull.call_args_list],
+        )
+        client.api.tag.assert_not_called()
+        self.assertEqual([False, True], [stats.succeeded for stats in PullStatsStore().load()])
 
     def test_pull_image_raises_on_missing_local(self) -> None:
         run_config = self._build_run_config("repo:tag")
-        pull_fail = FakeProcess(output="network down\n", returncode=1)
-        inspect_fail = FakeCompleted(returncode=1, stderr="missing", stdout="")
+        client = _docker_client([], local_image=False)
+        client.api.pull.side_effect = APIError("pull failed", explanation="network down")
         with tempfile.TemporaryDirectory() as tmp_dir:
             log_path = Path(tmp_dir) / "pull.log"
             with (
@@ -195,16 +233,39 @@ class DockerInvocationTests(TestCase):
                     return_value=None,
                 ),
                 mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo"
+                    "aicage.registry._pull_decision._remote_query.get_remote_digest"
                 ) as remote_mock,
-                mock.patch("aicage.registry._pull_runner.subprocess.Popen", return_value=pull_fail),
-                mock.patch("aicage.registry._pull_runner.subprocess.run", return_value=inspect_fail),
+                mock.patch("aicage.registry._pull_runner.get_docker_client", return_value=client),
                 mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
                 mock.patch("sys.stdout", new_callable=io.StringIO),
             ):
-                with self.assertRaises(CliError):
+                with self.assertRaises(CliError) as ctx:
                     image_pull.pull_image(run_config)
             remote_mock.assert_not_called()
+            self.assertEqual("network down", str(ctx.exception))
+
+    def test_pull_image_pulls_missing_image_from_mirror_by_upstream_digest(self) -> None:
+        run_config = self._build_run_config("ghcr.io/aicage/aicage:codex-ubuntu")
+        mirror = RegistryMirror(registry="localhost:5000", api_url="http://localhost:5000/v2")
+        run_config = replace(run_config, global_cfg=replace(run_config.global_cfg, registry_mirrors=[mirror]))
+        with (
+            mock.patch(
+                "aicage.registry._pull_decision._local_query.get_local_repo_digest",
+                return_value=None,
+            ),
+            mock.patch(
+                "aicage.registry._pull_decision._remote_query.get_remote_digest",
+                return_value=RemoteDigest("sha256:upstream"),
+            ),
+            mock.patch("aicage.registry._mirrors.ranked_mirrors", return_value=[mirror]),
+            mock.patch("aicage.registry.image_pull.run_pull") as run_pull_mock,
+        ):
+            image_pull.pull_image(run_config)
+
+        self.assertEqual(
+            ["localhost:5000/aicage/aicage@sha256:upstream"],
+            run_pull_mock.call_args.kwargs["mirror_refs"],
+        )
 
     def test_pull_image_skips_when_up_to_date(self) -> None:
         run_config = self._build_run_config("repo:tag")
@@ -216,17 +277,56 @@ class DockerInvocationTests(TestCase):
                     return_value="same",
                 ),
                 mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo",
-                    return_value="same",
+                    "aicage.registry._pull_decision._remote_query.get_remote_digest",
+                    return_value=RemoteDigest("same"),
                 ),
-                mock.patch("aicage.registry._pull_runner.subprocess.Popen") as popen_mock,
+                mock.patch("aicage.registry._pull_runner.get_docker_client") as client_mock,
                 mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
                 mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
             ):
                 image_pull.pull_image(run_config)
-            popen_mock.assert_not_called()
+            client_mock.assert_not_called()
             self.assertEqual("", stdout.getvalue())
 
+    def test_pull_image_skips_when_only_other_platforms_changed(self) -> None:
+        run_config = self._build_run_config("repo:tag")
+        with (
+            mock.patch(
+                "aicage.registry._pull_decision._local_query.get_local_repo_digest",
+                return_value="sha256:old-index",
+            ),
+            mock.patch(
+                "aicage.registry._pull_decision._local_query.get_local_image_id",
+                return_value="sha256:config",
+            ),
+            mock.patch(
+                "aicage.registry._pull_decision._remote_query.get_remote_digest",
+                return_value=RemoteDigest("sha256:new-index", config_digest="sha256:config"),
+            ),
+            mock.patch("aicage.registry._pull_runner.get_docker_client") as client_mock,
+        ):
+            image_pull.pull_image(run_config)
+        client_mock.assert_not_called()
+
+    def test_pull_image_pulls_when_platform_config_changed(self) -> None:
+        run_config = self._build_run_config("repo:tag")
+        with (
+            mock.patch(
+                "aicage.registry._pull_decision._local_query.get_local_repo_digest",
+                return_value="sha256:old-index",
+            ),
+            mock.patch(
+                "aicage.registry._pull_decision._local_query.get_local_image_id",
+                return_value="sha256:old-config",
+            ),
+            mock.patch(
+                "aicage.registry._pull_decision._remote_query.get_remote_digest",
+                return_value=RemoteDigest("sha256:new-index", config_digest="sha256:new-config"),
+            ),
+        ):
+            decision = _pull_decision.decide_pull(run_config)
+        self.assertTrue(decision.should_pull)
+
     def test_pull_image_skips_when_remote_unknown(self) -> None:
         run_config = self._build_run_config("repo:tag")
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -237,13 +337,21 @@ class DockerInvocationTests(TestCase):
                     return_value="local",
                 ),
                 mock.patch(
-                    "aicage.registry._pull_decision._remote_query.get_remote_repo_digest_for_repo",
+                    "aicage.registry._pull_decision._remote_query.get_remote_digest",
                     return_value=None,
                 ),
-                mock.patch("aicage.registry._pull_runner.subprocess.Popen") as popen_mock,
+                mock.patch("aicage.registry._pull_runner.get_docker_client") as client_mock,
                 mock.patch("aicage.registry.image_pull.pull_log_path", return_value=log_path),
                 mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
             ):
                 image_pull.pull_image(run_config)
-            popen_mock.assert_not_called()
+            client_mock.assert_not_called()
             self.assertEqual("", stdout.getvalue())
+
+
+def _docker_client(events: list[dict[str, object]], local_image: bool = True) -> mock.Mock:
+    client = mock.Mock()
+    client.api.pull.return_value = iter(events)
+    if not local_image:
+        client.images.get.side_effect = ImageNotFound("missing")
+    return client
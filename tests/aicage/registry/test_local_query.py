@@ -27,8 +27,8 @@ from aicage.registry.images_metadata.models import (
 
 
 class FakeImage:
-    def __init__(self, repo_digests: object):
-        self.attrs = {"RepoDigests": repo_digests}
+    def __init__(self, repo_digests: object, labels: object = None):
+        self.attrs = {"RepoDigests": repo_digests, "Config": {"Labels": labels}}
 
 
 class FakeImages:
@@ -103,24 +103,57 @@ class LocalQueryTests(TestCase):
             "aicage.registry._local_query.get_docker_client",
             return_value=FakeClient(None),
         ):
-            self.assertIsNone(_local_query.get_local_repo_digest(run_config))
+            self.assertIsNone(_local_query.get_local_repo_digest(run_config.image_ref, run_config.global_cfg))
 
         with mock.patch(
             "aicage.registry._local_query.get_docker_client",
             return_value=FakeClient(FakeImage(repo_digests={"bad": "data"})),
         ):
-            self.assertIsNone(_local_query.get_local_repo_digest(run_config))
+            self.assertIsNone(_local_query.get_local_repo_digest(run_config.image_ref, run_config.global_cfg))
 
         with mock.patch(
             "aicage.registry._local_query.get_docker_client",
             return_value=FakeClient(FakeImage(repo_digests=["bad"])),
         ):
-            self.assertIsNone(_local_query.get_local_repo_digest(run_config))
+            self.assertIsNone(_local_query.get_local_repo_digest(run_config.image_ref, run_config.global_cfg))
 
         payload = ["ghcr.io/aicage/aicage@sha256:deadbeef", "other@sha256:skip"]
         with mock.patch(
             "aicage.registry._local_query.get_docker_client",
             return_value=FakeClient(FakeImage(repo_digests=payload)),
         ):
-            digest = _local_query.get_local_repo_digest(run_config)
+            digest = _local_query.get_local_repo_digest(run_config.image_ref, run_config.global_cfg)
         self.assertEqual("sha256:deadbeef", digest)
+
+    def test_get_local_image_labels(self) -> None:
+        with mock.patch(
+            "aicage.registry._local_query.get_docker_client",
+            return_value=FakeClient(None),
+        ):
+            self.assertIsNone(_local_query.get_local_image_labels("repo:tag"))
+
+        with mock.patch(
+            "aicage.registry._local_query.get_docker_client",
+            return_value=FakeClient(FakeImage(repo_digests=[], labels=None)),
+        ):
+            self.assertEqual({}, _local_query.get_local_image_labels("repo:tag"))
+
+        with mock.patch(
+            "aicage.registry._local_query.get_docker_client",
+            return_value=FakeClient(FakeImage(repo_digests=[], labels={"a": "b"})),
+        ):
+            self.assertEqual({"a": "b"}, _local_query.get_local_image_labels("repo:tag"))
+
+    def test_get_local_repo_digest_for_repo_accepts_mirror_digest(self) -> None:
+        payload = ["localhost:5000/aicage/aicage@sha256:mirrored", "localhost:5000/other@sha256:skip"]
+        with mock.patch(
+            "aicage.registry._local_query.get_docker_client",
+            return_value=FakeClient(FakeImage(repo_digests=payload)),
+        ):
+            upstream_only = _local_query.get_local_repo_digest_for_repo("repo:tag", "ghcr.io/aicage/aicage")
+            with_mirror = _local_query.get_local_repo_digest_for_repo(
+                "repo:tag", "ghcr.io/aicage/aicage", mirror_registries=["localhost:5000"]
+            )
+
+        self.assertIsNone(upstream_only)
+        self.assertEqual("sha256:mirrored", with_mirror)
@@ -0,0 +1,134 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage.config.config_store import SettingsStore
+from aicage.config.global_config import GlobalConfig
+from aicage.config.project_config import AgentConfig
+from aicage.errors import CliError
+from aicage.registry import prefetch
+from aicage.registry.prefetch import (
+    PREFETCH_CURRENT,
+    PREFETCH_FAILED,
+    PREFETCH_PULLED,
+    PrefetchResult,
+    PrefetchSummary,
+    PrefetchTarget,
+)
+
+_BASE_PREFIX = "ghcr.io/aicage/aicage-image-base"
+
+
+class PrefetchTests(TestCase):
+    def test_matrix_targets_expands_and_filters(self) -> None:
+        targets = prefetch.matrix_targets(_images_metadata(), _global_config(), bases=["ubuntu"])
+
+        self.assertEqual(
+            [
+                PrefetchTarget("ghcr.io/aicage/aicage:codex-ubuntu", "ubuntu"),
+                PrefetchTarget(f"{_BASE_PREFIX}:ubuntu", "ubuntu"),
+            ],
+            targets,
+        )
+
+    def test_project_targets_reads_stored_projects(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SettingsStore(base_dir=Path(tmp_dir))
+            for name, base in (("one", "alpine"), ("two", "alpine")):
+                project_cfg = store.load_project(Path(tmp_dir) / name)
+                project_cfg.agents["codex"] = AgentConfig(base=base)
+                store.save_project(Path(tmp_dir) / name, project_cfg)
+
+            targets = prefetch.project_targets(store, _images_metadata(), _global_config())
+
+        self.assertEqual([PrefetchTarget("ghcr.io/aicage/aicage:codex-alpine", "alpine")], targets)
+
+    def test_schedule_waves_pulls_one_image_per_base_first(self) -> None:
+        targets = prefetch.matrix_targets(_images_metadata(), _global_config())
+
+        waves = prefetch.schedule_waves(targets, _global_config())
+
+        self.assertEqual(
+            [f"{_BASE_PREFIX}:ubuntu", "ghcr.io/aicage/aicage:codex-alpine"],
+            [target.image_ref for target in waves[0]],
+        )
+        self.assertEqual(["ghcr.io/aicage/aicage:codex-ubuntu"], [target.image_ref for target in waves[1]])
+
+    def test_prefetch_images_classifies_results(self) -> None:
+        image_ids = {
+            "new": iter([None, "sha256:new"]),
+            "same": iter(["sha256:same", "sha256:same"]),
+            "broken": iter([None]),
+        }
+
+        def run_pull(image_ref: str, log_path: Path, progress: bool = True, mirror_refs: object = ()) -> int:
+            if image_ref == "broken":
+                raise CliError("denied")
+            return 2048 if image_ref == "new" else 0
+
+        with (
+            mock.patch(
+                "aicage.registry.prefetch._local_query.get_local_image_id",
+                side_effect=lambda image_ref: next(image_ids[image_ref]),
+            ),
+            mock.patch("aicage.registry.prefetch.run_pull", side_effect=run_pull),
+        ):
+            summary = prefetch.prefetch_images(
+                [[PrefetchTarget("new", "ubuntu")], [PrefetchTarget("same", "ubuntu"), PrefetchTarget("broken", "x")]],
+                jobs=2,
+                global_cfg=_global_config(),
+            )
+
+        self.assertEqual(
+            [
+                PrefetchResult("new", PREFETCH_PULLED, 2048),
+                PrefetchResult("same", PREFETCH_CURRENT),
+                PrefetchResult("broken", PREFETCH_FAILED, message="denied"),
+            ],
+            summary.results,
+        )
+
+    def test_format_summary_reports_throughput(self) -> None:
+        summary = PrefetchSummary(
+            results=[
+                PrefetchResult("a", PREFETCH_PULLED, 20 * 1024 * 1024),
+                PrefetchResult("b", PREFETCH_CURRENT),
+            ],
+            elapsed_seconds=2.0,
+        )
+
+        self.assertEqual(
+            "Prefetched 2 images in 2.0s: 1 pulled (20.0 MiB, 10.0 MiB/s), 1 up to date, 0 failed.",
+            prefetch.format_summary(summary),
+        )
+
+
+def _global_config() -> GlobalConfig:
+    return GlobalConfig(
+        image_registry="ghcr.io",
+        image_registry_api_url="https://ghcr.io/v2",
+        image_registry_api_token_url="https://ghcr.io/token?service=ghcr.io&scope=repository",
+        image_repository="aicage/aicage",
+        image_base_repository="aicage/aicage-image-base",
+        default_image_base="ubuntu",
+        version_check_image="ghcr.io/aicage/aicage-image-util:agent-version",
+        local_image_repository="aicage",
+    )
+
+
+def _images_metadata() -> mock.Mock:
+    metadata = mock.Mock()
+    metadata.agents = {
+        "codex": mock.Mock(
+            local_definition_dir=None,
+            valid_bases={
+                "ubuntu": "ghcr.io/aicage/aicage:codex-ubuntu",
+                "alpine": "ghcr.io/aicage/aicage:codex-alpine",
+            },
+        ),
+        "custom": mock.Mock(
+            local_definition_dir=Path("/tmp/custom"),
+            valid_bases={"ubuntu": "aicage:custom-ubuntu"},
+        ),
+    }
+    return metadata
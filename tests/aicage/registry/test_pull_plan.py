@@ -0,0 +1,84 @@
+from unittest import TestCase, mock
+
+from aicage.config.global_config import GlobalConfig
+from aicage.registry import pull_plan
+from aicage.registry._platform import Platform
+from aicage.registry.pull_plan import PullEstimate
+
+_API = "https://ghcr.io/v2/aicage/aicage"
+
+
+class PullPlanTests(TestCase):
+    def test_estimate_pull_counts_only_missing_layers(self) -> None:
+        documents = {
+            f"{_API}/manifests/codex-ubuntu": {
+                "manifests": [
+                    {"digest": "sha256:amd", "platform": {"os": "linux", "architecture": "amd64"}},
+                ]
+            },
+            f"{_API}/manifests/sha256:amd": {
+                "config": {"digest": "sha256:config"},
+                "layers": [
+                    {"digest": "sha256:l1", "size": 100},
+                    {"digest": "sha256:l2", "size": 50},
+                    {"digest": "sha256:l3", "size": 25},
+                ],
+            },
+            f"{_API}/blobs/sha256:config": {"rootfs": {"diff_ids": ["sha256:d1", "sha256:d2", "sha256:d3"]}},
+        }
+        with (
+            mock.patch("aicage.registry.pull_plan.fetch_pull_token_for_repository", return_value="abc"),
+            mock.patch(
+                "aicage.registry.pull_plan.host_platform",
+                return_value=Platform(os="linux", architecture="amd64"),
+            ),
+            mock.patch(
+                "aicage.registry.pull_plan.get_registry_json",
+                side_effect=lambda url, headers: documents.get(url),
+            ),
+        ):
+            estimate = pull_plan.estimate_pull(
+                "ghcr.io/aicage/aicage:codex-ubuntu",
+                _global_config(),
+                local_layers={"sha256:d1"},
+            )
+
+        self.assertEqual(
+            PullEstimate(
+                image_ref="ghcr.io/aicage/aicage:codex-ubuntu",
+                download_bytes=75,
+                total_bytes=175,
+                layers=3,
+                missing_layers=2,
+            ),
+            estimate,
+        )
+
+    def test_estimate_pull_skips_images_outside_registry(self) -> None:
+        self.assertIsNone(pull_plan.estimate_pull("docker.io/library/alpine:latest", _global_config(), set()))
+
+    def test_estimate_pulls_omits_unknown_images(self) -> None:
+        known = PullEstimate("a", 1, 2, 1, 1)
+        with (
+            mock.patch("aicage.registry.pull_plan._local_query.get_local_layer_ids", return_value=set()),
+            mock.patch(
+                "aicage.registry.pull_plan.estimate_pull",
+                side_effect=lambda image_ref, global_cfg, local_layers: known if image_ref == "a" else None,
+            ),
+        ):
+            estimates = pull_plan.estimate_pulls(["a", "b"], _global_config())
+
+        self.assertEqual({"a": known}, estimates)
+
+
+def _global_config() -> GlobalConfig:
+    return GlobalConfig(
+        image_registry="ghcr.io",
+        image_registry_api_url="https://ghcr.io/v2",
+        image_registry_api_token_url="https://ghcr.io/token?service=ghcr.io&scope=repository",
+        image_repository="aicage/aicage",
+        image_base_repository="aicage/aicage-image-base",
+        default_image_base="ubuntu",
+        version_check_image="ghcr.io/aicage/aicage-image-util:agent-version",
+        local_image_repository="aicage",
+    )
@@ -1,9 +1,18 @@
+import tempfile
+import time
 from unittest import TestCase, mock
 
 from aicage.registry import _remote_api
 
 
 class RemoteApiTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch("aicage.registry._token_cache._DEFAULT_STATE_DIR", tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_fetch_pull_token_missing_token(self) -> None:
         def fake_fetch_json(url: str, headers: dict[str, str] | None):
             return {}, {}
@@ -14,5 +23,72 @@ class RemoteApiTests(TestCase):
                     mock.Mock(
                         image_registry_api_token_url="https://example.test/token",
                         image_repository="repo",
+                        image_base_repository="base",
                     )
                 )
+
+    def test_fetch_pull_token_reuses_cached_token(self) -> None:
+        calls: list[str] = []
+
+        def fake_fetch_json(url: str, headers: dict[str, str] | None):
+            calls.append(url)
+            return {"token": "abc", "expires_in": 300}, {}
+
+        global_cfg = mock.Mock(
+            image_registry_api_token_url="https://example.test/token?scope=repository",
+            image_repository="repo",
+            image_base_repository="base",
+        )
+        with mock.patch("aicage.registry._remote_api._fetch_json", fake_fetch_json):
+            first = _remote_api.fetch_pull_token_for_repository(global_cfg, "repo")
+            second = _remote_api.fetch_pull_token_for_repository(global_cfg, "base")
+
+        self.assertEqual(("abc", "abc"), (first, second))
+        self.assertEqual(
+            ["https://example.test/token?scope=repository:base:pull&scope=repository:repo:pull"],
+            calls,
+        )
+
+    def test_fetch_pull_token_falls_back_to_single_scope(self) -> None:
+        calls: list[str] = []
+
+        def fake_fetch_json(url: str, headers: dict[str, str] | None):
+            calls.append(url)
+            if "&scope=" in url:
+                raise _remote_api.RegistryDiscoveryError("denied")
+            return {"token": "abc"}, {}
+
+        global_cfg = mock.Mock(
+            image_registry_api_token_url="https://example.test/token?scope=repository",
+            image_repository="repo",
+            image_base_repository="base",
+        )
+        with mock.patch("aicage.registry._remote_api._fetch_json", fake_fetch_json):
+            token = _remote_api.fetch_pull_token_for_repository(global_cfg, "repo")
+
+        self.assertEqual("abc", token)
+        self.assertEqual("https://example.test/token?scope=repository:repo:pull", calls[-1])
+
+    def test_token_expires_at_honors_issued_at(self) -> None:
+        with mock.patch("aicage.registry._remote_api.time.time", return_value=1_800_000_000.0):
+            expires_at = _remote_api._token_expires_at(
+                {"expires_in": 300, "issued_at": "2027-01-15T07:59:00Z"}
+            )
+
+        issued = 1_800_000_000.0 - 60
+        self.assertAlmostEqual(issued + 300 - _remote_api._TOKEN_EXPIRY_MARGIN_SECONDS, expires_at)
+
+    def test_parse_issued_at_accepts_docker_hub_timestamps(self) -> None:
+        issued_at = _remote_api._parse_issued_at("2027-01-15T07:59:00.123456789Z")
+
+        self.assertAlmostEqual(1_800_000_000.0 - 60 + 0.123456, issued_at)
+
+    def test_token_expires_at_ignores_future_issued_at(self) -> None:
+        now = time.time()
+        with mock.patch("aicage.registry._remote_api.time.time", return_value=now):
+            expires_at = _remote_api._token_expires_at({"issued_at": "2999-01-01T00:00:00Z"})
+
+        self.assertAlmostEqual(
+            now + _remote_api._DEFAULT_TOKEN_TTL_SECONDS - _remote_api._TOKEN_EXPIRY_MARGIN_SECONDS,
+            expires_at,
+        )
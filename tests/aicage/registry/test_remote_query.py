@@ -1,33 +1,38 @@
+import json
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, mock
 
-from aicage.config.global_config import GlobalConfig
+from aicage.config.global_config import GlobalConfig, RegistryMirror
 from aicage.registry import _remote_query
+from aicage.registry._http import HttpResponse
+from aicage.registry._platform import Platform
+from aicage.registry._rate_limit import RateLimitStore
 from aicage.registry._remote_api import RegistryDiscoveryError
 
 
-class FakeResponse:
-    def __init__(self, headers: dict[str, str], payload: str = "") -> None:
-        self.headers = headers
-        self._payload = payload
-
-    def read(self) -> bytes:
-        return self._payload.encode("utf-8")
-
-    def __enter__(self) -> "FakeResponse":
-        return self
-
-    def __exit__(self, exc_type, exc, tb) -> None:
-        return None
-
-
 class RemoteQueryTests(TestCase):
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch("aicage.registry._digest_cache._DEFAULT_STATE_DIR", tmp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rate_limit_patcher = mock.patch("aicage.registry._rate_limit._DEFAULT_STATE_DIR", f"{tmp_dir.name}/rate")
+        rate_limit_patcher.start()
+        self.addCleanup(rate_limit_patcher.stop)
+        self.addCleanup(_remote_query._PREFETCHED.clear)
+        platform_patcher = mock.patch("aicage.registry._remote_query.get_local_platform", return_value=None)
+        self._platform_mock = platform_patcher.start()
+        self.addCleanup(platform_patcher.stop)
+
     def test_get_remote_repo_digest_returns_none_on_token_error(self) -> None:
         with (
             mock.patch(
                 "aicage.registry._remote_query.fetch_pull_token_for_repository",
                 side_effect=RegistryDiscoveryError("boom"),
             ),
-            mock.patch("aicage.registry._remote_query.urllib.request.urlopen") as urlopen_mock,
+            mock.patch("aicage.registry._remote_query.registry_request") as request_mock,
         ):
             digest = _remote_query.get_remote_repo_digest_for_repo(
                 "ghcr.io/aicage/aicage:tag",
@@ -35,7 +40,7 @@ class RemoteQueryTests(TestCase):
                 self._global_config(),
             )
         self.assertIsNone(digest)
-        urlopen_mock.assert_not_called()
+        request_mock.assert_not_called()
 
     def test_get_remote_repo_digest_with_token(self) -> None:
         with (
@@ -44,8 +49,8 @@ class RemoteQueryTests(TestCase):
                 return_value="abc",
             ),
             mock.patch(
-                "aicage.registry._remote_query.urllib.request.urlopen",
-                return_value=FakeResponse({"Docker-Content-Digest": "sha256:remote"}),
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:remote"}),
             ),
         ):
             digest = _remote_query.get_remote_repo_digest_for_repo(
@@ -55,6 +60,298 @@ class RemoteQueryTests(TestCase):
             )
         self.assertEqual("sha256:remote", digest)
 
+    def test_get_remote_repo_digest_uses_fresh_cache(self) -> None:
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ) as token_mock,
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:remote", "ETag": '"v1"'}),
+            ) as request_mock,
+        ):
+            first = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+            second = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+
+        self.assertEqual(("sha256:remote", "sha256:remote"), (first, second))
+        token_mock.assert_called_once()
+        request_mock.assert_called_once()
+
+    def test_get_remote_repo_digest_refresh_revalidates_with_etag(self) -> None:
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                side_effect=[
+                    _head_response({"Docker-Content-Digest": "sha256:remote", "ETag": '"v1"'}),
+                    HttpResponse(status=304, headers={}, body=b""),
+                ],
+            ) as request_mock,
+        ):
+            _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config(), refresh=True
+            )
+
+        self.assertEqual("sha256:remote", digest)
+        revalidation_headers = request_mock.call_args_list[1].args[2]
+        self.assertEqual('"v1"', revalidation_headers["If-None-Match"])
+
+    def test_get_remote_repo_digest_rechecks_after_ttl(self) -> None:
+        global_cfg = self._global_config()
+        global_cfg.digest_cache_ttl_seconds = 0
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                side_effect=[
+                    _head_response({"Docker-Content-Digest": "sha256:old"}),
+                    _head_response({"Docker-Content-Digest": "sha256:new"}),
+                ],
+            ),
+        ):
+            first = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+            second = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+
+        self.assertEqual(("sha256:old", "sha256:new"), (first, second))
+
+    def test_get_remote_repo_digest_uses_stale_cache_while_rate_limited(self) -> None:
+        global_cfg = self._global_config()
+        global_cfg.digest_cache_ttl_seconds = 0
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ) as token_mock,
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:old"}),
+            ) as request_mock,
+        ):
+            _remote_query.get_remote_repo_digest_for_repo("ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg)
+            RateLimitStore().observe("ghcr.io", 429, {"Retry-After": "30"})
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg, refresh=True
+            )
+
+        self.assertEqual("sha256:old", digest)
+        token_mock.assert_called_once()
+        request_mock.assert_called_once()
+
+    def test_get_remote_repo_digest_joins_prefetch(self) -> None:
+        global_cfg = self._global_config()
+        global_cfg.digest_cache_ttl_seconds = 0
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:remote"}),
+            ) as request_mock,
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            _remote_query.prefetch_remote_digest(
+                executor, "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+
+        self.assertEqual("sha256:remote", digest)
+        request_mock.assert_called_once()
+
+    def test_get_remote_repo_digest_ignores_prefetch_for_other_refresh(self) -> None:
+        global_cfg = self._global_config()
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:remote"}),
+            ) as request_mock,
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            _remote_query.prefetch_remote_digest(
+                executor, "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+            executor.shutdown(wait=True)
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg, refresh=True
+            )
+
+        self.assertEqual("sha256:remote", digest)
+        self.assertEqual(2, request_mock.call_count)
+
+    def test_get_remote_repo_digest_ignores_discarded_prefetch(self) -> None:
+        global_cfg = self._global_config()
+        global_cfg.digest_cache_ttl_seconds = 0
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=_head_response({"Docker-Content-Digest": "sha256:remote"}),
+            ) as request_mock,
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            _remote_query.prefetch_remote_digest(
+                executor, "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+            executor.shutdown(wait=True)
+            _remote_query.discard_prefetched_digests()
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg
+            )
+
+        self.assertEqual("sha256:remote", digest)
+        self.assertEqual(2, request_mock.call_count)
+
+    def test_get_remote_digest_resolves_platform_config(self) -> None:
+        self._platform_mock.return_value = Platform(os="linux", architecture="arm64")
+        index = {
+            "manifests": [
+                {"digest": "sha256:amd", "platform": {"os": "linux", "architecture": "amd64"}},
+                {"digest": "sha256:arm", "platform": {"os": "linux", "architecture": "arm64"}},
+                {"digest": "sha256:att", "platform": {"os": "unknown", "architecture": "unknown"}},
+            ]
+        }
+        responses = {
+            "HEAD https://ghcr.io/v2/aicage/aicage/manifests/tag": _head_response(
+                {"Docker-Content-Digest": "sha256:index"}
+            ),
+            "GET https://ghcr.io/v2/aicage/aicage/manifests/sha256:index": _json_response(index),
+            "GET https://ghcr.io/v2/aicage/aicage/manifests/sha256:arm": _json_response(
+                {"config": {"digest": "sha256:config-arm"}}
+            ),
+        }
+        global_cfg = self._global_config()
+        global_cfg.digest_cache_ttl_seconds = 0
+        with (
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                side_effect=lambda method, url, headers: responses[f"{method} {url}"],
+            ) as request_mock,
+        ):
+            first = _remote_query.get_remote_digest("ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg)
+            second = _remote_query.get_remote_digest("ghcr.io/aicage/aicage:tag", "aicage/aicage", global_cfg)
+
+        expected = _remote_query.RemoteDigest(digest="sha256:index", config_digest="sha256:config-arm")
+        self.assertEqual((expected, expected), (first, second))
+        # The unchanged index is not fetched again on revalidation.
+        self.assertEqual(4, request_mock.call_count)
+
+    def test_get_remote_repo_digest_resolves_tags_upstream_with_mirrors(self) -> None:
+        mirror = RegistryMirror(registry="localhost:5000", api_url="http://localhost:5000/v2")
+        responses = {
+            "HEAD https://ghcr.io/v2/aicage/aicage/manifests/tag": _head_response(
+                {"Docker-Content-Digest": "sha256:upstream"}
+            ),
+            "GET http://localhost:5000/v2/aicage/aicage/manifests/sha256:upstream": _json_response(
+                {"config": {"digest": "sha256:config"}}
+            ),
+        }
+        self._platform_mock.return_value = Platform(os="linux", architecture="amd64")
+        with (
+            mock.patch("aicage.registry._remote_query.ranked_mirrors", return_value=[mirror]),
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                side_effect=lambda method, url, headers: responses[f"{method} {url}"],
+            ) as request_mock,
+        ):
+            remote = _remote_query.get_remote_digest(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+
+        # The mirror never answers for the tag; it only serves the manifest addressed by the upstream digest.
+        self.assertEqual(_remote_query.RemoteDigest(digest="sha256:upstream", config_digest="sha256:config"), remote)
+        self.assertEqual(2, request_mock.call_count)
+        request_mock.assert_any_call(
+            "GET",
+            "http://localhost:5000/v2/aicage/aicage/manifests/sha256:upstream",
+            {"Accept": _remote_query.MANIFEST_ACCEPT},
+        )
+
+    def test_get_remote_repo_digest_uses_mirror_when_upstream_unreachable(self) -> None:
+        mirror = RegistryMirror(registry="localhost:5000", api_url="http://localhost:5000/v2")
+        upstream_up = False
+
+        def request(method: str, url: str, headers: dict[str, str]) -> HttpResponse:
+            if url.startswith("http://localhost:5000/"):
+                return _head_response({"Docker-Content-Digest": "sha256:mirror"})
+            if not upstream_up:
+                raise OSError("unreachable")
+            return _head_response({"Docker-Content-Digest": "sha256:upstream"})
+
+        with (
+            mock.patch("aicage.registry._remote_query.ranked_mirrors", return_value=[mirror]),
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch("aicage.registry._remote_query.registry_request", side_effect=request),
+        ):
+            offline = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+            upstream_up = True
+            online = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+
+        # The mirror's tag answer is not cached, so the next lookup asks upstream again.
+        self.assertEqual(("sha256:mirror", "sha256:upstream"), (offline, online))
+
+    def test_get_remote_repo_digest_ignores_mirrors_when_upstream_lacks_tag(self) -> None:
+        mirror = RegistryMirror(registry="localhost:5000", api_url="http://localhost:5000/v2")
+        with (
+            mock.patch("aicage.registry._remote_query.ranked_mirrors", return_value=[mirror]),
+            mock.patch(
+                "aicage.registry._remote_query.fetch_pull_token_for_repository",
+                return_value="abc",
+            ),
+            mock.patch(
+                "aicage.registry._remote_query.registry_request",
+                return_value=HttpResponse(status=404, headers={}, body=b""),
+            ) as request_mock,
+        ):
+            digest = _remote_query.get_remote_repo_digest_for_repo(
+                "ghcr.io/aicage/aicage:tag", "aicage/aicage", self._global_config()
+            )
+
+        self.assertIsNone(digest)
+        request_mock.assert_called_once()
+
     def _global_config(self) -> GlobalConfig:
         return GlobalConfig(
             image_registry="ghcr.io",
@@ -67,3 +364,11 @@ class RemoteQueryTests(TestCase):
             local_image_repository="aicage",
             agents={},
         )
+
+
+def _head_response(headers: dict[str, str]) -> HttpResponse:
+    return HttpResponse(status=200, headers=headers, body=b"")
+
+
+def _json_response(payload: dict[str, object]) -> HttpResponse:
+    return HttpResponse(status=200, headers={}, body=json.dumps(payload).encode("utf-8"))
@@ -1,3 +1,4 @@
+import io
 from unittest import TestCase, mock
 
 from aicage.config.context import ConfigContext
@@ -25,9 +26,11 @@ from aicage.registry.images_metadata.models import (
 )
 from aicage.runtime.prompts import (
     BaseSelectionRequest,
+    PromptUnavailableError,
     ensure_tty_for_prompt,
     prompt_for_base,
     prompt_yes_no,
+    prompts_disabled,
 )
 
 
@@ -50,6 +53,26 @@ class PromptTests(TestCase):
                     )
                 )
 
+    def test_prompt_shows_download_sizes(self) -> None:
+        with (
+            mock.patch("sys.stdin.isatty", return_value=True),
+            mock.patch("builtins.input", return_value="1"),
+            mock.patch("sys.stdout", new_callable=io.StringIO) as stdout,
+        ):
+            prompt_for_base(
+                BaseSelectionRequest(
+                    agent="codex",
+                    context=self._build_context(["alpine", "ubuntu"]),
+                    agent_metadata=self._agent_metadata(["alpine", "ubuntu"]),
+                    estimate_download_sizes=lambda: {"alpine": 5 * 1024 * 1024, "ubuntu": 0},
+                )
+            )
+
+        output = stdout.getvalue()
+        self.assertIn("alpine: ", output)
+        self.assertIn("[5.0 MiB to download]", output)
+        self.assertIn("[already downloaded]", output)
+
     def test_prompt_accepts_number_and_default(self) -> None:
         with mock.patch("sys.stdin.isatty", return_value=True), mock.patch("builtins.input", side_effect=["2", ""]):
             choice = prompt_for_base(
@@ -152,3 +175,12 @@ class PromptTests(TestCase):
                 },
             }
         )
+
+
+class PromptsDisabledTests(TestCase):
+    def test_prompts_disabled_raises_prompt_unavailable(self) -> None:
+        with mock.patch("sys.stdin.isatty", return_value=True):
+            with prompts_disabled():
+                with self.assertRaises(PromptUnavailableError):
+                    ensure_tty_for_prompt()
+            ensure_tty_for_prompt()
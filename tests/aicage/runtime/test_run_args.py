@@ -3,7 +3,13 @@ from pathlib import Path
 from unittest import TestCase, mock
 
 from aicage.runtime import run_args
-from aicage.runtime.run_args import DockerRunArgs, MountSpec, assemble_docker_run, merge_docker_args
+from aicage.runtime.run_args import (
+    DockerRunArgs,
+    MountSpec,
+    assemble_docker_run,
+    build_engine_spec,
+    merge_docker_args,
+)
 
 
 class RunArgsTests(TestCase):
@@ -82,3 +88,39 @@ class RunArgsTests(TestCase):
         self.assertIn("-v", cmd)
         self.assertIn("/tmp/one:/opt/one:ro", cmd)
         self.assertNotIn("AICAGE_AGENT_CONFIG_PATH", " ".join(cmd))
+
+    def test_build_engine_spec_matches_assembled_command(self) -> None:
+        with mock.patch("aicage.runtime.run_args._resolve_user_env", return_value=["AICAGE_USER=me"]):
+            args = DockerRunArgs(
+                image_ref="ghcr.io/aicage/aicage:codex-ubuntu",
+                project_path=Path("/work/project"),
+                agent_config_host=Path("/host/.codex"),
+                agent_config_mount_container=Path("/aicage/agent-config"),
+                merged_docker_args="",
+                agent_args=["--flag"],
+                agent_path="~/.codex",
+                env=["EXTRA=1"],
+                mounts=[MountSpec(host_path=Path("/tmp/one"), container_path=Path("/opt/one"), read_only=True)],
+            )
+            spec = build_engine_spec(args)
+            cmd = assemble_docker_run(args)
+
+        self.assertIsNotNone(spec)
+        assert spec is not None
+        self.assertEqual("ghcr.io/aicage/aicage:codex-ubuntu", spec.image_ref)
+        self.assertEqual(["--flag"], spec.command)
+        self.assertEqual([cmd[i + 1] for i, part in enumerate(cmd) if part == "-e"], spec.env)
+        self.assertEqual([cmd[i + 1] for i, part in enumerate(cmd) if part == "-v"], spec.binds)
+        self.assertIn("/tmp/one:/opt/one:ro", spec.binds)
+
+    def test_build_engine_spec_skips_docker_args(self) -> None:
+        args = DockerRunArgs(
+            image_ref="ghcr.io/aicage/aicage:codex-ubuntu",
+            project_path=Path("/work/project"),
+            agent_config_host=Path("/host/.codex"),
+            agent_config_mount_container=Path("/aicage/agent-config"),
+            merged_docker_args="--network=host",
+            agent_args=[],
+        )
+
+        self.assertIsNone(build_engine_spec(args))
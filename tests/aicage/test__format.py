@@ -0,0 +1,10 @@
+from unittest import TestCase
+
+from aicage._format import format_size
+
+
+class FormatSizeTests(TestCase):
+    def test_format_size(self) -> None:
+        self.assertEqual("512 B", format_size(512))
+        self.assertEqual("1.5 KiB", format_size(1536))
+        self.assertEqual("2.0 GiB", format_size(2 * 1024**3))
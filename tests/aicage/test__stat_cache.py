@@ -0,0 +1,29 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from aicage._stat_cache import StatCache
+
+
+class StatCacheTests(TestCase):
+    def test_reuses_value_until_file_changes(self) -> None:
+        cache: StatCache[str] = StatCache()
+        calls: list[Path] = []
+
+        def _load(path: Path) -> str:
+            calls.append(path)
+            return path.read_text(encoding="utf-8")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "data.txt"
+            path.write_text("one", encoding="utf-8")
+            first = cache.get(path, _load)
+            second = cache.get(path, _load)
+            path.write_text("three", encoding="utf-8")
+            stat = path.stat()
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            third = cache.get(path, _load)
+
+        self.assertEqual(("one", "one", "three"), (first, second, third))
+        self.assertEqual(2, len(calls))
@@ -0,0 +1,45 @@
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+from unittest import TestCase
+
+from aicage import _state_files
+
+
+class StateFilesTests(TestCase):
+    def test_update_json_keeps_concurrent_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "state" / "entries.json"
+
+            def add(key: str) -> None:
+                _state_files.update_json(path, lambda payload: {**(payload or {}), key: True})
+
+            threads = [threading.Thread(target=add, args=(f"key-{index}",)) for index in range(16)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual({f"key-{index}" for index in range(16)}, set(_state_files.read_json(path)))
+            self.assertEqual(["entries.json", "entries.json.lock"], sorted(p.name for p in path.parent.iterdir()))
+
+    def test_update_json_applies_mode(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "tokens.json"
+
+            def replace(_payload: Any) -> list[str]:
+                return ["token"]
+
+            _state_files.update_json(path, replace, mode=0o600)
+
+            self.assertEqual(0o600, stat.S_IMODE(path.stat().st_mode))
+            self.assertEqual(["token"], _state_files.read_json(path))
+
+    def test_read_json_returns_none_for_invalid_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "state.json"
+            self.assertIsNone(_state_files.read_json(path))
+            path.write_text("{broken", encoding="utf-8")
+            self.assertIsNone(_state_files.read_json(path))
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aicage import _tracing
+
+
+@_tracing.traced("double")
+def _double(value: int) -> int:
+    return value * 2
+
+
+class TracingTests(TestCase):
+    def test_trace_session_writes_chrome_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir) / "trace.json"
+            with mock.patch.dict(os.environ, {"AICAGE_TRACE": str(trace_path)}):
+                with _tracing.trace_session():
+                    self.assertEqual(4, _double(2))
+                    with _tracing.span("docker run", _tracing.SUBPROCESS, argv=["docker", "run"]) as attrs:
+                        attrs["returncode"] = 0
+
+            payload = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        events = {event["name"]: event for event in payload["traceEvents"]}
+        self.assertEqual({"aicage", "double", "docker run"}, set(events))
+        self.assertEqual("X", events["double"]["ph"])
+        self.assertEqual(_tracing.PHASE, events["double"]["cat"])
+        self.assertEqual({"argv": ["docker", "run"], "returncode": 0}, events["docker run"]["args"])
+        self.assertGreaterEqual(events["aicage"]["dur"], events["double"]["dur"])
+        self.assertFalse(_tracing.tracing_enabled())
+
+    def test_span_records_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir) / "trace.json"
+            with mock.patch.dict(os.environ, {"AICAGE_TRACE": str(trace_path)}):
+                with self.assertRaises(ValueError), _tracing.trace_session(), _tracing.span("fail"):
+                    raise ValueError("boom")
+
+            payload = json.loads(trace_path.read_text(encoding="utf-8"))
+
+        events = {event["name"]: event for event in payload["traceEvents"]}
+        self.assertEqual("ValueError", events["fail"]["args"]["error"])
+
+    def test_trace_session_without_env_records_nothing(self) -> None:
+        with mock.patch.dict(os.environ, {}, clear=True):
+            with _tracing.trace_session():
+                self.assertFalse(_tracing.tracing_enabled())
+                self.assertEqual(6, _double(3))
+
+    def test_trace_session_writes_profile(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profile_path = Path(tmp_dir) / "aicage.prof"
+            with mock.patch.dict(os.environ, {"AICAGE_PROFILE": str(profile_path)}, clear=True):
+                with _tracing.trace_session():
+                    _double(1)
+
+            self.assertTrue(profile_path.is_file())